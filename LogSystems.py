@@ -1,23 +1,50 @@
 import streamlit as st
 import re
-import io
+
+import numpy as np
+
+from logic_bdd import MAX_VARS, BDDSystem, BDDTooLarge
+from logic_solver import CompiledSystem, SolutionSet, UnsupportedExpression, system_cache
+
+# "auto" usulida shundan ko'p o'zgaruvchili tizimlar avval BDD bilan yechiladi
+AUTO_BDD_VARS = 24
+# To'liq tekshirish (2**n to'plam) faqat shundan ko'p bo'lmagan o'zgaruvchilarda bajariladi
+MAX_BITSET_VARS = 32
+# Hisobotlar shuncha qatordan iborat bo'laklar bilan hosil qilinadi
+REPORT_CHUNK = 65536
+# Jadvalning bitta sahifasidagi yechimlar soni
+PAGE_SIZE = 100
+# BDD usulida ro'yxatga chiqariladigan yechimlar soni chegarasi (soni baribir aniq hisoblanadi)
+MAX_LISTED_SOLUTIONS = 1_000_000
+
+class SearchTooLarge(RuntimeError):
+    '''
+    Tizimni to'liq tekshirish (2**n to'plam) amalda bajarib bo'lmaydigan darajada katta.
+    '''
+
 
 class LogSystems:
     '''
     Mantiqiy tenglamalar yoki mantiqiy tenglamalar tizimini yechuvchi klass.
     Ajoyib interfeys bilan Streamlit orqali ishlaydi.
     '''
-    def __init__(self, x_count, y_count, var_names, equations_str, is_set=True):
+    def __init__(self, x_count, y_count, var_names, equations_str, is_set=True, engine="auto"):
         self.solutions_count = 0  # Tenglama (tizim) yechimlari soni
         self.function = ""  # Mantiqiy funksiya
         self.vars = var_names  # Funkciyadagi o'zgaruvchilar
         self.display_names = []  # Foydalanuvchi kiritgan mos nomlar
         self.is_set = is_set  # O'zgaruvchilar to'plamlarini chiqarish kerakmi
+        self.engine = engine  # "auto", "bitset" (to'liq tekshirish) yoki "bdd"
+        self.truncated = False  # Yechimlar ro'yxati MAX_LISTED_SOLUTIONS bilan qisqartirildimi
         self.x_count = x_count  # x o'zgaruvchilari soni
         self.y_count = y_count  # y o'zgaruvchilari soni
         self.equations_str = equations_str # Tenglamalar matn ko'rinishida
         self.raw_equations = [] # Foydalanuvchi kiritgan dastlabki tenglamalar
-        self.prepared_solutions = [] # eval qilingan barcha yechimlar
+        self.equation_parts = {} # Normallashtirilgan tenglama -> eval() uchun ifoda
+        self.cache_status = None # "hit", "filtered" yoki None (keshdan foydalanilmagan)
+        self.prepared_solutions = [] # Barcha yechimlar (hisoblangandan so'ng SolutionSet)
+        self.checked_sets = 0 # Tekshirilgan to'plamlar soni
+        self.solved = False # Qidiruv oxirigacha yetdimi
 
     def prepare_function(self):
         '''
@@ -25,6 +52,9 @@ class LogSystems:
         '''
         if not self.vars:
             raise ValueError("O'zgaruvchilar ro'yxati bo'sh. Iltimos, o'zgaruvchilarni kiriting.")
+        if len(self.vars) > MAX_VARS:
+            raise ValueError(f"{len(self.vars)} ta o'zgaruvchi kiritildi, ko'pi bilan {MAX_VARS} ta o'zgaruvchi "
+                             "qo'llab-quvvatlanadi (to'plam raqamlari 64 bitli butun sonlarda saqlanadi).")
         
         # Tenglamalarni qatorlarga ajratish va bo'sh qatorlarni olib tashlash
         self.raw_equations = [eq.strip() for eq in self.equations_str.split('\n') if eq.strip()]
@@ -44,9 +74,11 @@ class LogSystems:
                 raise ValueError(f"Kiritilgan tenglamalardagi ba'zi o'zgaruvchilar ({', '.join(missing_vars_in_input)}) yuqorida ko'rsatilgan o'zgaruvchilar ro'yxatida ({', '.join(self.vars)}) mavjud emas.")
         
         fun_parts = ['1']
+        self.equation_parts = {}  # bo'sh joylarsiz tenglama -> Python ifodasi (kesh kaliti uchun)
         for eq in self.raw_equations:
             # Bo'sh joylarni olib tashlash
             eq_cleaned = eq.replace(' ', '')
+            normalized = eq_cleaned
             
             # Mantiqiy operatorlarni almashtirish
             eq_cleaned = eq_cleaned.replace('!', " not ")  # Inkor
@@ -64,6 +96,7 @@ class LogSystems:
                     eq_cleaned = eq_cleaned.replace(var, f"set[{self.vars.index(var)}]")
 
             fun_parts.append(f"({eq_cleaned})")
+            self.equation_parts[normalized] = f"({eq_cleaned})"
         
         # Barcha tenglamalarni "and" operatori bilan bog'lash
         self.function = " and ".join(fun_parts)
@@ -77,12 +110,34 @@ class LogSystems:
             s.append((number >> i) & 1) # Bitwise operatsiyalardan foydalanib samaraliroq
         return s[::-1] # Teskari tartibda qaytarish
 
-    def solve(self):
+    def solve(self, workers=None, cache=system_cache):
         '''
         Funkciyadagi barcha mumkin bo'lgan o'zgaruvchi qiymatlarini ko'rib chiqish metodi.
+        Tenglamalar bir marta kompilyatsiya qilinadi va barcha to'plamlar uint64 so'zlarga
+        joylangan holda bit amallari bilan tekshiriladi (logic_solver.CompiledSystem) yoki
+        tizim BDD ga aylantirilib, yechimlar soni to'plamlarni ko'rmasdan hisoblanadi (logic_bdd).
+        '''
+        for _ in self.iter_solve(workers, cache=cache):
+            pass
+        return self.prepared_solutions if self.solved else None
+
+    def iter_solve(self, workers=None, cancel=None, cache=system_cache):
+        '''
+        `solve` ning bosqichma-bosqich ko'rinishi: to'plamlar fazosi ketma-ket bo'laklarga
+        bo'linib, jarayonlar hovuzida tekshiriladi. Har bir bo'lakdan so'ng `solutions_count`
+        va `checked_sets` yangilanadi va tekshirilgan ulush (0..1) qaytariladi.
+        Generator yopilsa yoki `cancel()` True qaytarsa, qidiruv to'xtaydi va `solved` False qoladi.
+
+        Yechilgan tizimlar `cache` da (logic_solver.SystemCache) saqlanadi: xuddi shu tizim
+        qayta yechilmaydi, tenglama qo'shilgan tizim esa keshdagi yechimlarni filtrlash orqali yechiladi.
         '''
         self.solutions_count = 0
+        self.checked_sets = 0
         self.prepared_solutions = []
+        self.solved = False
+        self.truncated = False
+        
+        self.cache_status = None
         
         try:
             self.prepare_function()
@@ -90,6 +145,155 @@ class LogSystems:
             st.error(f"Tenglama yoki o'zgaruvchi xatosi: {e}")
             return
 
+        if cache is None:
+            yield from self._iter_search(workers, cancel)
+            return
+
+        # Bir xil tizim (tenglamalar tartibidan qat'i nazar) avval yechilgan bo'lsa - keshdan
+        key = cache.make_key(self.vars, self.equation_parts)
+        # BDD yechgan qisqartirilgan yozuv barcha yechimlarni ro'yxatlaydigan usul uchun yaramaydi:
+        # tizim qayta yechiladi va yozuv to'liq natija bilan almashtiriladi
+        entry = cache.get(key, allow_truncated=not self._lists_all_solutions())
+        if entry is not None:
+            self._load_cache_entry(entry)
+            self.cache_status = "hit"
+            yield 1.0
+            return
+        # Keshdagi tizimga tenglamalar qo'shilgan bo'lsa - uning yechimlarini filtrlash
+        if self._solve_from_cached_base(cache, key):
+            yield 1.0
+            return
+
+        cache.record("misses")
+        yield from self._iter_search(workers, cancel)
+        if self.solved:
+            cache.put(key, self._cache_entry())
+
+    def _lists_all_solutions(self):
+        '''
+        Tanlangan usul yechimlarni to'liq tekshirish bilan, MAX_LISTED_SOLUTIONS chegarasisiz ro'yxatlaydimi.
+        '''
+        return self.engine == "bitset" or (self.engine == "auto" and len(self.vars) <= AUTO_BDD_VARS)
+
+    def _cache_entry(self):
+        return {"solutions": self.prepared_solutions, "solutions_count": self.solutions_count, "truncated": self.truncated}
+
+    def _load_cache_entry(self, entry):
+        self.prepared_solutions = entry["solutions"]
+        self.solutions_count = entry["solutions_count"]
+        self.truncated = entry["truncated"]
+        self.checked_sets = 2**len(self.vars)
+        self.solved = True
+
+    def _solve_from_cached_base(self, cache, key):
+        '''
+        Keshdagi eng yaqin "ota" tizim yechimlarini faqat qo'shilgan tenglamalar bo'yicha tekshiradi.
+        Qo'shimcha tenglamalarni kompilyatsiya qilib bo'lmasa, False qaytaradi.
+        '''
+        base = cache.find_base(key)
+        if base is None:
+            return False
+        base_key, entry = base
+        extra_parts = [self.equation_parts[eq] for eq in self.equation_parts if eq not in base_key[1]]
+        try:
+            extra_system = CompiledSystem(" and ".join(['1'] + extra_parts), len(self.vars))
+        except (UnsupportedExpression, SyntaxError):
+            return False
+
+        numbers = entry["solutions"].numbers
+        numbers = numbers[extra_system.evaluate_numbers(numbers)]
+        self._load_cache_entry({"solutions": SolutionSet(numbers, len(self.vars)),
+                                "solutions_count": len(numbers), "truncated": False})
+        self.cache_status = "filtered"
+        cache.record("filtered")
+        cache.put(key, self._cache_entry())
+        return True
+
+    def _iter_search(self, workers=None, cancel=None):
+        '''
+        Tizimni tanlangan usul bilan keshsiz yechadi (`iter_solve` bilan bir xil natijalar).
+        '''
+        n = len(self.vars)
+        try:
+            system = self._compile()
+        except BDDTooLarge as e:
+            if n > MAX_BITSET_VARS:
+                st.error(f"{e} {n} o'zgaruvchida to'liq tekshirish ham amalga oshmaydi (2^{n} to'plam): "
+                         "tenglamalarni soddalashtiring yoki o'zgaruvchilar sonini kamaytiring.")
+            else:
+                st.error(f"{e} To'liq tekshirish usulini tanlab ko'ring.")
+            return
+        except SearchTooLarge as e:
+            st.error(str(e))
+            return
+        except UnsupportedExpression:
+            if n > MAX_BITSET_VARS:
+                st.error(f"Tenglamalar bit amallariga tushmaydi, {n} o'zgaruvchida esa har bir to'plamni "
+                         f"alohida tekshirib bo'lmaydi (2^{n} to'plam).")
+                return
+            # Bit amallariga tushmaydigan ifodalar eski usulda, har bir to'plam uchun eval() bilan hisoblanadi
+            self.solved = self.solve_by_eval() is not None
+            self.checked_sets = 2**len(self.vars)
+            yield 1.0
+            return
+        except SyntaxError as e:
+            st.error(f"Tenglamani hisoblashda xato yuz berdi. Tekshiring: {e}\n"
+                     f"Hisoblanayotgan funksiya: `{self.function}`")
+            return
+
+        if isinstance(system, BDDSystem):
+            # Yechimlar soni diagrammadan aniq olinadi, to'plamlar ko'rib chiqilmaydi
+            self.solutions_count = system.count()
+            self.checked_sets = 2**len(self.vars)
+            numbers = system.solution_numbers(MAX_LISTED_SOLUTIONS)
+            self.truncated = len(numbers) < self.solutions_count
+            self.prepared_solutions = SolutionSet(numbers, len(self.vars))
+            self.solved = True
+            yield 1.0
+            return
+
+        found = []  # yechim topilgan to'plam raqamlari (bo'laklar bo'yicha)
+        for first, words, count in system.iter_solution_words(workers, cancel=cancel):
+            if count:
+                found.append(system.chunk_numbers(first, words))
+            self.solutions_count += count
+            self.checked_sets = min(system.total, (first + len(words)) * 64)
+            yield self.checked_sets / system.total
+
+        if self.checked_sets < system.total:
+            return # to'xtatildi
+        numbers = np.concatenate(found) if found else np.empty(0, np.int64)
+        self.prepared_solutions = SolutionSet(numbers, len(self.vars))
+        self.solved = True
+
+    def _compile(self):
+        '''
+        Tanlangan usul bo'yicha tizimni kompilyatsiya qiladi: BDD (yechimlar sonini 2**n to'plamni
+        ko'rmasdan hisoblaydi) yoki bit-paketli to'liq tekshirish. "auto" usulida katta tizimlar
+        uchun avval BDD sinab ko'riladi, u juda kattalashib ketsa to'liq tekshirishga faqat
+        o'zgaruvchilar soni MAX_BITSET_VARS dan oshmaganda o'tiladi (aks holda BDDTooLarge).
+        To'liq tekshirish usulida MAX_BITSET_VARS dan ko'p o'zgaruvchi bo'lsa, SearchTooLarge.
+        '''
+        n = len(self.vars)
+        if self.engine == "bdd" or (self.engine == "auto" and n > AUTO_BDD_VARS):
+            try:
+                return BDDSystem(self.function, n)
+            except BDDTooLarge:
+                if self.engine == "bdd" or n > MAX_BITSET_VARS:
+                    raise
+        if n > MAX_BITSET_VARS:
+            raise SearchTooLarge(f"{n} o'zgaruvchili tizimni to'liq tekshirib bo'lmaydi (2^{n} to'plam, chegara: "
+                                 f"{MAX_BITSET_VARS} o'zgaruvchi). BDD usulini tanlang.")
+        return CompiledSystem(self.function, n)
+
+    def solve_by_eval(self):
+        '''
+        Tayyorlangan funksiyani har bir to'plam uchun eval() bilan tekshiradi (sekin, zaxira usul).
+        '''
+        self.solutions_count = 0
+        self.prepared_solutions = []
+        found = []
+
         sets_to_check = 2**len(self.vars)  # Barcha mumkin bo'lgan o'zgaruvchilar to'plami soni
 
         for number in range(sets_to_check):
@@ -97,64 +301,87 @@ class LogSystems:
             try:
                 if eval(self.function):
                     self.solutions_count += 1
-                    self.prepared_solutions.append(set)
+                    found.append(set)
             except Exception as e:
                 st.error(f"Tenglamani hisoblashda xato yuz berdi. Tekshiring: {e}\n"
                          f"Hisoblanayotgan funksiya: `{self.function}`\n"
                          f"Hozirgi to'plam: `{set}`")
                 return
 
+        self.prepared_solutions = SolutionSet.from_sets(found, len(self.vars))
         return self.prepared_solutions
 
-    def get_javob1_content(self):
+    def _x_texts(self, names_to_use):
         '''
-        javob1.txt faylining mazmunini hosil qiladi.
+        Yechimlarning x qismlari bo'yicha: har bir takrorlanmas x niqobi uchun 1 bo'lgan x nomlari
+        matni (bir marta hosil qilinadi) va har bir yechimning shu ro'yxatdagi indeksi.
+        '''
+        x_count = min(self.x_count, len(self.vars))
+        unique, inverse = np.unique(self.prepared_solutions.field(0, x_count), return_inverse=True)
+        texts = [", ".join(names_to_use[i] for i in range(x_count) if (mask >> (x_count - 1 - i)) & 1)
+                 for mask in unique.tolist()]
+        return unique, texts, inverse.ravel()
+
+    def iter_javob1(self):
+        '''
+        javob1.txt mazmunini bo'laklab hosil qiladi: har bir y uchun shu y = 1 bo'lgan
+        yechimlar ustun indeksi orqali tanlanadi, qatorlar x niqoblari bo'yicha tayyor matnlardan olinadi.
         '''
-        output = io.StringIO()
-        
         # Agar display_names bo'sh bo'lsa, avtomatik ravishda vars dan foydalanish
         names_to_use = self.display_names if self.display_names else self.vars
+        masks, x_texts, x_inverse = self._x_texts(names_to_use)
+        lines = [f"  Yechim: {text}\n" if mask else "  Hech qanday x o'zgaruvchisi 1 emas\n"
+                 for mask, text in zip(masks.tolist(), x_texts)]
 
         for y_idx in range(self.x_count, len(self.vars)):  # y o'zgaruvchilari
             y_name = names_to_use[y_idx]
             y_var = self.vars[y_idx]
-            output.write(f"\n{y_var} ({y_name}) = 1 bo'lganda x o'zgaruvchilari:\n")
-            found_solutions_for_y = False
-            for sol in self.prepared_solutions:
-                if sol[y_idx] == 1:  # y o'zgaruvchisi 1 bo'lsa
-                    x_names = [names_to_use[i] for i in range(self.x_count) if sol[i] == 1]
-                    if x_names:
-                        output.write(f"  Yechim: {', '.join(x_names)}\n")
-                    else:
-                        output.write("  Hech qanday x o'zgaruvchisi 1 emas\n")
-                    found_solutions_for_y = True
-            if not found_solutions_for_y:
-                output.write("  Hech qanday yechim yo'q\n")
-        return output.getvalue()
-
-    def get_javob2_content(self):
+            yield f"\n{y_var} ({y_name}) = 1 bo'lganda x o'zgaruvchilari:\n"
+            selected = x_inverse[self.prepared_solutions.column(y_idx)]  # y o'zgaruvchisi 1 bo'lgan yechimlar
+            if not len(selected):
+                yield "  Hech qanday yechim yo'q\n"
+            for start in range(0, len(selected), REPORT_CHUNK):
+                yield "".join([lines[i] for i in selected[start:start + REPORT_CHUNK].tolist()])
+
+    def iter_javob2(self):
         '''
-        javob2.txt faylining mazmunini hosil qiladi.
+        javob2.txt mazmunini bo'laklab hosil qiladi: kamida bitta x = 1 bo'lgan har bir yechim
+        uchun uning har bir y = 1 o'zgaruvchisi alohida qatorda (yechim, so'ng y tartibida).
         '''
-        output = io.StringIO()
-        
         # Agar display_names bo'sh bo'lsa, avtomatik ravishda vars dan foydalanish
         names_to_use = self.display_names if self.display_names else self.vars
+        masks, x_texts, x_inverse = self._x_texts(names_to_use)
+        has_x = masks[x_inverse] != 0  # Kamida bitta x o'zgaruvchisi 1 bo'lsa
+
+        # (yechim indeksi, y indeksi) juftliklari y ustunlari indekslaridan yig'iladi
+        y_indexes = range(self.x_count, len(self.vars))
+        pairs = [np.flatnonzero(self.prepared_solutions.column(y_idx) & has_x) for y_idx in y_indexes]
+        solution_idx = np.concatenate(pairs) if pairs else np.empty(0, np.int64)
+        y_pos = np.repeat(np.arange(len(pairs)), [len(p) for p in pairs])
+        order = np.lexsort((y_pos, solution_idx))
+        solution_idx, y_pos = solution_idx[order], y_pos[order]
+
+        if not len(solution_idx):
+            yield "Hech qanday mos yechim yo'q\n"
+            return
+        prefixes = [f"{text} kasallik belgilari uchraganda " for text in x_texts]
+        suffixes = [f"{names_to_use[y_idx]}\n" for y_idx in y_indexes]
+        x_of = x_inverse[solution_idx]
+        for start in range(0, len(solution_idx), REPORT_CHUNK):
+            stop = start + REPORT_CHUNK
+            yield "".join([prefixes[x] + suffixes[y] for x, y in zip(x_of[start:stop].tolist(), y_pos[start:stop].tolist())])
+
+    def get_javob1_content(self):
+        '''
+        javob1.txt faylining mazmunini hosil qiladi.
+        '''
+        return "".join(self.iter_javob1())
 
-        found_any_solution = False
-        for sol in self.prepared_solutions:
-            # Kamida bitta x o'zgaruvchisi 1 bo'lsa
-            if any(sol[i] == 1 for i in range(self.x_count)):
-                x_names = [names_to_use[i] for i in range(self.x_count) if sol[i] == 1]
-                # y o'zgaruvchilaridan qiymati 1 bo'lganlarini topish
-                y_names = [names_to_use[i] for i in range(self.x_count, len(self.vars)) if sol[i] == 1]
-                if y_names:  # Agar y o'zgaruvchilaridan 1 bo'lganlari bo'lsa
-                    for y_name in y_names:
-                        output.write(f"{', '.join(x_names)} kasallik belgilari uchraganda {y_name}\n")
-                        found_any_solution = True
-        if not found_any_solution:
-            output.write("Hech qanday mos yechim yo'q\n")
-        return output.getvalue()
+    def get_javob2_content(self):
+        '''
+        javob2.txt faylining mazmunini hosil qiladi.
+        '''
+        return "".join(self.iter_javob2())
 
 # Streamlit ilovasi
 st.set_page_config(layout="centered", page_title="Mantiqiy tenglamalar yechimi")
@@ -191,39 +418,95 @@ equations_input = st.text_area("Mantiqiy tenglamalarni kiriting:", height=200,
 
 is_set = st.checkbox("Yechimlar to'plamini ko'rsatish", value=True, key="show_sets_checkbox")
 
-if st.button("Yechimlarni hisoblash"):
+engine_choice = st.radio(
+    "Yechish usuli:",
+    ("Avtomatik", "To'liq tekshirish (barcha to'plamlar)", "BDD (yechimlari kam tizimlar)"),
+    horizontal=True,
+    help=f"To'liq tekshirish barcha 2^n to'plamni bit amallari bilan ko'rib chiqadi ({MAX_BITSET_VARS} tagacha o'zgaruvchi). BDD esa tenglamalarni "
+         "qaror diagrammasiga aylantirib, yechimlar sonini to'plamlarni ko'rmasdan aniq hisoblaydi - "
+         "40-60 o'zgaruvchili siyrak tizimlar uchun. Avtomatik usul "
+         f"{AUTO_BDD_VARS} tadan ko'p o'zgaruvchida BDD ni tanlaydi. Har qanday usulda ko'pi bilan {MAX_VARS} ta o'zgaruvchi.",
+    key="engine_choice"
+)
+engine = {"Avtomatik": "auto", "To'liq tekshirish (barcha to'plamlar)": "bitset"}.get(engine_choice, "bdd")
+
+solve_clicked = st.button("Yechimlarni hisoblash")
+if not solve_clicked and st.session_state.get('solving'):
+    # Oldingi hisoblash tugamasdan skript qayta ishga tushdi (masalan, "To'xtatish" bosildi)
+    st.session_state['solving'] = False
+    st.warning("Hisoblash to'xtatildi.")
+
+if solve_clicked:
     if not var_names:
         st.error("Iltimos, o'zgaruvchilarni kiriting.")
     elif not equations_input.strip():
         st.error("Iltimos, tenglamalarni kiriting.")
     else:
         try:
-            solver = LogSystems(x_count, y_count, var_names, equations_input, is_set)
-            solutions = solver.solve()
+            solver = LogSystems(x_count, y_count, var_names, equations_input, is_set, engine)
+
+            # Yechimlar soni bo'laklar bo'yicha yangilanib boradi; "To'xtatish" tugmasi skriptni
+            # qayta ishga tushiradi, generator yopiladi va jarayonlar hovuzi to'xtatiladi
+            st.button("To'xtatish", key="stop_solving")
+            progress_bar = st.progress(0.0)
+            progress_text = st.empty()
+            st.session_state['solving'] = True
+            search = solver.iter_solve()
+            try:
+                for done in search:
+                    progress_bar.progress(done)
+                    progress_text.caption(f"Tekshirildi: {solver.checked_sets:,} / {2**len(solver.vars):,} to'plam, "
+                                          f"topilgan yechimlar: {solver.solutions_count:,}")
+            finally:
+                search.close()
+            st.session_state['solving'] = False
+            solutions = solver.prepared_solutions if solver.solved else None
             
             if solutions is not None: # Agar xato bo'lmasa
                 st.session_state['solutions'] = solutions
                 st.session_state['solver_instance'] = solver # Solver instanceni saqlash
                 st.session_state['show_display_names_input'] = True
-                
-                st.markdown(f"<h3 class='sub-header'>Hisoblangan yechimlar soni: {solver.solutions_count}</h3>", unsafe_allow_html=True)
-
-                if is_set and solutions:
-                    st.markdown("<h3 class='sub-header'>Yechimlar to'plami</h3>", unsafe_allow_html=True)
-                    # Yechimlarni DataFrame ko'rinishida ko'rsatish
-                    import pandas as pd
-                    df = pd.DataFrame(solutions, columns=var_names)
-                    st.dataframe(df.style.set_table_styles([
-                        {'selector': 'th', 'props': [('background-color', '#f2f2f2'), ('color', '#333'), ('font-weight', 'bold'), ('padding', '10px'), ('border-bottom', '2px solid #ddd')]},
-                        {'selector': 'td', 'props': [('padding', '8px'), ('border-bottom', '1px solid #eee')]}
-                    ]), use_container_width=True)
-                elif not solutions:
-                    st.info("Hisoblangan yechimlar yo'q.")
+                st.session_state['solutions_page'] = 1
+            else:
+                st.session_state.pop('solutions', None)
         except ValueError as e:
             st.error(f"Kiritish xatosi: {e}")
         except Exception as e:
             st.error(f"Kutilmagan xato yuz berdi: {e}")
 
+# Natijalar sessiyada saqlanadi, shuning uchun sahifani almashtirish qayta hisoblashni talab qilmaydi
+if st.session_state.get('solutions') is not None:
+    solver = st.session_state['solver_instance']
+    solutions = st.session_state['solutions']
+
+    st.markdown(f"<h3 class='sub-header'>Hisoblangan yechimlar soni: {solver.solutions_count}</h3>", unsafe_allow_html=True)
+    if solver.cache_status == "hit":
+        st.caption("Natija keshdan olindi.")
+    elif solver.cache_status == "filtered":
+        st.caption("Keshdagi tizim yechimlari qo'shilgan tenglamalar bo'yicha filtrlandi.")
+    st.caption(system_cache.stats_text())
+    if solver.truncated:
+        st.warning(f"Yechimlar juda ko'p: faqat {len(solutions):,} tasi ro'yxatga olindi "
+                   "(jadval va yuklab olinadigan fayllar shu qism bo'yicha tuziladi).")
+
+    if is_set and len(solutions):
+        st.markdown("<h3 class='sub-header'>Yechimlar to'plami</h3>", unsafe_allow_html=True)
+        # Yechimlarni DataFrame ko'rinishida, sahifalab ko'rsatish (faqat joriy sahifa qatorlari yaratiladi)
+        import pandas as pd
+        page_count = (len(solutions) + PAGE_SIZE - 1) // PAGE_SIZE
+        page = st.number_input(f"Sahifa (jami {page_count} ta, har birida {PAGE_SIZE} ta yechim):",
+                               min_value=1, max_value=page_count, step=1, key="solutions_page")
+        start = (page - 1) * PAGE_SIZE
+        stop = min(start + PAGE_SIZE, len(solutions))
+        df = pd.DataFrame(solutions.rows(start, stop), columns=solver.vars, index=pd.RangeIndex(start + 1, stop + 1))
+        st.dataframe(df.style.set_table_styles([
+            {'selector': 'th', 'props': [('background-color', '#f2f2f2'), ('color', '#333'), ('font-weight', 'bold'), ('padding', '10px'), ('border-bottom', '2px solid #ddd')]},
+            {'selector': 'td', 'props': [('padding', '8px'), ('border-bottom', '1px solid #eee')]}
+        ]), use_container_width=True)
+        st.caption(f"{start + 1}-{stop} / {len(solutions):,} yechim")
+    elif not len(solutions):
+        st.info("Hisoblangan yechimlar yo'q.")
+
 # Yechimlar hisoblangandan keyin 'Tushunarli nomlar' qismini ko'rsatish
 if 'show_display_names_input' in st.session_state and st.session_state['show_display_names_input']:
     st.markdown("<h3 class='sub-header'>Fayllar uchun tushunarli nomlar kiriting</h3>", unsafe_allow_html=True)
@@ -244,24 +527,23 @@ if 'show_display_names_input' in st.session_state and st.session_state['show_dis
         # Display nomlarini yangilash
         current_solver.display_names = [display_name_inputs[var] if display_name_inputs[var].strip() else var for var in current_solver.vars]
         
-        # javob1.txt mazmunini olish
-        javob1_content = current_solver.get_javob1_content()
+        # Fayllar mazmuni yuklab olish tugmasi bosilgandagina hosil qilinadi
         st.download_button(
             label="javob1.txt faylini yuklab olish",
-            data=javob1_content,
+            data=current_solver.get_javob1_content,
             file_name="javob1.txt",
             mime="text/plain",
-            key="download_javob1"
+            key="download_javob1",
+            on_click="ignore"
         )
 
-        # javob2.txt mazmunini olish
-        javob2_content = current_solver.get_javob2_content()
         st.download_button(
             label="javob2.txt faylini yuklab olish",
-            data=javob2_content,
+            data=current_solver.get_javob2_content,
             file_name="javob2.txt",
             mime="text/plain",
-            key="download_javob2"
+            key="download_javob2",
+            on_click="ignore"
         )
         st.success("Fayllar muvaffaqiyatli yaratildi va yuklab olish uchun tayyor!")
 
@@ -1,68 +1,17 @@
 import streamlit as st
-import cv2
-import numpy as np
-from PIL import Image
-
-def apply_binarization(image_array, method="otsu", manual_threshold=127, block_size=11, C_value=2, adaptive_method="gaussian"):
-    """
-    Applies binarization to a given image using either Otsu's method, a manual threshold, or adaptive methods.
-    If the image is colored, it is first converted to grayscale.
-
-    Args:
-        image_array (numpy.ndarray): The input image (can be grayscale or color).
-        method (str): Binarization method. Can be "otsu", "manual", or "adaptive".
-        manual_threshold (int): The threshold value to use if method is "manual".
-        block_size (int): Size of a pixel neighborhood that is used to calculate a threshold value for the pixel.
-                          Must be an odd number.
-        C_value (int): Constant subtracted from the mean or weighted mean.
-        adaptive_method (str): Type of adaptive thresholding. Can be "gaussian" or "mean".
-
-    Returns:
-        tuple: A tuple containing:
-            - numpy.ndarray: The binarized image.
-            - str: Information about the threshold value used (Otsu's, manual, or adaptive parameters).
-            - numpy.ndarray: The grayscale version of the input image.
-    """
-    # Tasvir rangli bo'lsa, kulrang tasvirga aylantirish
-    if len(image_array.shape) == 3:
-        grayscale_image = cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
-    else:
-        grayscale_image = image_array
-
-    binarized_image = None
-    used_threshold_info = ""
-
-    if method == "otsu":
-        # Otsu binarizatsiyasini qo'llash
-        ret, binarized_image = cv2.threshold(grayscale_image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        used_threshold_info = f"Otsu tomonidan hisoblangan: **{ret:.2f}**"
-    elif method == "manual":
-        # Qo'lda binarizatsiyani qo'llash
-        ret, binarized_image = cv2.threshold(grayscale_image, manual_threshold, 255, cv2.THRESH_BINARY)
-        used_threshold_info = f"Qo'lda belgilangan: **{manual_threshold}**"
-    elif method == "adaptive":
-        # Adaptiv binarizatsiyani qo'llash
-        if adaptive_method == "gaussian":
-            # ADAPTIVE_THRESH_GAUSSIAN_C: chegara qiymati qo'shni piksellarning og'irlikdagi o'rtacha qiymati (Gaussiy oynasi bo'yicha).
-            binarized_image = cv2.adaptiveThreshold(
-                grayscale_image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                cv2.THRESH_BINARY, block_size, C_value
-            )
-            used_threshold_info = f"Adaptiv (Gauss): Block Size **{block_size}**, C **{C_value}**"
-        elif adaptive_method == "mean":
-            # ADAPTIVE_THRESH_MEAN_C: chegara qiymati qo'shni piksel blokining o'rtacha qiymati.
-            binarized_image = cv2.adaptiveThreshold(
-                grayscale_image, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
-                cv2.THRESH_BINARY, block_size, C_value
-            )
-            used_threshold_info = f"Adaptiv (O'rtacha): Block Size **{block_size}**, C **{C_value}**"
-    else:
-        # Default holat yoki xato
-        binarized_image = grayscale_image
-        used_threshold_info = "Hech qanday binarizatsiya qo'llanilmagan"
 
+from braille_core import INTEGRAL_METHODS, GrayHistogram, IntegralThresholder, apply_binarization
+from preview import encode_preview, full_resolution_download, preview_source, scale_odd
+from result_cache import load_upload, result_cache
 
-    return binarized_image, used_threshold_info, grayscale_image
+# Adaptiv usul nomlari (yon panel) -> apply_binarization dagi adaptive_method
+ADAPTIVE_METHODS = {
+    "Gaussiy (Gaussian)": "gaussian",
+    "O'rtacha (Mean)": "mean",
+    "Integral (O'rtacha, tez)": "integral",
+    "Sauvola": "sauvola",
+    "Niblack": "niblack",
+}
 
 st.set_page_config(layout="wide", page_title="Brayl Tasviri uchun Binarizatsiya Dasturi")
 
@@ -74,10 +23,12 @@ st.write("Adaptiv binarizatsiya tasvirning har bir kichik mintaqasi uchun alohid
 uploaded_file = st.file_uploader("Tasvirni yuklang...", type=["jpg", "jpeg", "png", "bmp", "tiff"])
 
 if uploaded_file is not None:
-    # Yuklangan faylni PIL Image ob'ektiga aylantirish
-    image_pil = Image.open(uploaded_file)
-    # PIL Image ni OpenCV ga mos numpy massiviga aylantirish (RGB formatida)
-    img_array = np.array(image_pil.convert('RGB'))
+    # Yuklangan faylni bir marta dekodlab, numpy massivini keshlash (xesh bo'yicha)
+    image_hash, img_array = load_upload(uploaded_file)
+    # Katta tasvirlarda parametrlar piramida proksisida sinab ko'riladi
+    work_hash, work_array, preview_scale = preview_source(image_hash, img_array)
+    # Kulrang tekislik va gistogramma har bir yuklash uchun bir marta hisoblanadi
+    histogram = result_cache.get_or_compute(("histogram", work_hash), lambda: GrayHistogram(work_array))
 
     st.sidebar.header("Binarizatsiya Usulini Tanlang")
     binarization_method_choice = st.sidebar.radio(
@@ -89,7 +40,8 @@ if uploaded_file is not None:
     manual_threshold_value = 127
     block_size_value = 11
     C_value_value = 2
-    adaptive_threshold_type = "gaussian"
+    adaptive_threshold_type = "Gaussiy (Gaussian)"
+    k_value = 0.2
 
     if binarization_method_choice == "Qo'lda Chegara":
         method_to_pass = "manual"
@@ -105,7 +57,9 @@ if uploaded_file is not None:
         method_to_pass = "adaptive"
         adaptive_threshold_type = st.sidebar.radio(
             "Adaptiv usul turi:",
-            ("Gaussiy (Gaussian)", "O'rtacha (Mean)")
+            tuple(ADAPTIVE_METHODS),
+            help="Integral, Sauvola va Niblack usullari tasvirning integral jadvallarini bir marta hisoblaydi, "
+                 "shundan so'ng blok hajmi yoki C/k o'zgarganda faqat chegara qayta qo'llaniladi."
         )
         block_size_value = st.sidebar.slider(
             "Block Size (Blok hajmi) (tub son bo'lishi kerak)",
@@ -115,14 +69,26 @@ if uploaded_file is not None:
             step=2, # Faqat toq sonlarni ta'minlash
             help="Har bir piksel uchun chegara qiymatini hisoblashda qo'llaniladigan qo'shni piksel blokining o'lchami. Har doim toq son bo'lishi kerak."
         )
-        C_value_value = st.sidebar.slider(
-            "C qiymati (O'zgarmas)",
-            min_value=-10,
-            max_value=10,
-            value=2,
-            step=1,
-            help="O'rtacha yoki og'irlikdagi o'rtacha qiymatidan ayiriladigan doimiy. Manfiy qiymatlar natijani yorqinlashtiradi, musbat qiymatlar esa qorong'ulashtiradi."
-        )
+        if ADAPTIVE_METHODS[adaptive_threshold_type] not in ("sauvola", "niblack"):
+            # Sauvola/Niblack C ni ishlatmaydi: slayder ko'rsatilmaydi, qiymati esa o'zgarmas
+            # qolib, keraksiz yangi kesh kalitlari hosil bo'lmaydi
+            C_value_value = st.sidebar.slider(
+                "C qiymati (O'zgarmas)",
+                min_value=-10,
+                max_value=10,
+                value=2,
+                step=1,
+                help="O'rtacha yoki og'irlikdagi o'rtacha qiymatidan ayiriladigan doimiy. Manfiy qiymatlar natijani yorqinlashtiradi, musbat qiymatlar esa qorong'ulashtiradi."
+            )
+        else:
+            k_value = st.sidebar.slider(
+                "k qiymati (sezgirlik)",
+                min_value=-1.0,
+                max_value=1.0,
+                value=0.2 if ADAPTIVE_METHODS[adaptive_threshold_type] == "sauvola" else -0.2,
+                step=0.05,
+                help="Lokal standart og'ishning chegaraga ta'siri. Sauvola uchun odatda 0.2-0.5, Niblack uchun -0.2 atrofida."
+            )
     else: # Otsu (Avtomatik)
         method_to_pass = "otsu"
 
@@ -130,23 +96,43 @@ if uploaded_file is not None:
 
     col1, col2 = st.columns(2)
 
+    # Binarizatsiya parametrlari (kesh kaliti sifatida ham ishlatiladi)
+    binarization_params = (
+        ("method", method_to_pass),
+        ("manual_threshold", manual_threshold_value),
+        ("block_size", block_size_value),
+        ("C_value", C_value_value),
+        ("adaptive_method", ADAPTIVE_METHODS[adaptive_threshold_type]),
+        ("k_value", k_value),
+    )
+    # Blok hajmi piksellarda berilgan: proksida u masshtabga mos ravishda kichraytiriladi
+    work_params = dict(binarization_params, block_size=scale_odd(block_size_value, preview_scale, 3))
+
+    # Integral jadvallar tasvir uchun bir marta hisoblanadi va keshda saqlanadi
+    integral = None
+    if method_to_pass == "adaptive" and ADAPTIVE_METHODS[adaptive_threshold_type] in INTEGRAL_METHODS:
+        integral = result_cache.get_or_compute(("integral", work_hash), lambda: IntegralThresholder(histogram.gray))
+
     # Tanlangan usulga qarab binarizatsiyani qo'llash
-    binarized_img, threshold_info_text, grayscale_img = apply_binarization(
-        img_array,
-        method=method_to_pass,
-        manual_threshold=manual_threshold_value,
-        block_size=block_size_value,
-        C_value=C_value_value,
-        adaptive_method="gaussian" if adaptive_threshold_type == "Gaussiy (Gaussian)" else "mean"
+    binarized_img, threshold_info_text, grayscale_img = result_cache.get_or_compute(
+        ("binarize", work_hash, binarization_params),
+        lambda: apply_binarization(work_array, integral=integral, histogram=histogram, **work_params)
+    )
+    full_resolution_download(
+        ("binarize", image_hash, binarization_params),
+        lambda: apply_binarization(img_array, **dict(binarization_params))[0],
+        "binarized.png", preview_scale, binarized_img
     )
 
     with col1:
-        st.image(grayscale_img, caption="Kulrang tasvir", use_column_width=True)
+        st.image(encode_preview(grayscale_img), caption="Kulrang tasvir", use_column_width=True)
         st.info(f"Ishlatilgan chegara ma'lumotlari: {threshold_info_text}")
 
 
     with col2:
-        st.image(binarized_img, caption=f"Binarizatsiya qilingan Brayl tasviri ({binarization_method_choice})", use_column_width=True)
+        st.image(encode_preview(binarized_img, fmt="png"), caption=f"Binarizatsiya qilingan Brayl tasviri ({binarization_method_choice})", use_column_width=True)
+
+    st.sidebar.caption(result_cache.stats_text())
 
     st.markdown("""
     ---
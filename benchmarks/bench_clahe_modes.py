@@ -0,0 +1,63 @@
+"""
+apply_clahe rejimlarini ("ycrcb", "luma", "gray") repozitoriydagi namunaviy
+PNG tasvirlarda solishtiruvchi benchmark.
+
+Ishga tushirish (repozitoriy ildizidan):
+    python benchmarks/bench_clahe_modes.py [--repeat 20] [--scale 1 4]
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clahe_core import CLAHE_MODES, apply_clahe  # noqa: E402
+
+
+def time_call(fn, repeat):
+    fn() # CLAHE keshini va xotirani "isitish"
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 4],
+                        help="Tasvirni necha marta kattalashtirib sinash (katta skanlarni taqlid qilish uchun)")
+    parser.add_argument("--clip-limit", type=float, default=2.0)
+    parser.add_argument("--tile-grid-size", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = sorted(glob.glob(os.path.join(root, "image*.png")))
+
+    print(f"{'tasvir':<20} {'o`lcham':>12} " + " ".join(f"{m + ' ms':>10}" for m in CLAHE_MODES) + f" {'luma farq':>10}")
+    for path in paths:
+        with Image.open(path) as image:
+            base = np.array(image.convert('RGB'))
+        for scale in args.scale:
+            img = cv2.resize(base, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR) if scale != 1 else base
+            timings = [time_call(lambda: apply_clahe(img, args.clip_limit, args.tile_grid_size, mode), args.repeat)
+                       for mode in CLAHE_MODES]
+            # "luma" natijasining "ycrcb" dan maksimal farqi (piksel qiymatlarida)
+            diff = np.abs(apply_clahe(img, args.clip_limit, args.tile_grid_size, "luma").astype(np.int16)
+                          - apply_clahe(img, args.clip_limit, args.tile_grid_size, "ycrcb")).max()
+            size = f"{img.shape[1]}x{img.shape[0]}"
+            print(f"{os.path.basename(path):<20} {size:>12} " + " ".join(f"{t * 1000:>10.2f}" for t in timings) + f" {diff:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
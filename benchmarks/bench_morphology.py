@@ -0,0 +1,81 @@
+"""
+apply_morphological_opening ning eski (cv2.erode + cv2.dilate, zich np.ones kernel)
+va yangi (bitta cv2.morphologyEx) yo'llarini hamda remove_small_specks ni
+kernel hajmi 1-9 da solishtiruvchi benchmark.
+
+Ishga tushirish (repozitoriy ildizidan):
+    python benchmarks/bench_morphology.py [--repeat 10] [--size 3508 2480]
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from braille_core import apply_binarization, apply_morphological_opening, remove_small_specks  # noqa: E402
+
+
+def legacy_opening(image, kernel_size):
+    # Oldingi apply_morphological_opening: ikki alohida chaqiriq va oraliq tasvir
+    if kernel_size % 2 == 0:
+        kernel_size += 1
+    kernel = np.ones((kernel_size, kernel_size), np.uint8)
+    return cv2.dilate(cv2.erode(image, kernel, iterations=1), kernel, iterations=1)
+
+
+def synthetic_page(height, width, seed=0):
+    # Brayl nuqtalari (6 pikselli doiralar) va tasodifiy mayda shovqin nuqtalari
+    rng = np.random.default_rng(seed)
+    page = np.zeros((height, width), np.uint8)
+    for y in range(40, height - 40, 30):
+        for x in range(40, width - 40, 20):
+            if rng.random() < 0.5:
+                cv2.circle(page, (x, y), 6, 255, -1)
+    specks = rng.random((height, width)) > 0.998
+    page[specks] = 255
+    return page
+
+
+def time_call(fn, repeat):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--size", type=int, nargs=2, default=[3508, 2480], metavar=("H", "W"),
+                        help="Sintetik sahifa o'lchami (standart: A4, 300 dpi)")
+    args = parser.parse_args(argv)
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    inputs = [("sintetik", synthetic_page(*args.size))]
+    for path in sorted(glob.glob(os.path.join(root, "image*.png"))):
+        with Image.open(path) as image:
+            inputs.append((os.path.basename(path), apply_binarization(np.array(image.convert('RGB')))[0]))
+
+    print(f"{'tasvir':<18} {'k':>2} {'eski ms':>9} {'yangi ms':>9} {'tezlik':>7} {'maydon ms':>10} {'mos':>4}")
+    for name, binary in inputs:
+        for k in range(1, 10, 2):
+            old = time_call(lambda: legacy_opening(binary, k), args.repeat)
+            new = time_call(lambda: apply_morphological_opening(binary, k), args.repeat)
+            specks = time_call(lambda: remove_small_specks(binary, k * k), args.repeat)
+            same = "ha" if np.array_equal(legacy_opening(binary, k), apply_morphological_opening(binary, k)) else "yo'q"
+            print(f"{name:<18} {k:>2} {old * 1000:>9.2f} {new * 1000:>9.2f} {old / new:>6.2f}x {specks * 1000:>10.2f} {same:>4}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,46 @@
+"""
+clahe_tiled natijasini apply_clahe bilan barcha rejimlarda ("ycrcb", "luma", "gray")
+piksel-piksel solishtiruvchi tekshiruv: katak soniga bo'linmaydigan o'lchamlar,
+balandligi panjara bilan teng tasvirlar (8x100, 8 katak) va kichik polosa byudjeti bilan.
+
+Ishga tushirish (repozitoriy ildizidan):
+    python benchmarks/check_clahe_tiled.py
+Biror holat mos kelmasa, 1 qaytaradi.
+"""
+import os
+import sys
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clahe_core import CLAHE_MODES, apply_clahe  # noqa: E402
+from clahe_tiled import clahe_tiled  # noqa: E402
+
+SHAPES = ((300, 401, 3), (256, 256, 3), (37, 53, 3), (8, 100, 3), (100, 8, 3), (9, 9, 3), (300, 401), (8, 100))
+GRIDS = (8, (3, 5))
+# Katta byudjet - bitta polosa; kichigi - polosalar katak chegaralarini kesib o'tadi
+BUDGETS = (1 << 30, 4000)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    failed = 0
+    for shape in SHAPES:
+        image = cv2.GaussianBlur(rng.integers(0, 256, shape, dtype=np.uint8), (5, 5), 0)
+        for mode in CLAHE_MODES:
+            for grid in GRIDS:
+                expected = apply_clahe(image, 2.0, grid, mode)
+                for budget in BUDGETS:
+                    result = clahe_tiled(image, 2.0, grid, mode=mode, memory_budget=budget)
+                    diff = int(np.abs(expected.astype(np.int16) - result).max())
+                    if diff:
+                        failed += 1
+                        print(f"MOS EMAS: {shape} {mode} panjara={grid} byudjet={budget}: farq {diff}")
+    print("Barcha holatlar mos." if not failed else f"{failed} ta holat mos emas.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
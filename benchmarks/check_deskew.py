@@ -0,0 +1,92 @@
+"""
+Og'ishni to'g'rilash yo'nalishi tekshiruvi: sintetik Brayl sahifasi ma'lum ±burchakka
+og'diriladi, so'ng `deskew_image` (ikkala usul), `rotate_image` va `BraillePipeline`
+natijasi og'dirilmagan sahifa bilan solishtiriladi. To'g'rilangan sahifaning markaziy
+qismi asl sahifaga og'dirilgan sahifadan ancha yaqin bo'lishi kerak.
+
+Ishga tushirish (repozitoriy ildizidan):
+    python benchmarks/check_deskew.py
+Biror holat o'tmasa, 1 qaytaradi.
+"""
+import os
+import sys
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from braille_pipeline import BraillePipeline  # noqa: E402
+from deskew_core import deskew_image, estimate_skew, estimate_skew_angle, rotate_image  # noqa: E402
+
+ANGLES = (3.0, -3.0, 7.5, -12.0, 0.8)
+# Burchak bahosining ruxsat etilgan xatosi (gradus) va to'g'rilangan sahifaning og'dirilgan
+# sahifaga nisbatan o'rtacha farqi ulushi. Hough bahosi nuqtalar bo'yicha qo'polroq
+# (piksel segmentlari medianasi), shuning uchun uning chegaralari kengroq
+ANGLE_TOLERANCE = 0.1
+HOUGH_ANGLE_TOLERANCE = 1.0
+MAX_ERROR_RATIO = 0.35
+HOUGH_MAX_ERROR_RATIO = 0.5
+
+
+def synthetic_page(height=900, width=700, seed=0):
+    # Oq fonda 6 nuqtali kataklar satrlari (run_benchmarks.synthetic_page bilan bir xil tuzilma)
+    rng = np.random.default_rng(seed)
+    page = np.full((height, width), 230, np.uint8)
+    for y in range(40, height - 40, 50):
+        for x in range(40, width - 40, 26):
+            code = rng.integers(1, 64)
+            for dot in range(6):
+                if (code >> dot) & 1:
+                    cv2.circle(page, (x + 9 * (dot // 3), y + 9 * (dot % 3)), 3, 40, -1, cv2.LINE_AA)
+    return page
+
+
+def skew(page, angle):
+    # Sahifani soat strelkasiga teskari `angle` gradusga buradi (ekranda ko'rinishicha)
+    M = cv2.getRotationMatrix2D((page.shape[1] / 2, page.shape[0] / 2), angle, 1)
+    return cv2.warpAffine(page, M, (page.shape[1], page.shape[0]), borderValue=230)
+
+
+def central_error(page, other):
+    # Aylantirishda chegaradan chiqib ketadigan qismlarsiz o'rtacha mutlaq farq
+    h, w = page.shape[:2]
+    crop = (slice(h // 4, 3 * h // 4), slice(w // 4, 3 * w // 4))
+    return float(cv2.absdiff(page[crop], other[crop]).mean())
+
+
+def main():
+    page = synthetic_page()
+    pipeline = BraillePipeline(deskew=True)
+    failed = 0
+    for angle in ANGLES:
+        skewed = skew(page, angle)
+        before = central_error(page, skewed)
+        estimated, _ = estimate_skew(skewed)
+        hough_estimated, _ = estimate_skew_angle(skewed)
+        # Ekranda soat strelkasiga teskari og'ish tasvir koordinatalarida (y pastga) manfiy qiyalik
+        for name, value, tolerance in (("estimate_skew", estimated, ANGLE_TOLERANCE),
+                                       ("estimate_skew_angle", hough_estimated, HOUGH_ANGLE_TOLERANCE)):
+            if abs(value + angle) > tolerance:
+                failed += 1
+                print(f"MOS EMAS: og'ish {angle:+.2f}, {name}: baho {value:+.3f} (kutilgan {-angle:+.3f})")
+
+        pipeline.process(skewed)
+        results = (
+            ("rotate_image", rotate_image(skewed, estimated), MAX_ERROR_RATIO),
+            ("deskew_image profile", deskew_image(skewed, method="profile")[0], MAX_ERROR_RATIO),
+            ("deskew_image hough", deskew_image(skewed, method="hough")[0], HOUGH_MAX_ERROR_RATIO),
+            # Konveyer o'zi binar natija qaytaradi: uning burchagi bilan aylantirilgan sahifa tekshiriladi
+            ("BraillePipeline", rotate_image(skewed, pipeline.last_angle), MAX_ERROR_RATIO),
+        )
+        for name, result, ratio in results:
+            after = central_error(page, result)
+            status = "ok" if after <= ratio * before else "MOS EMAS"
+            failed += status != "ok"
+            print(f"{status}: og'ish {angle:+.2f}, {name}: farq {before:.1f} -> {after:.1f}")
+    print("Barcha holatlar o'tdi." if not failed else f"{failed} ta holat o'tmadi.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+Tasvirga ishlov berish funksiyalari (apply_clahe, apply_binarization ning barcha
+rejimlari, apply_morphological_opening, canny.py dagi og'ishni to'g'rilash yo'li),
+find_braille_matches va LogSystems.solve uchun takrorlanuvchan benchmark to'plami.
+
+Kirishlar: repozitoriydagi image*.png tasvirlar, berilgan megapiksel o'lchamidagi
+sintetik Brayl sahifalari (1-200 MP) va 8-24 o'zgaruvchili sintetik mantiqiy tizimlar.
+Har bir holat uchun kechikish persentillari (p50/p90/p99), o'tkazuvchanlik va eng
+yuqori xotira yoziladi; natijalar JSON faylga saqlanadi va `--compare` bilan oldingi
+commit natijalari bilan solishtiriladi.
+
+Ishga tushirish (repozitoriy ildizidan):
+    python benchmarks/run_benchmarks.py [--megapixels 1 12] [--vars 8 12 16 20 24]
+        [--only clahe binarize] [--output natija.json] [--compare eski.json]
+    python benchmarks/run_benchmarks.py --megapixels 1 12 50 200 --repeat 3
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+from PIL import Image
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import streamlit.logger  # noqa: E402
+
+# LogSystems moduli import qilinganda Streamlit ilovasi "bare" rejimda ishlaydi;
+# har bir vidjet uchun chiqadigan ScriptRunContext ogohlantirishlarini o'chiramiz
+streamlit.logger.set_log_level("error")
+
+from braille_core import apply_binarization, apply_morphological_opening  # noqa: E402
+from braille_read import find_braille_matches, find_braille_matches_batch  # noqa: E402
+from clahe_core import CLAHE_MODES, apply_clahe  # noqa: E402
+from deskew_core import estimate_skew, estimate_skew_angle, rotate_image  # noqa: E402
+from LogSystems import LogSystems  # noqa: E402
+
+GROUPS = ("clahe", "binarize", "opening", "deskew", "braille", "solver")
+# apply_binarization rejimlari: (method, adaptive_method)
+BINARIZATION_MODES = (("otsu", None), ("manual", None)) + tuple(
+    ("adaptive", m) for m in ("gaussian", "mean", "integral", "sauvola", "niblack"))
+SOLVER_ENGINES = ("bitset", "bdd")
+PERCENTILES = (50, 90, 99)
+BRAILLE_CELLS = 10_000
+# Sintetik sahifa A4 nisbatida, eng katta tomoni bo'yicha vertikal
+PAGE_ASPECT = 297 / 210
+PAGE_SKEW = 1.5
+
+
+def synthetic_page(megapixels, seed=0):
+    """
+    Berilgan o'lchamdagi RGB Brayl sahifasi: 6 nuqtali kataklar panjarasi, yoritilishning
+    vertikal gradienti, mayda shovqin va PAGE_SKEW gradus og'ish. 200 MP gacha sahifalar
+    tez hosil bo'lishi uchun bitta 512x512 bo'lak takrorlanadi.
+    """
+    rng = np.random.default_rng(seed)
+    width = int(round(np.sqrt(megapixels * 1e6 / PAGE_ASPECT)))
+    height = int(round(width * PAGE_ASPECT))
+
+    tile = np.full((512, 512), 200, np.uint8)
+    for y in range(16, 512, 64): # katak satrlari
+        for x in range(16, 512, 32):
+            code = rng.integers(1, 64)
+            for dot in range(6):
+                if (code >> dot) & 1:
+                    cv2.circle(tile, (x + 10 * (dot // 3), y + 10 * (dot % 3)), 3, 90, -1, cv2.LINE_AA)
+    tile = cv2.add(tile, rng.integers(0, 12, tile.shape, dtype=np.uint8))
+
+    page = np.tile(tile, (height // 512 + 1, width // 512 + 1))[:height, :width]
+    page = cv2.subtract(page, np.linspace(0, 40, height, dtype=np.float32).astype(np.uint8)[:, None].repeat(width, 1))
+    M = cv2.getRotationMatrix2D((width / 2, height / 2), PAGE_SKEW, 1)
+    page = cv2.warpAffine(page, M, (width, height), borderValue=200)
+    return cv2.cvtColor(page, cv2.COLOR_GRAY2RGB)
+
+
+def image_inputs(megapixels):
+    # (nom, RGB tasvir): repozitoriydagi namunalar va sintetik sahifalar
+    for path in sorted(glob.glob(os.path.join(ROOT, "image*.png"))):
+        with Image.open(path) as image:
+            yield os.path.basename(path), np.array(image.convert('RGB'))
+    for mp in megapixels:
+        yield f"sintetik {mp:g} MP", synthetic_page(mp)
+
+
+def logic_system(var_count, seed=0):
+    """
+    `var_count` o'zgaruvchili sintetik tizim (x1..xk, y1..ym): implikatsiyalar zanjiri va
+    tasodifiy 3 o'zgaruvchili dizyunksiyalar, LogSystems kiritish sintaksisida.
+
+    Returns:
+        tuple: (x soni, y soni, o'zgaruvchilar nomlari, tenglamalar matni).
+    """
+    rng = np.random.default_rng(seed)
+    x_count = var_count // 2
+    y_count = var_count - x_count
+    names = [f"x{i + 1}" for i in range(x_count)] + [f"y{i + 1}" for i in range(y_count)]
+    equations = [f"({names[i]} - {names[i + 1]}) = 1" for i in range(0, x_count - 1, 2)]
+    for _ in range(var_count // 2):
+        a, b, c = rng.choice(var_count, 3, replace=False)
+        equations.append(f"({names[a]} + !{names[b]} + {names[c]}) = 1")
+    return x_count, y_count, names, "\n".join(equations)
+
+
+def iter_cases(args):
+    """
+    Benchmark holatlari: (guruh, nom, kirish, parametrlar, funksiya, ish hajmi, birlik).
+    Funksiyalar argumentsiz; ish hajmi o'tkazuvchanlikni hisoblash uchun (MP, katak, to'plam).
+    """
+    groups = set(args.only or GROUPS)
+    if groups & {"clahe", "binarize", "opening", "deskew"}:
+        for label, rgb in image_inputs(args.megapixels):
+            gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+            mp = gray.size / 1e6
+            size = {"width": gray.shape[1], "height": gray.shape[0]}
+            if "clahe" in groups:
+                for mode in CLAHE_MODES:
+                    yield ("clahe", "apply_clahe", label, dict(size, mode=mode, clip_limit=2.0, tile_grid_size=8),
+                           lambda rgb=rgb, mode=mode: apply_clahe(rgb, 2.0, 8, mode), mp, "MP")
+            if "binarize" in groups:
+                for method, adaptive in BINARIZATION_MODES:
+                    if adaptive is None:
+                        params = {"method": method, "manual_threshold": 127}
+                    else:
+                        params = {"method": method, "adaptive_method": adaptive, "block_size": 11, "C_value": 2}
+                    yield ("binarize", "apply_binarization", label, dict(size, **params),
+                           lambda gray=gray, params=params: apply_binarization(gray, **params), mp, "MP")
+            if "opening" in groups:
+                binary = apply_binarization(gray)[0]
+                for k in (3, 5):
+                    yield ("opening", "apply_morphological_opening", label, dict(size, kernel_size=k),
+                           lambda binary=binary, k=k: apply_morphological_opening(binary, k), mp, "MP")
+            if "deskew" in groups:
+                # canny.py dagi yo'l: kulrang tasvir -> og'ish burchagi -> rotate_image
+                yield ("deskew", "estimate_skew + rotate_image", label, dict(size, method="profile"),
+                       lambda gray=gray: rotate_image(gray, estimate_skew(gray)[0]), mp, "MP")
+                yield ("deskew", "estimate_skew_angle + rotate_image", label, dict(size, method="hough"),
+                       lambda gray=gray: rotate_image(gray, estimate_skew_angle(gray)[0]), mp, "MP")
+
+    if "braille" in groups:
+        cells = np.random.default_rng(0).integers(0, 2, (BRAILLE_CELLS, 6))
+        cell_list = cells.tolist()
+        yield ("braille", "find_braille_matches", f"{BRAILLE_CELLS} ta katak", {"cells": BRAILLE_CELLS},
+               lambda: [find_braille_matches(cell) for cell in cell_list], BRAILLE_CELLS, "katak")
+        yield ("braille", "find_braille_matches_batch", f"{BRAILLE_CELLS} ta katak", {"cells": BRAILLE_CELLS},
+               lambda: find_braille_matches_batch(cells), BRAILLE_CELLS, "katak")
+
+    if "solver" in groups:
+        for var_count in args.vars:
+            x_count, y_count, names, equations = logic_system(var_count)
+            for engine in SOLVER_ENGINES:
+                def solve(engine=engine, x_count=x_count, y_count=y_count, names=names, equations=equations):
+                    solver = LogSystems(x_count, y_count, names, equations, True, engine)
+                    # Kesh o'chirilgan: har bir takror tizimni qaytadan yechadi
+                    if solver.solve(workers=args.workers, cache=None) is None:
+                        raise RuntimeError(f"{engine} usuli {len(names)} o'zgaruvchili tizimni yecha olmadi")
+                    return solver
+                yield ("solver", "LogSystems.solve", f"{var_count} o'zgaruvchi",
+                       {"vars": var_count, "equations": equations.count("\n") + 1, "engine": engine,
+                        "workers": args.workers},
+                       solve, 2 ** var_count, "to'plam")
+
+
+def measure(fn, repeat, budget):
+    """
+    Bitta qizdiruvchi chaqiriqdan so'ng `repeat` marta (yoki `budget` soniya tugaguncha,
+    kamida bir marta) vaqtni o'lchaydi; so'ng alohida chaqiriqda tracemalloc bilan
+    eng yuqori xotirani oladi (o'lchangan vaqtlarga ta'sir qilmasligi uchun).
+
+    Returns:
+        tuple: (soniyalardagi vaqtlar ro'yxati, tracemalloc eng yuqori qiymati baytlarda).
+    """
+    fn()
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < repeat and (not samples or time.perf_counter() - started < budget):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return samples, peak
+
+
+def max_rss_bytes():
+    # Jarayonning shu paytgacha eng yuqori rezident xotirasi (Linux da KB, macOS da bayt)
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "cv_threads": cv2.getNumThreads(),
+    }
+
+
+def case_id(result):
+    # Natijalarni commitlar orasida solishtirish kaliti
+    params = ",".join(f"{k}={v}" for k, v in result["params"].items() if k not in ("width", "height"))
+    return f"{result['function']} | {result['input']} | {params}"
+
+
+def compare(results, baseline_path, threshold):
+    """
+    p50 kechikishlarini oldingi JSON natijalari bilan solishtiradi.
+
+    Returns:
+        int: `threshold` dan ko'proq sekinlashgan holatlar soni.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {case_id(r): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\n{'holat':<80} {'eski p50':>10} {'yangi p50':>10} {'nisbat':>7}")
+    for result in results:
+        old = baseline.get(case_id(result))
+        if old is None:
+            continue
+        ratio = result["latency_ms"]["p50"] / old["latency_ms"]["p50"]
+        mark = ""
+        if ratio > 1 + threshold:
+            regressions += 1
+            mark = " sekinlashdi"
+        print(f"{case_id(result)[:80]:<80} {old['latency_ms']['p50']:>10.2f} {result['latency_ms']['p50']:>10.2f} "
+              f"{ratio:>6.2f}x{mark}")
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="Har bir holat uchun o'lchashlar soni")
+    parser.add_argument("--budget", type=float, default=10.0,
+                        help="Bitta holatga ajratilgan vaqt (soniya); katta sahifalarda takrorlar kamayadi")
+    parser.add_argument("--megapixels", type=float, nargs="*", default=[1, 12],
+                        help="Sintetik sahifalar o'lchamlari, MP (masalan, 1 12 50 200)")
+    parser.add_argument("--vars", type=int, nargs="*", default=[8, 12, 16, 20, 24],
+                        help="Sintetik mantiqiy tizimlar o'zgaruvchilari soni")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, help="Faqat shu guruhlar")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="LogSystems.solve jarayonlari soni (standart: 1 - takrorlanuvchan natijalar uchun)")
+    parser.add_argument("--cv-threads", type=int, default=None, help="cv2.setNumThreads qiymati (standart: o'zgartirilmaydi)")
+    parser.add_argument("--output", default=None,
+                        help="JSON fayl (standart: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", default=None, help="Solishtirish uchun oldingi JSON natijalari")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="p50 shundan ko'proq (ulush) oshsa, sekinlashish deb hisoblanadi")
+    args = parser.parse_args(argv)
+
+    if args.cv_threads is not None:
+        cv2.setNumThreads(args.cv_threads)
+    env = environment()
+    results = []
+    print(f"{'funksiya':<36} {'kirish':<20} {'parametrlar':<34} {'p50 ms':>9} {'p99 ms':>9} {'o`tkazuv.':>16} {'xotira MB':>9}")
+    for group, function, label, params, fn, work, unit in iter_cases(args):
+        samples, peak = measure(fn, args.repeat, args.budget)
+        latency = np.array(samples) * 1000
+        p = dict(zip((f"p{q}" for q in PERCENTILES), np.percentile(latency, PERCENTILES).tolist()))
+        result = {
+            "group": group,
+            "function": function,
+            "input": label,
+            "params": params,
+            "samples": len(samples),
+            "latency_ms": dict(p, mean=float(latency.mean()), min=float(latency.min()), max=float(latency.max())),
+            "throughput": {"value": work / (p["p50"] / 1000), "unit": f"{unit}/s"},
+            "peak_traced_bytes": peak,
+            "max_rss_bytes": max_rss_bytes(),
+        }
+        results.append(result)
+        shown = ",".join(f"{k}={v}" for k, v in params.items() if k not in ("width", "height", "equations", "workers"))
+        print(f"{function[:36]:<36} {label[:20]:<20} {shown[:34]:<34} {p['p50']:>9.2f} {p['p99']:>9.2f} "
+              f"{result['throughput']['value']:>10.3g} {unit + '/s':<5} {peak / 2**20:>9.1f}")
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{env['commit'] or 'natija'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"environment": env, "results": results}, f, ensure_ascii=False, indent=2)
+    print(f"\nNatijalar: {output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,88 +1,18 @@
 import streamlit as st
-import cv2
-import numpy as np
-from PIL import Image
-
-def apply_binarization(image_array, method="otsu", manual_threshold=127, block_size=11, C_value=2, adaptive_method="gaussian"):
-    """
-    Applies binarization to a given image using either Otsu's method, a manual threshold, or adaptive methods.
-    If the image is colored, it is first converted to grayscale.
-
-    Args:
-        image_array (numpy.ndarray): The input image (can be grayscale or color).
-
-    Returns:
-        tuple: A tuple containing:
-            - numpy.ndarray: The binarized image.
-            - str: Information about the threshold value used (Otsu's, manual, or adaptive parameters).
-            - numpy.ndarray: The grayscale version of the input image.
-    """
-    # Tasvir rangli bo'lsa, kulrang tasvirga aylantirish
-    if len(image_array.shape) == 3:
-        grayscale_image = cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
-    else:
-        grayscale_image = image_array
-
-    binarized_image = None
-    used_threshold_info = ""
-
-    if method == "otsu":
-        # Otsu binarizatsiyasini qo'llash
-        ret, binarized_image = cv2.threshold(grayscale_image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        used_threshold_info = f"Otsu tomonidan hisoblangan: **{ret:.2f}**"
-    elif method == "manual":
-        # Qo'lda binarizatsiyani qo'llash
-        ret, binarized_image = cv2.threshold(grayscale_image, manual_threshold, 255, cv2.THRESH_BINARY)
-        used_threshold_info = f"Qo'lda belgilangan: **{manual_threshold}**"
-    elif method == "adaptive":
-        # Adaptiv binarizatsiyani qo'llash
-        if adaptive_method == "gaussian":
-            # ADAPTIVE_THRESH_GAUSSIAN_C: chegara qiymati qo'shni piksellarning og'irlikdagi o'rtacha qiymati (Gaussiy oynasi bo'yicha).
-            binarized_image = cv2.adaptiveThreshold(
-                grayscale_image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                cv2.THRESH_BINARY, block_size, C_value
-            )
-            used_threshold_info = f"Adaptiv (Gauss): Block Size **{block_size}**, C **{C_value}**"
-        elif adaptive_method == "mean":
-            # ADAPTIVE_THRESH_MEAN_C: chegara qiymati qo'shni piksel blokining o'rtacha qiymati.
-            binarized_image = cv2.adaptiveThreshold(
-                grayscale_image, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
-                cv2.THRESH_BINARY, block_size, C_value
-            )
-            used_threshold_info = f"Adaptiv (O'rtacha): Block Size **{block_size}**, C **{C_value}**"
-    else:
-        # Default holat yoki xato
-        binarized_image = grayscale_image
-        used_threshold_info = "Hech qanday binarizatsiya qo'llanilmagan"
 
+from braille_cells import read_page
+from braille_core import INTEGRAL_METHODS, GrayHistogram, IntegralThresholder, apply_binarization, apply_morphological_opening, remove_small_specks
+from preview import encode_preview, full_resolution_download, preview_source, scale_odd
+from result_cache import load_upload, result_cache
 
-    return binarized_image, used_threshold_info, grayscale_image
-
-# Morfologik "ochilish" (Opening) operatsiyasini qo'llash
-def apply_morphological_opening(image, kernel_size):
-    """
-    Applies morphological opening operation to the binarized image.
-    This helps to remove small objects (noise) and smooth contours.
-
-    Args:
-        image (numpy.ndarray): The binarized image.
-        kernel_size (int): Size of the kernel for erosion and dilation. Must be an odd number.
-
-    Returns:
-        numpy.ndarray: Image after morphological opening.
-    """
-    if kernel_size % 2 == 0: # Kernel hajmi toq son bo'lishini ta'minlash
-        kernel_size += 1
-    
-    kernel = np.ones((kernel_size, kernel_size), np.uint8)
-    
-    # Eroziya: kichik obyektlarni olib tashlaydi
-    eroded_image = cv2.erode(image, kernel, iterations=1)
-    
-    # Dilatasiya: yo'qolgan haqiqiy obyektlarni tiklaydi
-    dilated_image = cv2.dilate(eroded_image, kernel, iterations=1)
-    
-    return dilated_image
+# Adaptiv usul nomlari (yon panel) -> apply_binarization dagi adaptive_method
+ADAPTIVE_METHODS = {
+    "Gaussiy (Gaussian)": "gaussian",
+    "O'rtacha (Mean)": "mean",
+    "Integral (O'rtacha, tez)": "integral",
+    "Sauvola": "sauvola",
+    "Niblack": "niblack",
+}
 
 st.set_page_config(layout="wide", page_title="Brayl Tasviri uchun Binarizatsiya Dasturi")
 
@@ -94,10 +24,12 @@ st.write("Adaptiv binarizatsiya tasvirning har bir kichik mintaqasi uchun alohid
 uploaded_file = st.file_uploader("Tasvirni yuklang...", type=["jpg", "jpeg", "png", "bmp", "tiff"])
 
 if uploaded_file is not None:
-    # Yuklangan faylni PIL Image ob'ektiga aylantirish
-    image_pil = Image.open(uploaded_file)
-    # PIL Image ni OpenCV ga mos numpy massiviga aylantirish (RGB formatida)
-    img_array = np.array(image_pil.convert('RGB'))
+    # Yuklangan faylni bir marta dekodlab, numpy massivini keshlash (xesh bo'yicha)
+    image_hash, img_array = load_upload(uploaded_file)
+    # Katta tasvirlarda parametrlar piramida proksisida sinab ko'riladi
+    work_hash, work_array, preview_scale = preview_source(image_hash, img_array)
+    # Kulrang tekislik va gistogramma har bir yuklash uchun bir marta hisoblanadi
+    histogram = result_cache.get_or_compute(("histogram", work_hash), lambda: GrayHistogram(work_array))
 
     st.sidebar.header("Binarizatsiya Usulini Tanlang")
     binarization_method_choice = st.sidebar.radio(
@@ -109,7 +41,8 @@ if uploaded_file is not None:
     manual_threshold_value = 127
     block_size_value = 11
     C_value_value = 2
-    adaptive_threshold_type = "gaussian"
+    adaptive_threshold_type = "Gaussiy (Gaussian)"
+    k_value = 0.2
 
     if binarization_method_choice == "Qo'lda Chegara":
         method_to_pass = "manual"
@@ -125,7 +58,9 @@ if uploaded_file is not None:
         method_to_pass = "adaptive"
         adaptive_threshold_type = st.sidebar.radio(
             "Adaptiv usul turi:",
-            ("Gaussiy (Gaussian)", "O'rtacha (Mean)")
+            tuple(ADAPTIVE_METHODS),
+            help="Integral, Sauvola va Niblack usullari tasvirning integral jadvallarini bir marta hisoblaydi, "
+                 "shundan so'ng blok hajmi yoki C/k o'zgarganda faqat chegara qayta qo'llaniladi."
         )
         block_size_value = st.sidebar.slider(
             "Block Size (Blok hajmi) (g'alati son bo'lishi kerak)",
@@ -135,57 +70,135 @@ if uploaded_file is not None:
             step=2, # Faqat toq sonlarni ta'minlash
             help="Har bir piksel uchun chegara qiymatini hisoblashda qo'llaniladigan qo'shni piksel blokining o'lchami. Har doim toq son bo'lishi kerak."
         )
-        C_value_value = st.sidebar.slider(
-            "C qiymati (O'zgarmas)",
-            min_value=-10,
-            max_value=10,
-            value=2,
-            step=1,
-            help="O'rtacha yoki og'irlikdagi o'rtacha qiymatidan ayiriladigan doimiy. Manfiy qiymatlar natijani yorqinlashtiradi, musbat qiymatlar esa qorong'ulashtiradi."
-        )
+        if ADAPTIVE_METHODS[adaptive_threshold_type] not in ("sauvola", "niblack"):
+            # Sauvola/Niblack C ni ishlatmaydi: slayder ko'rsatilmaydi, qiymati esa o'zgarmas
+            # qolib, keraksiz yangi kesh kalitlari hosil bo'lmaydi
+            C_value_value = st.sidebar.slider(
+                "C qiymati (O'zgarmas)",
+                min_value=-10,
+                max_value=10,
+                value=2,
+                step=1,
+                help="O'rtacha yoki og'irlikdagi o'rtacha qiymatidan ayiriladigan doimiy. Manfiy qiymatlar natijani yorqinlashtiradi, musbat qiymatlar esa qorong'ulashtiradi."
+            )
+        else:
+            k_value = st.sidebar.slider(
+                "k qiymati (sezgirlik)",
+                min_value=-1.0,
+                max_value=1.0,
+                value=0.2 if ADAPTIVE_METHODS[adaptive_threshold_type] == "sauvola" else -0.2,
+                step=0.05,
+                help="Lokal standart og'ishning chegaraga ta'siri. Sauvola uchun odatda 0.2-0.5, Niblack uchun -0.2 atrofida."
+            )
     else: # Otsu (Avtomatik)
         method_to_pass = "otsu"
 
+    # Binarizatsiya parametrlari (kesh kaliti sifatida ham ishlatiladi)
+    binarization_params = (
+        ("method", method_to_pass),
+        ("manual_threshold", manual_threshold_value),
+        ("block_size", block_size_value),
+        ("C_value", C_value_value),
+        ("adaptive_method", ADAPTIVE_METHODS[adaptive_threshold_type]),
+        ("k_value", k_value),
+    )
+    # Blok hajmi piksellarda berilgan: proksida u masshtabga mos ravishda kichraytiriladi
+    work_params = dict(binarization_params, block_size=scale_odd(block_size_value, preview_scale, 3))
+
+    # Integral jadvallar tasvir uchun bir marta hisoblanadi va keshda saqlanadi
+    integral = None
+    if method_to_pass == "adaptive" and ADAPTIVE_METHODS[adaptive_threshold_type] in INTEGRAL_METHODS:
+        integral = result_cache.get_or_compute(("integral", work_hash), lambda: IntegralThresholder(histogram.gray))
+
     # Binarizatsiya natijasini olish
-    binarized_img, threshold_info_text, grayscale_img = apply_binarization(
-        img_array,
-        method=method_to_pass,
-        manual_threshold=manual_threshold_value,
-        block_size=block_size_value,
-        C_value=C_value_value,
-        adaptive_method="gaussian" if adaptive_threshold_type == "Gaussiy (Gaussian)" else "mean"
+    binarized_img, threshold_info_text, grayscale_img = result_cache.get_or_compute(
+        ("binarize", work_hash, binarization_params),
+        lambda: apply_binarization(work_array, integral=integral, histogram=histogram, **work_params)
     )
 
     st.sidebar.header("Morfologik Operatsiyalar (Shovqinni Filtrlash)")
     apply_morphology = st.sidebar.checkbox("Morfologik filtrlashni qo'llash", value=True, help="Binarizatsiyadan so'ng kichik shovqin nuqtalarini (masalan, orqa tomondagi Braille nuqtalarini) olib tashlash uchun 'ochilish' operatsiyasini qo'llaydi.")
     
     if apply_morphology:
-        kernel_size_morph = st.sidebar.slider(
-            "Morfologik Kernel Hajmi",
-            min_value=1,
-            max_value=9,
-            value=3,
-            step=2, # Faqat toq sonlarni ta'minlash
-            help="Morfologik operatsiyalar uchun kernel (struktura elementi) hajmi. Kichik qiymatlar kamroq shovqinni olib tashlaydi, katta qiymatlar esa haqiqiy nuqtalarni ham buzishi mumkin."
+        morph_method = st.sidebar.radio(
+            "Filtrlash usuli:",
+            ("Morfologik 'ochilish'", "Maydon bo'yicha (bog'langan komponentlar)"),
+            help="'Ochilish' nuqtalar shaklini kernel bo'yicha silliqlaydi. Maydon bo'yicha filtrlash esa faqat berilgan maydondan kichik komponentlarni butunlay o'chiradi, qolgan nuqtalar shakli o'zgarmaydi."
         )
-        final_processed_img = apply_morphological_opening(binarized_img, kernel_size_morph)
-        morph_caption = f"Morfologik 'ochilish' qo'llanilgan tasvir (Kernel: {kernel_size_morph})"
+        if morph_method == "Morfologik 'ochilish'":
+            kernel_size_morph = st.sidebar.slider(
+                "Morfologik Kernel Hajmi",
+                min_value=1,
+                max_value=9,
+                value=3,
+                step=2, # Faqat toq sonlarni ta'minlash
+                help="Morfologik operatsiyalar uchun kernel (struktura elementi) hajmi. Kichik qiymatlar kamroq shovqinni olib tashlaydi, katta qiymatlar esa haqiqiy nuqtalarni ham buzishi mumkin."
+            )
+            morph_params = ("opening", kernel_size_morph)
+            # Kernel piksellarda: proksida masshtabga mos ravishda kichraytiriladi
+            postprocess = lambda image, scale: apply_morphological_opening(image, scale_odd(kernel_size_morph, scale))
+            morph_caption = f"Morfologik 'ochilish' qo'llanilgan tasvir (Kernel: {kernel_size_morph})"
+        else:
+            min_area = st.sidebar.slider(
+                "Minimal nuqta maydoni (piksel)",
+                min_value=1,
+                max_value=500,
+                value=20,
+                step=1,
+                help="Maydoni shu qiymatdan kichik bo'lgan oq komponentlar (shovqin, orqa tomondagi zaif nuqtalar) olib tashlanadi."
+            )
+            morph_params = ("specks", min_area)
+            postprocess = lambda image, scale: remove_small_specks(image, max(1, round(min_area * scale * scale)))
+            morph_caption = f"Maydoni {min_area} pikseldan kichik komponentlar olib tashlangan tasvir"
     else:
-        final_processed_img = binarized_img
+        morph_params = ()
+        postprocess = None
         morph_caption = "Morfologik filtrlash qo'llanilmagan"
 
+    if postprocess is None:
+        final_processed_img = binarized_img
+        processed_key = ("binarize", work_hash, binarization_params)
+    else:
+        processed_key = (morph_params[0], work_hash, binarization_params, morph_params[1])
+        final_processed_img = result_cache.get_or_compute(processed_key, lambda: postprocess(binarized_img, preview_scale))
+
+    def full_resolution_result():
+        binary = apply_binarization(img_array, **dict(binarization_params))[0]
+        return binary if postprocess is None else postprocess(binary, 1.0)
+
+    full_resolution_download(
+        ("braille", image_hash, binarization_params) + morph_params,
+        full_resolution_result, "braille.png", preview_scale, final_processed_img
+    )
+
 
     st.subheader("Natijalar")
 
     col1, col2 = st.columns(2)
 
     with col1:
-        st.image(grayscale_img, caption="Kulrang tasvir", use_column_width=True)
+        st.image(encode_preview(grayscale_img), caption="Kulrang tasvir", use_column_width=True)
         st.info(f"Ishlatilgan chegara ma'lumotlari: {threshold_info_text}")
 
 
     with col2:
-        st.image(final_processed_img, caption=f"Binarizatsiya qilingan Brayl tasviri ({binarization_method_choice}) va {morph_caption}", use_column_width=True)
+        st.image(encode_preview(final_processed_img, fmt="png"), caption=f"Binarizatsiya qilingan Brayl tasviri ({binarization_method_choice}) va {morph_caption}", use_column_width=True)
+
+    # Nuqtalar -> kataklar panjarasi -> matn (og'ishi rostlangan tasvir uchun)
+    st.subheader("Brayl matni")
+    recognized_lines, cells_info = result_cache.get_or_compute(
+        ("cells",) + processed_key,
+        lambda: read_page(final_processed_img)
+    )
+    if cells_info["cell_pitch"] is None:
+        st.warning("Tasvirda Brayl kataklari panjarasi topilmadi.")
+    else:
+        st.caption(f"{cells_info['dots']} ta nuqta, {cells_info['rejected']} tasi panjaradan tashqarida; "
+                   f"nuqtalar oralig'i {cells_info['dot_pitch']:.1f} px, kataklar qadami {cells_info['cell_pitch']:.1f} px, "
+                   f"qatorlar qadami {cells_info['line_pitch']:.1f} px")
+        st.text("\n".join(recognized_lines))
+
+    st.sidebar.caption(result_cache.stats_text())
 
     st.markdown("""
     ---
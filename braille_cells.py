@@ -0,0 +1,264 @@
+import argparse
+import sys
+
+import cv2
+import numpy as np
+
+from braille_decoder import NoisyChannelDecoder
+
+# Brayl o'lchamlarining katak ichidagi nuqtalar oralig'i (d) ga nisbatlari.
+# Standart: d = 2.5 mm, kataklar qadami 6.2 mm (~2.5 d), qatorlar qadami 10 mm (4 d)
+CELL_PITCH_RANGE = (2.0, 3.4)
+LINE_PITCH_RANGE = (3.2, 6.5)
+# Nuqta markazining panjaradan ruxsat etilgan chetlanishi (d ga nisbatan)
+TOLERANCE = 0.3
+
+
+def detect_dots(binary, min_area=4, max_area=None, invert=None, connectivity=8):
+    """
+    Binar tasvirdagi nuqtalarni bog'langan komponentlar orqali topadi.
+
+    Args:
+        binary (numpy.ndarray): Binarizatsiyalangan tasvir (0/255).
+        min_area (int): Nuqtaning eng kichik yuzasi (piksel).
+        max_area (int): Nuqtaning eng katta yuzasi. None bo'lsa, yuzalar medianasiga
+            nisbatan (0.25x..4x) tanlanadi.
+        invert (bool): True - nuqtalar qora (0). None - oq piksellar ko'p bo'lsa, qora
+            piksellar nuqta hisoblanadi.
+        connectivity (int): 4 yoki 8.
+
+    Returns:
+        tuple: ((M, 2) nuqta markazlari [x, y], (M,) yuzalar).
+    """
+    if invert is None:
+        invert = cv2.countNonZero(binary) > binary.size // 2
+    if invert:
+        binary = cv2.bitwise_not(binary)
+    _, _, stats, centroids = cv2.connectedComponentsWithStats(binary, connectivity=connectivity)
+    stats, centroids = stats[1:], centroids[1:]  # fon
+    area = stats[:, cv2.CC_STAT_AREA]
+    width = stats[:, cv2.CC_STAT_WIDTH]
+    height = stats[:, cv2.CC_STAT_HEIGHT]
+    # Nuqtalar taxminan dumaloq: cho'zinchoq komponentlar (chiziqlar, matn) tashlanadi
+    keep = (area >= min_area) & (np.maximum(width, height) <= 2 * np.minimum(width, height))
+    if max_area is not None:
+        keep &= area <= max_area
+    elif keep.any():
+        median = np.median(area[keep])
+        keep &= (area >= 0.25 * median) & (area <= 4 * median)
+    return centroids[keep], area[keep]
+
+
+def _cluster_1d(values, gap):
+    # Tartiblangan qiymatlarni `gap` dan katta bo'shliqlar bo'yicha guruhlarga bo'lish
+    values = np.sort(values)
+    labels = np.zeros(len(values), np.intp)
+    labels[1:] = np.cumsum(np.diff(values) > gap)
+    counts = np.bincount(labels)
+    return np.bincount(labels, values) / counts, counts
+
+
+def estimate_dot_pitch(centers, areas):
+    """
+    Katak ichidagi qo'shni nuqtalar oralig'ini (d, piksel) baholaydi: nuqtalar satrlari va
+    ustunlari markazlari orasidagi bo'shliqlarning eng kichik tez-tez uchraydigan qiymati.
+    """
+    diameter = 2 * np.sqrt(np.median(areas) / np.pi)
+    gaps = []
+    for axis in (0, 1):
+        axis_centers, _ = _cluster_1d(centers[:, axis], 0.6 * diameter)
+        gaps.append(np.diff(axis_centers))
+    gaps = np.concatenate(gaps)
+    gaps = gaps[gaps > diameter]
+    if not len(gaps):
+        raise ValueError("Nuqtalar oralig'ini aniqlab bo'lmadi: nuqtalar juda kam.")
+    low = np.percentile(gaps, 20)
+    return float(np.median(gaps[gaps <= 1.3 * low]))
+
+
+def fit_lattice(positions, weights, offset_count, dot_pitch, pitch_range, tolerance):
+    """
+    Bir o'lchovli panjarani qidiradi: position ≈ phase + k*pitch + j*dot_pitch,
+    j = 0..offset_count-1 (katak ustunlari yoki qatordagi nuqtalar satrlari).
+
+    Qadam to'r bo'yicha qidiriladi; qadamcha butun sahifada jamlanadigan xato `tolerance`
+    dan oshmaydigan qilib tanlanadi. Har bir qadam uchun markazlar qadam bo'yicha
+    "buklangan" gistogrammaga yig'iladi va barcha fazalar ballari panjara yadrosi bilan
+    aylanma korrelyatsiya (FFT) orqali bir yo'la hisoblanadi. Ball - markazlarning
+    panjaraga yaqinligi (vaznlar bilan).
+
+    Returns:
+        tuple: (phase, pitch).
+    """
+    low, high = pitch_range[0] * dot_pitch, pitch_range[1] * dot_pitch
+    periods = max((positions.max() - positions.min()) / low, 1.0)
+    pitches = np.arange(low, high, max(tolerance / (2 * periods), 0.02))
+    bins = int(np.ceil(4 * high / tolerance))  # faza katakchasi <= tolerance / 4
+    width = pitches / bins
+
+    # Buklangan gistogramma: (qadamlar, katakchalar)
+    folded = np.floor((positions[None, :] % pitches[:, None]) / width[:, None]).astype(np.intp) % bins
+    index = (np.arange(len(pitches))[:, None] * bins + folded).ravel()
+    histogram = np.bincount(index, np.broadcast_to(weights, folded.shape).ravel(),
+                            minlength=len(pitches) * bins).reshape(len(pitches), bins)
+
+    # Faza 0 bo'lganda katakchadagi nuqtaning bali
+    centers = (np.arange(bins) + 0.5)[None, :, None] * width[:, None, None]
+    offsets = np.arange(offset_count) * dot_pitch
+    residual = (centers - offsets + pitches[:, None, None] / 2) % pitches[:, None, None] - pitches[:, None, None] / 2
+    kernel = np.clip(1 - np.abs(residual).min(axis=-1) / tolerance, 0, None)
+
+    scores = np.fft.irfft(np.fft.rfft(histogram) * np.conj(np.fft.rfft(kernel)), n=bins)
+    p, f = np.unravel_index(int(scores.argmax()), scores.shape)
+    return float(f * width[p]), float(pitches[p])
+
+
+def _assign(positions, phase, pitch, dot_pitch, offset_count):
+    # Har bir qiymat uchun (panjara davri k, ichki joy j, chetlanish)
+    j = np.arange(offset_count)
+    k = np.rint((positions[:, None] - phase - j * dot_pitch) / pitch)
+    residual = positions[:, None] - phase - j * dot_pitch - k * pitch
+    best = np.abs(residual).argmin(axis=1)
+    rows = np.arange(len(positions))
+    return k[rows, best].astype(np.intp), best, residual[rows, best]
+
+
+def _refine(positions, phase, pitch, dot_pitch, offset_count, tolerance):
+    # Panjara parametrlarini (phase, pitch, d) eng kichik kvadratlar bilan aniqlashtirish
+    for _ in range(2):
+        k, j, residual = _assign(positions, phase, pitch, dot_pitch, offset_count)
+        inliers = np.abs(residual) < tolerance
+        if inliers.sum() < 3 or len(np.unique(k[inliers])) < 2:
+            break
+        columns = [np.ones(inliers.sum()), k[inliers]]
+        fit_dot_pitch = len(np.unique(j[inliers])) > 1
+        if fit_dot_pitch:
+            columns.append(j[inliers])
+        target = positions[inliers] - (0 if fit_dot_pitch else j[inliers] * dot_pitch)
+        solution, *_ = np.linalg.lstsq(np.column_stack(columns), target, rcond=None)
+        phase, pitch = float(solution[0]), float(solution[1])
+        if fit_dot_pitch:
+            dot_pitch = float(solution[2])
+    return phase, pitch, dot_pitch
+
+
+def extract_cells(binary, dot_pitch=None, invert=None, min_area=4, max_area=None):
+    """
+    Binar sahifadan Brayl kataklari panjarasini ajratib, har bir katakning 6 bitli kodini
+    qaytaradi (i-bit - (i+1)-nuqta, `braille_read` va `braille_trie` bilan bir xil).
+
+    Tasvir og'ishi rostlangan bo'lishi kerak: satrlar gorizontal, kataklar ustunlari
+    butun sahifa bo'ylab bir chiziqda deb qabul qilinadi.
+
+    Args:
+        binary (numpy.ndarray): Binarizatsiyalangan tasvir (0/255).
+        dot_pitch (float): Katak ichidagi nuqtalar oralig'i (piksel). None bo'lsa, baholanadi
+            (300 dpi da taxminan 29-30 piksel).
+        invert, min_area, max_area: `detect_dots` ga uzatiladi.
+
+    Returns:
+        tuple: ((qatorlar, kataklar) uint8 kodlar massivi, parametrlar lug'ati: dot_pitch,
+            cell_pitch, line_pitch, origin (x, y), dots, rejected).
+    """
+    centers, areas = detect_dots(binary, min_area, max_area, invert)
+    info = {"dot_pitch": dot_pitch, "cell_pitch": None, "line_pitch": None, "origin": None,
+            "dots": len(centers), "rejected": 0}
+    if len(centers) < 2:
+        return np.zeros((0, 0), np.uint8), info
+    if dot_pitch is None:
+        try:
+            dot_pitch = estimate_dot_pitch(centers, areas)
+        except ValueError:
+            # Nuqtalar orasida bitta nuqta diametridan katta bo'shliq yo'q (masalan, ikkita tutash nuqta)
+            return np.zeros((0, 0), np.uint8), info
+    tolerance = TOLERANCE * dot_pitch
+    gap = 0.5 * dot_pitch
+
+    x, y = centers[:, 0], centers[:, 1]
+    # Qidiruv nuqtalar satrlari/ustunlari markazlari ustida (vaznlari - nuqtalar soni),
+    # aniqlashtirish esa barcha nuqtalar ustida
+    row_centers, row_counts = _cluster_1d(y, gap)
+    line_phase, line_pitch = fit_lattice(row_centers, row_counts, 3, dot_pitch, LINE_PITCH_RANGE, tolerance)
+    line_phase, line_pitch, dot_pitch_y = _refine(y, line_phase, line_pitch, dot_pitch, 3, tolerance)
+
+    column_centers, column_counts = _cluster_1d(x, gap)
+    cell_phase, cell_pitch = fit_lattice(column_centers, column_counts, 2, dot_pitch, CELL_PITCH_RANGE, tolerance)
+    cell_phase, cell_pitch, dot_pitch_x = _refine(x, cell_phase, cell_pitch, dot_pitch, 2, tolerance)
+
+    line, row, y_residual = _assign(y, line_phase, line_pitch, dot_pitch_y, 3)
+    cell, column, x_residual = _assign(x, cell_phase, cell_pitch, dot_pitch_x, 2)
+    inliers = (np.abs(y_residual) < tolerance) & (np.abs(x_residual) < tolerance)
+    info.update(dot_pitch=(dot_pitch_x + dot_pitch_y) / 2, cell_pitch=cell_pitch, line_pitch=line_pitch,
+                rejected=int(len(centers) - inliers.sum()))
+    if not inliers.any():
+        return np.zeros((0, 0), np.uint8), info
+
+    line, row, cell, column = line[inliers], row[inliers], cell[inliers], column[inliers]
+    first_line, first_cell = line.min(), cell.min()
+    line -= first_line
+    cell -= first_cell
+    info["origin"] = (cell_phase + first_cell * cell_pitch, line_phase + first_line * line_pitch)
+
+    codes = np.zeros((line.max() + 1, cell.max() + 1), np.uint8)
+    np.bitwise_or.at(codes, (line, cell), (1 << (column * 3 + row)).astype(np.uint8))
+    return codes, info
+
+
+def codes_to_dots(codes):
+    """
+    Kodlarni (N, 6) nuqtalar massiviga aylantiradi (`braille_read.find_braille_matches_batch`
+    va `braille_read.nearest_characters` uchun).
+    """
+    codes = np.asarray(codes, np.uint8).reshape(-1)
+    return (codes[:, None] >> np.arange(6, dtype=np.uint8)) & 1
+
+
+def read_page(binary, decoder=None, **kwargs):
+    """
+    Binar sahifani matn qatorlariga aylantiradi: kataklar panjarasi -> Viterbi dekoderi.
+
+    Args:
+        binary (numpy.ndarray): Binarizatsiyalangan, og'ishi rostlangan tasvir.
+        decoder (NoisyChannelDecoder): Dekoder (berilmasa, til modelisiz yaratiladi).
+        **kwargs: `extract_cells` parametrlari.
+
+    Returns:
+        tuple: (list[str] qatorlar, `extract_cells` parametrlari lug'ati).
+    """
+    codes, info = extract_cells(binary, **kwargs)
+    if decoder is None:
+        decoder = NoisyChannelDecoder()
+    return [decoder.decode_text(line).rstrip() for line in codes], info
+
+
+def main(argv):
+    from braille_core import apply_binarization
+    from braille_decoder import BigramModel
+    from braille_trie import cells_to_unicode
+    from image_io import open_image
+
+    parser = argparse.ArgumentParser(description="Brayl sahifasi tasviridan kataklarni ajratib, matnga aylantirish.")
+    parser.add_argument("images", nargs="+", help="Tasvir fayllari")
+    parser.add_argument("--polarity", choices=("auto", "bright", "dark"), default="auto",
+                        help="Nuqtalar binar tasvirda oq (bright) yoki qora (dark)")
+    parser.add_argument("--dot-pitch", type=float, default=None, help="Katak ichidagi nuqtalar oralig'i (piksel)")
+    parser.add_argument("--model", help="braille_decoder bigramm modeli (JSON)")
+    parser.add_argument("--unicode", action="store_true", help="Matn o'rniga Unicode Brayl belgilarini chiqarish")
+    args = parser.parse_args(argv)
+
+    invert = {"auto": None, "bright": False, "dark": True}[args.polarity]
+    decoder = NoisyChannelDecoder(model=BigramModel.from_json(args.model) if args.model else None)
+    for path in args.images:
+        binary, _, _ = apply_binarization(open_image(path, grayscale=True), method="otsu")
+        if args.unicode:
+            codes, info = extract_cells(binary, args.dot_pitch, invert)
+            lines = [cells_to_unicode(line).rstrip("⠀") for line in codes]
+        else:
+            lines, info = read_page(binary, decoder, dot_pitch=args.dot_pitch, invert=invert)
+        print(f"# {path}: {info['dots']} ta nuqta, {info['rejected']} tasi panjaradan tashqarida")
+        print("\n".join(lines))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
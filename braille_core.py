@@ -0,0 +1,385 @@
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+def apply_binarization(image_array, method="otsu", manual_threshold=127, block_size=11, C_value=2, adaptive_method="gaussian",
+                       k_value=0.2, integral=None, histogram=None, dst=None):
+    """
+    Applies binarization to a given image using either Otsu's method, a manual threshold, or adaptive methods.
+    If the image is colored, it is first converted to grayscale.
+
+    Args:
+        image_array (numpy.ndarray): The input image (can be grayscale or color).
+        method (str): Binarization method. Can be "otsu", "manual", or "adaptive".
+        manual_threshold (int): The threshold value to use if method is "manual".
+        block_size (int): Size of a pixel neighborhood that is used to calculate a threshold value for the pixel.
+                          Must be an odd number.
+        C_value (int): Constant subtracted from the mean or weighted mean.
+        adaptive_method (str): Type of adaptive thresholding. Can be "gaussian", "mean", or one of the
+                               integral-image engines: "integral" (mean, same result as "mean"), "sauvola" or "niblack".
+        k_value (float): Sensitivity of the Sauvola/Niblack thresholds.
+        integral (IntegralThresholder): Precomputed integral tables of this image to reuse for the
+                                        integral-image engines. Built on the fly if not given.
+        histogram (GrayHistogram): Cached grayscale plane and histogram of this image. When given, the
+                                   grayscale conversion is skipped and Otsu/manual thresholds are served from it.
+        dst (numpy.ndarray): Optional preallocated (e.g. memory-mapped) output for the binarized image.
+
+    Returns:
+        tuple: A tuple containing:
+            - numpy.ndarray: The binarized image.
+            - str: Information about the threshold value used (Otsu's, manual, or adaptive parameters).
+            - numpy.ndarray: The grayscale version of the input image.
+    """
+    # Tasvir rangli bo'lsa, kulrang tasvirga aylantirish
+    if histogram is not None:
+        grayscale_image = histogram.gray
+    elif len(image_array.shape) == 3:
+        grayscale_image = cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
+    else:
+        grayscale_image = image_array
+
+    binarized_image = None
+    used_threshold_info = ""
+
+    if method == "otsu":
+        # Otsu binarizatsiyasini qo'llash
+        if histogram is not None:
+            ret = histogram.otsu_threshold()
+            binarized_image = histogram.binarize(ret, dst=dst)
+        else:
+            ret, binarized_image = cv2.threshold(grayscale_image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=dst)
+        used_threshold_info = f"Otsu tomonidan hisoblangan: **{ret:.2f}**"
+    elif method == "manual":
+        # Qo'lda binarizatsiyani qo'llash
+        if histogram is not None:
+            binarized_image = histogram.binarize(manual_threshold, dst=dst)
+        else:
+            ret, binarized_image = cv2.threshold(grayscale_image, manual_threshold, 255, cv2.THRESH_BINARY, dst=dst)
+        used_threshold_info = f"Qo'lda belgilangan: **{manual_threshold}**"
+    elif method == "adaptive":
+        # Adaptiv binarizatsiyani qo'llash
+        if adaptive_method == "gaussian":
+            # ADAPTIVE_THRESH_GAUSSIAN_C: chegara qiymati qo'shni piksellarning og'irlikdagi o'rtacha qiymati (Gaussiy oynasi bo'yicha).
+            binarized_image = cv2.adaptiveThreshold(
+                grayscale_image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                cv2.THRESH_BINARY, block_size, C_value, dst=dst
+            )
+            used_threshold_info = f"Adaptiv (Gauss): Block Size **{block_size}**, C **{C_value}**"
+        elif adaptive_method == "mean":
+            # ADAPTIVE_THRESH_MEAN_C: chegara qiymati qo'shni piksel blokining o'rtacha qiymati.
+            binarized_image = cv2.adaptiveThreshold(
+                grayscale_image, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+                cv2.THRESH_BINARY, block_size, C_value, dst=dst
+            )
+            used_threshold_info = f"Adaptiv (O'rtacha): Block Size **{block_size}**, C **{C_value}**"
+        elif adaptive_method in INTEGRAL_METHODS:
+            # Integral tasvir: lokal o'rtacha/dispersiya har qanday blok hajmi uchun 4 ta qiymatdan olinadi
+            if integral is None:
+                integral = IntegralThresholder(grayscale_image, max_block_size=block_size)
+            binarized_image = integral.threshold(block_size, C_value, INTEGRAL_METHODS[adaptive_method], k_value, dst=dst)
+            if adaptive_method == "integral":
+                used_threshold_info = f"Adaptiv (Integral, o'rtacha): Block Size **{block_size}**, C **{C_value}**"
+            else:
+                used_threshold_info = f"Adaptiv ({adaptive_method.capitalize()}): Block Size **{block_size}**, k **{k_value}**"
+    else:
+        # Default holat yoki xato
+        binarized_image = grayscale_image
+        if dst is not None:
+            np.copyto(dst, grayscale_image)
+            binarized_image = dst
+        used_threshold_info = "Hech qanday binarizatsiya qo'llanilmagan"
+
+
+    return binarized_image, used_threshold_info, grayscale_image
+
+# apply_binarization dagi adaptive_method -> IntegralThresholder.threshold usuli
+INTEGRAL_METHODS = {"integral": "mean", "sauvola": "sauvola", "niblack": "niblack"}
+
+# Har bir chegara t uchun jadval: LUT[t][v] = 255, agar v > t (cv2.THRESH_BINARY bilan bir xil)
+_BINARY_LUTS = np.where(np.arange(256)[None, :] > np.arange(256)[:, None], 255, 0).astype(np.uint8)
+
+
+class GrayHistogram:
+    """
+    Grayscale plane of an image together with its 256-bin histogram, computed once
+    per upload. Otsu's threshold and the fraction of pixels above any threshold come
+    straight from the histogram, and binarization with a given threshold is a single
+    lookup-table pass, so moving the threshold slider never re-converts the image.
+
+    Args:
+        image_array (numpy.ndarray): The input image (can be grayscale or color).
+    """
+    def __init__(self, image_array):
+        if image_array.ndim == 3:
+            self.gray = cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
+        else:
+            self.gray = np.ascontiguousarray(image_array)
+        self.hist = cv2.calcHist([self.gray], [0], None, [256], [0, 256]).ravel().astype(np.int64)
+        self.cumsum = np.cumsum(self.hist)
+        self.total = int(self.cumsum[-1])
+        self._otsu = None
+
+    @property
+    def nbytes(self):
+        return self.gray.nbytes + self.hist.nbytes + self.cumsum.nbytes
+
+    def otsu_threshold(self):
+        """
+        Otsu's threshold computed from the histogram (same value as `cv2.THRESH_OTSU`).
+
+        Returns:
+            int: The threshold; pixels above it are foreground.
+        """
+        if self._otsu is None:
+            levels = np.arange(256, dtype=np.float64)
+            p = self.hist / float(max(self.total, 1))
+            q1 = np.cumsum(p)
+            q2 = 1.0 - q1
+            mu1_sum = np.cumsum(levels * p)
+            mu = mu1_sum[-1]
+            eps = np.finfo(np.float32).eps
+            valid = (np.minimum(q1, q2) >= eps) & (np.maximum(q1, q2) <= 1.0 - eps)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mu1 = mu1_sum / q1
+                mu2 = (mu - q1 * mu1) / q2
+                sigma = np.where(valid, q1 * q2 * (mu1 - mu2) ** 2, 0.0)
+            # OpenCV kabi: eng katta dispersiyali birinchi daraja (qat'iy ">" taqqoslash)
+            self._otsu = int(np.argmax(sigma)) if sigma.max() > 0 else 0
+        return self._otsu
+
+    def fraction_above(self, threshold):
+        """
+        Fraction of pixels that become white (255) for a threshold, from the cumulative histogram.
+
+        Args:
+            threshold (int): Threshold value (0-255).
+
+        Returns:
+            float: Share of pixels with value > threshold.
+        """
+        threshold = int(np.clip(threshold, 0, 255))
+        return 1.0 - self.cumsum[threshold] / float(max(self.total, 1))
+
+    def binarize(self, threshold, dst=None):
+        """
+        Binarizes the cached grayscale plane with a precomputed lookup table.
+
+        Args:
+            threshold (int): Threshold value (0-255).
+            dst (numpy.ndarray): Optional preallocated output.
+
+        Returns:
+            numpy.ndarray: The binarized image.
+        """
+        return cv2.LUT(self.gray, _BINARY_LUTS[int(np.clip(threshold, 0, 255))], dst=dst)
+
+# Kvadrat kernellar keshi (har chaqiriqda yangi np.ones ajratmaslik uchun)
+_square_kernels = {}
+
+
+def _square_kernel(kernel_size):
+    kernel = _square_kernels.get(kernel_size)
+    if kernel is None:
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (kernel_size, kernel_size))
+        _square_kernels[kernel_size] = kernel
+    return kernel
+
+
+# Morfologik "ochilish" (Opening) operatsiyasini qo'llash
+def apply_morphological_opening(image, kernel_size, dst=None):
+    """
+    Applies morphological opening operation to the binarized image.
+    This helps to remove small objects (noise) and smooth contours.
+
+    Erosion and dilation are fused into a single `cv2.morphologyEx` call with a
+    rectangular structuring element, which OpenCV evaluates as separable row and
+    column min/max passes (O(k) instead of O(k^2) per pixel) without returning an
+    intermediate eroded image. Pass `dst=image` to filter in place.
+
+    Args:
+        image (numpy.ndarray): The binarized image.
+        kernel_size (int): Size of the kernel for erosion and dilation. Must be an odd number.
+        dst (numpy.ndarray): Optional preallocated (e.g. memory-mapped) output array.
+
+    Returns:
+        numpy.ndarray: Image after morphological opening.
+    """
+    if kernel_size % 2 == 0: # Kernel hajmi toq son bo'lishini ta'minlash
+        kernel_size += 1
+
+    # Eroziya (kichik obyektlarni olib tashlaydi) va dilatasiya (haqiqiy obyektlarni tiklaydi) bitta chaqiriqda
+    return cv2.morphologyEx(image, cv2.MORPH_OPEN, _square_kernel(kernel_size), dst=dst)
+
+
+def remove_small_specks(image, min_area, connectivity=8, dst=None):
+    """
+    Removes foreground (non-zero) connected components smaller than `min_area` pixels.
+
+    Unlike opening, this keeps the exact shape of every surviving Braille dot and only
+    deletes whole components, so it is more selective for faint back-side dots and
+    its cost does not grow with the equivalent kernel size.
+
+    Args:
+        image (numpy.ndarray): The binarized image.
+        min_area (int): Minimum component area (in pixels) to keep.
+        connectivity (int): 4 or 8.
+        dst (numpy.ndarray): Optional preallocated output array (may be `image` itself).
+
+    Returns:
+        numpy.ndarray: Image with small components removed.
+    """
+    _, labels, stats, _ = cv2.connectedComponentsWithStats(image, connectivity=connectivity)
+    keep = np.where(stats[:, cv2.CC_STAT_AREA] >= min_area, 255, 0).astype(np.uint8)
+    keep[0] = 0 # fon
+    if dst is None:
+        dst = np.empty(image.shape, np.uint8)
+    return np.take(keep, labels, out=dst)
+
+
+class IntegralThresholder:
+    """
+    Summed-area table (integral image) based adaptive thresholding engine.
+
+    The integral of the grayscale image and of its square are computed once per
+    image; afterwards the local mean and standard deviation for *any* odd block
+    size are four table lookups per pixel, so changing block size, C or k does not
+    recompute anything heavy. The per-block-size local statistics of the last few
+    block sizes are kept, so changing only C or k is a single comparison pass.
+    Borders are replicated like `cv2.adaptiveThreshold`.
+
+    Args:
+        grayscale_image (numpy.ndarray): Single-channel uint8 image (RGB images are converted).
+        max_block_size (int): Largest block size that will be requested (sets the border padding).
+        cached_block_sizes (int): How many block sizes' local statistics to keep.
+    """
+    def __init__(self, grayscale_image, max_block_size=101, cached_block_sizes=4):
+        if grayscale_image.ndim == 3:
+            grayscale_image = cv2.cvtColor(grayscale_image, cv2.COLOR_RGB2GRAY)
+        self.shape = grayscale_image.shape[:2]
+        self.max_block_size = max_block_size
+        self.pad = max_block_size // 2
+        padded = cv2.copyMakeBorder(grayscale_image, self.pad, self.pad, self.pad, self.pad, cv2.BORDER_REPLICATE)
+        self.gray = np.ascontiguousarray(grayscale_image)
+        self.sum, self.sqsum = cv2.integral2(padded, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+        self.cached_block_sizes = cached_block_sizes
+        self._gray16 = None
+        self._gray32 = None
+        self._stats = OrderedDict()  # (tur, blok o'lchami) -> lokal statistika
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        size = self.sum.nbytes + self.sqsum.nbytes + self.gray.nbytes
+        for extra in (self._gray16, self._gray32):
+            size += 0 if extra is None else extra.nbytes
+        for value in self._stats.values():
+            size += sum(v.nbytes for v in value) if isinstance(value, tuple) else value.nbytes
+        return size
+
+    @property
+    def max_nbytes(self):
+        """
+        Upper bound of `nbytes` once every lazily built plane exists: the int16 and float32
+        grayscale copies and `cached_block_sizes` entries of local statistics (two float32
+        planes each). Caches reserve this much up front, since the object grows after insertion.
+        """
+        pixels = self.gray.size
+        fixed = self.sum.nbytes + self.sqsum.nbytes + self.gray.nbytes
+        return fixed + pixels * (2 + 4) + self.cached_block_sizes * pixels * 2 * 4
+
+    def _box(self, table, block_size):
+        # table[y0:y1, x0:x1] yig'indisi har bir piksel uchun: D - B - C + A
+        h, w = self.shape
+        r = block_size // 2
+        y0 = self.pad - r
+        x0 = self.pad - r
+        y1 = y0 + block_size
+        x1 = x0 + block_size
+        box = np.subtract(table[y1:y1 + h, x1:x1 + w], table[y0:y0 + h, x1:x1 + w])
+        box -= table[y1:y1 + h, x0:x0 + w]
+        box += table[y0:y0 + h, x0:x0 + w]
+        return box
+
+    def _check_block_size(self, block_size):
+        if block_size % 2 == 0 or block_size < 3:
+            raise ValueError(f"Block size must be an odd number >= 3, got {block_size}.")
+        if block_size > self.max_block_size:
+            raise ValueError(f"Block size {block_size} exceeds max_block_size={self.max_block_size}.")
+
+    def _cached(self, key, compute):
+        # Bitta tasvir obyekti bir nechta Streamlit sessiyasi orasida bo'lishilishi mumkin
+        with self._lock:
+            value = self._stats.get(key)
+            if value is None:
+                value = compute()
+                self._stats[key] = value
+                while len(self._stats) > self.cached_block_sizes:
+                    self._stats.popitem(last=False)
+            else:
+                self._stats.move_to_end(key)
+            return value
+
+    def local_mean(self, block_size):
+        """
+        Returns the rounded local mean as uint8 (the value `ADAPTIVE_THRESH_MEAN_C` compares against).
+        """
+        self._check_block_size(block_size)
+        area = float(block_size * block_size)
+        return self._cached(("mean", block_size),
+                            lambda: cv2.multiply(self._box(self.sum, block_size), 1.0 / area, dtype=cv2.CV_8U))
+
+    def local_stats(self, block_size):
+        """
+        Returns the local mean and standard deviation (float32) for a block size.
+        """
+        self._check_block_size(block_size)
+
+        def compute():
+            area = float(block_size * block_size)
+            mean = self._box(self.sum, block_size)
+            mean /= area
+            variance = self._box(self.sqsum, block_size)
+            variance /= area
+            variance -= mean * mean
+            np.maximum(variance, 0.0, out=variance)
+            return mean.astype(np.float32), np.sqrt(variance).astype(np.float32)
+
+        return self._cached(("stats", block_size), compute)
+
+    def threshold(self, block_size, C_value=2, method="mean", k_value=0.2, R_value=128.0, dst=None):
+        """
+        Binarizes the image with a local threshold; pixels above it become 255.
+
+        Args:
+            block_size (int): Odd neighborhood size.
+            C_value (float): Constant subtracted from the local mean ("mean" method).
+            method (str): "mean" (T = round(m) - C, same rule as ADAPTIVE_THRESH_MEAN_C),
+                "sauvola" (T = m * (1 + k * (s / R - 1))) or "niblack" (T = m + k * s).
+            k_value (float): Sauvola/Niblack sensitivity.
+            R_value (float): Sauvola dynamic range of the standard deviation.
+            dst (numpy.ndarray): Optional preallocated output.
+
+        Returns:
+            numpy.ndarray: The binarized image.
+        """
+        if method == "mean":
+            # cv2.adaptiveThreshold bilan bir xil: src - round(mean) > -ceil(C)
+            if self._gray16 is None:
+                self._gray16 = self.gray.astype(np.int16)
+            limit = cv2.subtract(self.local_mean(block_size), float(np.ceil(C_value)), dtype=cv2.CV_16S)
+            return cv2.compare(self._gray16, limit, cv2.CMP_GT, dst=dst)
+
+        if method not in ("sauvola", "niblack"):
+            raise ValueError(f"Unknown integral threshold method: {method}")
+        mean, std = self.local_stats(block_size)
+        if self._gray32 is None:
+            self._gray32 = self.gray.astype(np.float32)
+        if method == "sauvola":
+            limit = std * np.float32(k_value / R_value)
+            limit += np.float32(1.0 - k_value)
+            limit *= mean
+        else:
+            limit = cv2.scaleAdd(std, k_value, mean)
+        return cv2.compare(self._gray32, limit, cv2.CMP_GT, dst=dst)
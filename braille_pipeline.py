@@ -0,0 +1,166 @@
+import argparse
+import sys
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from braille_core import apply_binarization, apply_morphological_opening
+from clahe_core import clahe_cache
+from deskew_core import MIN_CONFIDENCE, estimate_skew, rotate_image
+
+STAGES = ("gray", "deskew", "clahe", "binarize", "opening")
+
+
+class BraillePipeline:
+    """
+    Brayl tasvirini oldindan qayta ishlashning yagona konveyeri:
+    kulrang -> og'ishni rostlash -> CLAHE -> binarizatsiya -> morfologik ochilish.
+
+    Barcha bosqichlar bitta kanalda ishlaydi (CLAHE "gray" rejimida), natijalar
+    tasvir o'lchami bo'yicha oldindan ajratilgan buferlarga OpenCV `dst=` argumenti
+    orqali yoziladi, shuning uchun bir xil o'lchamdagi kadrlar oqimida yangi
+    massivlar ajratilmaydi. Har bir bosqich vaqti alohida yig'iladi.
+    """
+    def __init__(self, clip_limit=2.0, tile_grid_size=8, method="otsu", manual_threshold=127,
+                 block_size=11, C_value=2, adaptive_method="gaussian", kernel_size=3, deskew=True):
+        self.clip_limit = clip_limit
+        self.tile_grid_size = tile_grid_size
+        self.binarization_params = dict(method=method, manual_threshold=manual_threshold, block_size=block_size,
+                                        C_value=C_value, adaptive_method=adaptive_method)
+        self.kernel_size = kernel_size
+        self.deskew = deskew
+        self.last_angle = 0.0
+        self.last_confidence = 0.0
+        self._buffers = {}
+        self.reset_timings()
+
+    def reset_timings(self):
+        self.frames = 0
+        self.timings = OrderedDict((stage, 0.0) for stage in STAGES)
+
+    def _buffers_for(self, shape):
+        # Har bir (H, W) uchun bir marta ajratiladigan oraliq buferlar
+        buffers = self._buffers.get(shape)
+        if buffers is None:
+            buffers = {name: np.empty(shape, np.uint8) for name in ("gray", "rotated", "clahe", "binary", "opened")}
+            self._buffers[shape] = buffers
+        return buffers
+
+    def _lap(self, stage, tick):
+        now = time.perf_counter()
+        self.timings[stage] += now - tick
+        return now
+
+    def process(self, image, out=None):
+        """
+        Bitta kadrni butun konveyer orqali o'tkazadi.
+
+        Args:
+            image (numpy.ndarray): Kulrang yoki RGB tasvir.
+            out (numpy.ndarray): Yakuniy natija uchun bufer (ixtiyoriy). Berilmasa, ichki
+                bufer qaytariladi va u keyingi shu o'lchamdagi kadrda qayta yoziladi.
+
+        Returns:
+            numpy.ndarray: Binarizatsiya va ochilishdan o'tgan tasvir.
+        """
+        shape = image.shape[:2]
+        buffers = self._buffers_for(shape)
+        tick = time.perf_counter()
+
+        if image.ndim == 3:
+            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY, dst=buffers["gray"])
+        else:
+            gray = image
+        tick = self._lap("gray", tick)
+
+        if self.deskew:
+            self.last_angle, self.last_confidence = estimate_skew(gray)
+            # Ishonchsiz baho (tuzilmasiz kadr) bo'yicha aylantirilmaydi
+            if self.last_angle != 0 and self.last_confidence >= MIN_CONFIDENCE:
+                gray = rotate_image(gray, self.last_angle, dst=buffers["rotated"])
+        tick = self._lap("deskew", tick)
+
+        enhanced = clahe_cache.apply(gray, self.clip_limit, self.tile_grid_size, dst=buffers["clahe"])
+        tick = self._lap("clahe", tick)
+
+        binary, _, _ = apply_binarization(enhanced, dst=buffers["binary"], **self.binarization_params)
+        tick = self._lap("binarize", tick)
+
+        result = apply_morphological_opening(binary, self.kernel_size, dst=buffers["opened"] if out is None else out)
+        self._lap("opening", tick)
+
+        self.frames += 1
+        return result
+
+    def process_stream(self, frames, copy=False):
+        """
+        Kadrlar oqimini qayta ishlaydi.
+
+        Args:
+            frames (iterable): Tasvirlar (numpy.ndarray) oqimi.
+            copy (bool): True bo'lsa, har bir natijaning nusxasi qaytariladi. Aks holda
+                qaytarilgan massiv keyingi kadr bilan qayta yoziladi.
+
+        Yields:
+            numpy.ndarray: Qayta ishlangan kadr.
+        """
+        for frame in frames:
+            result = self.process(frame)
+            yield result.copy() if copy else result
+
+    def report(self):
+        """
+        Bosqichlar bo'yicha vaqt hisobotini qaytaradi.
+
+        Returns:
+            list[dict]: Har bir bosqich uchun umumiy vaqt (s), bitta kadrga o'rtacha (ms) va ulushi (%).
+        """
+        total = sum(self.timings.values()) or 1.0
+        frames = self.frames or 1
+        return [
+            {"stage": stage, "seconds": seconds, "ms_per_frame": seconds * 1000 / frames, "share": seconds / total * 100}
+            for stage, seconds in self.timings.items()
+        ]
+
+    def report_text(self):
+        lines = [f"{self.frames} ta kadr:"]
+        for row in self.report():
+            lines.append(f"  {row['stage']:<10} {row['ms_per_frame']:>9.2f} ms/kadr  {row['share']:>5.1f}%")
+        return "\n".join(lines)
+
+
+def main(argv):
+    from clahe_batch import find_images
+    from image_io import open_image
+
+    parser = argparse.ArgumentParser(description="Brayl konveyerini tasvirlar ustida ishga tushirib, bosqichlar vaqtini ko'rsatish.")
+    parser.add_argument("inputs", nargs="+", help="Kataloglar, fayllar yoki glob shablonlari")
+    parser.add_argument("--clip-limit", type=float, default=2.0)
+    parser.add_argument("--tile-grid-size", type=int, default=8)
+    parser.add_argument("--method", choices=("otsu", "manual", "adaptive"), default="otsu")
+    parser.add_argument("--manual-threshold", type=int, default=127)
+    parser.add_argument("--block-size", type=int, default=11)
+    parser.add_argument("--C", dest="C_value", type=int, default=2)
+    parser.add_argument("--adaptive-method", choices=("gaussian", "mean", "integral", "sauvola", "niblack"), default="gaussian")
+    parser.add_argument("--kernel-size", type=int, default=3)
+    parser.add_argument("--no-deskew", action="store_true", help="Og'ishni rostlash bosqichini o'tkazib yuborish")
+    args = parser.parse_args(argv)
+
+    paths = find_images(args.inputs)
+    if not paths:
+        print("Hech qanday tasvir topilmadi.", file=sys.stderr)
+        return 1
+
+    pipeline = BraillePipeline(args.clip_limit, args.tile_grid_size, args.method, args.manual_threshold,
+                               args.block_size, args.C_value, args.adaptive_method, args.kernel_size,
+                               deskew=not args.no_deskew)
+    for _ in pipeline.process_stream(open_image(path, grayscale=True) for path in paths):
+        pass
+    print(pipeline.report_text())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,39 +1,115 @@
 import json
+import os
 from math import fabs
 
-with open('braille.json', 'r') as f:
+import numpy as np
+
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'braille.json'), 'r') as f:
     data = json.load(f)
 
+# Katak nuqtalari bitlarining og'irliklari: kod = sum(nuqta_i << i)
+CELL_WEIGHTS = 1 << np.arange(6)
+
 def hamming_distance(bi, ci):
     return sum([int(fabs(bi[i] - ci[i])) for i in range(6)])
 
+def encode_cell(code):
+    """
+    6 nuqtali katakni 0..63 oralig'idagi butun songa aylantiradi (i-nuqta -> i-bit).
+    0.5 va undan katta qiymatlar ko'tarilgan nuqta hisoblanadi.
+    """
+    return sum(1 << i for i in range(6) if code[i] >= 0.5)
+
+def build_lookup_table(alphabet):
+    """
+    Alifboni bir marta kompilyatsiya qiladi: 64 ta mumkin bo'lgan katakning har biri uchun
+    Hamming masofasi 0, 1 va 2 bo'lgan belgilar ro'yxatlari (braille.json tartibida).
+
+    Args:
+        alphabet (dict): Belgi -> 6 nuqtali kod.
+
+    Returns:
+        list[tuple]: 64 ta (masofa_0, masofa_1, masofa_2) kortejlari.
+    """
+    codes = [(char, encode_cell(code)) for char, code in alphabet.items()]
+    table = []
+    for cell in range(64):
+        matches = ([], [], [])
+        for char, code in codes:
+            distance = bin(cell ^ code).count("1")
+            if distance <= 2:
+                matches[distance].append(char)
+        table.append(tuple(tuple(m) for m in matches))
+    return table
+
+def build_nearest_table(alphabet):
+    """
+    Har bir 64 katak uchun eng yaqin belgi (teng masofada braille.json dagi birinchisi)
+    va unga masofa - butun sahifani NumPy indekslash bilan aniqlash uchun.
+
+    Returns:
+        tuple: (numpy.ndarray belgilar, numpy.ndarray masofalar), har biri 64 elementli.
+    """
+    chars = list(alphabet)
+    codes = np.array([encode_cell(alphabet[c]) for c in chars])
+    cells = np.arange(64)[:, None]
+    distances = np.array([[bin(x).count("1") for x in row] for row in (cells ^ codes[None, :])])
+    best = distances.argmin(axis=1)
+    return np.array(chars, dtype=object)[best], distances[np.arange(64), best].astype(np.uint8)
+
+LOOKUP_TABLE = build_lookup_table(data)
+NEAREST_CHARS, NEAREST_DISTANCES = build_nearest_table(data)
+
 def find_braille_matches(input_code):
-    matches_0 = []
-    matches_1 = []
-    matches_2 = []
-    
-    for char, code in data.items():
-        distance = hamming_distance(input_code, code)
-        if distance == 0:
-            matches_0.append(char)
-        elif distance == 1:
-            matches_1.append(char)
-        elif distance == 2:
-            matches_2.append(char)
-    
-    return matches_0, matches_1, matches_2
-
-# CNN modelidan chiqqan misol kod (dinamik kiritish uchun)
-input_code = [1, 0, 0, 0, 1, 1]  # Masalan, "f" harfi
-
-# Hamming masofasiga ko'ra belgilarni topish
-matches_0, matches_1, matches_2 = find_braille_matches(input_code)
-
-# Natijani chiqarish
-print("Hamming masofasi ≤ 2 bo'lgan belgilar:")
-if matches_0:
-    print(f"Masofa 0: {'", "'.join(matches_0)} ([{', '.join(map(str, data[matches_0[0]]))}]).")
-if matches_1:
-    print(f"Masofa 1: {'", "'.join(matches_1)}.")
-if matches_2:
-    print(f"Masofa 2: {'", "'.join(matches_2)}.")
\ No newline at end of file
+    matches_0, matches_1, matches_2 = LOOKUP_TABLE[encode_cell(input_code)]
+    return list(matches_0), list(matches_1), list(matches_2)
+
+def encode_cells(cells):
+    """
+    (N, 6) massivdagi kataklarni 0..63 kodlariga aylantiradi.
+    """
+    cells = np.asarray(cells)
+    return (cells.reshape(-1, 6) >= 0.5) @ CELL_WEIGHTS
+
+def find_braille_matches_batch(cells):
+    """
+    Butun sahifa kataklari uchun `find_braille_matches` natijalari.
+
+    Args:
+        cells (numpy.ndarray): (N, 6) nuqtalar massivi (masalan, CNN chiqishi).
+
+    Returns:
+        list[tuple]: Har bir katak uchun (masofa_0, masofa_1, masofa_2) kortejlari.
+    """
+    return [LOOKUP_TABLE[code] for code in encode_cells(cells).tolist()]
+
+def nearest_characters(cells):
+    """
+    Har bir katak uchun eng yaqin belgi va masofa (to'liq vektorlashtirilgan).
+
+    Args:
+        cells (numpy.ndarray): (N, 6) nuqtalar massivi.
+
+    Returns:
+        tuple: (numpy.ndarray belgilar, numpy.ndarray masofalar).
+    """
+    codes = encode_cells(cells)
+    return NEAREST_CHARS[codes], NEAREST_DISTANCES[codes]
+
+if __name__ == "__main__":
+    # CNN modelidan chiqqan misol kod (dinamik kiritish uchun)
+    input_code = [1, 0, 0, 0, 1, 1]  # Masalan, "f" harfi
+
+    # Hamming masofasiga ko'ra belgilarni topish
+    matches_0, matches_1, matches_2 = find_braille_matches(input_code)
+
+    # Natijani chiqarish
+    separator = '", "'
+    print("Hamming masofasi ≤ 2 bo'lgan belgilar:")
+    if matches_0:
+        code_text = ", ".join(map(str, data[matches_0[0]]))
+        print(f"Masofa 0: {separator.join(matches_0)} ([{code_text}]).")
+    if matches_1:
+        print(f"Masofa 1: {separator.join(matches_1)}.")
+    if matches_2:
+        print(f"Masofa 2: {separator.join(matches_2)}.")
@@ -0,0 +1,258 @@
+import json
+import os
+
+import numpy as np
+
+# Unicode Brayl bloki: U+2800 + niqob, bu yerda i-bit (i+1)-nuqtaga mos (1..8 nuqtalar)
+BRAILLE_UNICODE_BASE = 0x2800
+MAX_DOTS = 8
+POPCOUNT = [bin(i).count("1") for i in range(1 << MAX_DOTS)]
+DOT_WEIGHTS = 1 << np.arange(MAX_DOTS)
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "braille.json")
+
+# Matnga aylantirishda maxsus ma'noga ega yozuvlar (braille.json dagi nomlar)
+CAPITAL_INDICATOR = "^"
+NUMBER_INDICATOR = "num"
+FORMAT_INDICATORS = ("italic",)
+NUMBER_LETTERS = dict(zip("abcdefghij", "1234567890"))
+
+
+def dots_to_mask(dots):
+    """
+    6 yoki 8 nuqtali katakni (0/1 ro'yxati) niqobga aylantiradi: i-element -> i-bit.
+    """
+    if not 0 < len(dots) <= MAX_DOTS:
+        raise ValueError(f"Katakda 1..{MAX_DOTS} nuqta bo'lishi kerak, berildi: {len(dots)}")
+    return sum(1 << i for i, dot in enumerate(dots) if dot >= 0.5)
+
+
+def unicode_to_cells(text):
+    """
+    Unicode Brayl satrini (U+2800..U+28FF) kataklar niqoblari ro'yxatiga aylantiradi.
+    """
+    cells = []
+    for ch in text:
+        mask = ord(ch) - BRAILLE_UNICODE_BASE
+        if not 0 <= mask < 1 << MAX_DOTS:
+            raise ValueError(f"Brayl belgisi emas: {ch!r}")
+        cells.append(mask)
+    return cells
+
+
+def cells_to_unicode(cells):
+    return "".join(chr(BRAILLE_UNICODE_BASE + int(cell)) for cell in cells)
+
+
+def parse_cells(value):
+    """
+    Jadval yozuvining qiymatini kataklar ketma-ketligiga aylantiradi. Qabul qilinadigan
+    ko'rinishlar: bitta katak ([1,0,0,0,0,0]), bir necha katak ([[...], [...]]) yoki
+    Unicode Brayl satri ("⠁⠃").
+
+    Returns:
+        tuple[int]: Kataklar niqoblari.
+    """
+    if isinstance(value, str):
+        return tuple(unicode_to_cells(value))
+    if value and isinstance(value[0], (list, tuple)):
+        return tuple(dots_to_mask(cell) for cell in value)
+    return (dots_to_mask(value),)
+
+
+def encode_cells(cells):
+    """
+    Kataklar oqimini niqoblar ro'yxatiga keltiradi: (N, 6) yoki (N, 8) nuqtalar massivi,
+    Unicode Brayl satri yoki tayyor niqoblar ketma-ketligi.
+    """
+    if isinstance(cells, str):
+        return unicode_to_cells(cells)
+    array = np.asarray(cells)
+    if array.ndim == 2:
+        return ((array >= 0.5) @ DOT_WEIGHTS[:array.shape[1]]).tolist()
+    return array.astype(np.int64).tolist()
+
+
+class BrailleTrie:
+    """
+    Kataklar ketma-ketliklari bo'yicha prefiks daraxti: bitta katakli harflar ham, bir necha
+    katakka yoyilgan qisqartmalar (Grade 2) ham bitta indeksda saqlanadi.
+
+    `decode` sahifaning kataklar oqimini bir marta chapdan o'ngga o'tib, har bir joyda eng
+    uzun mos yozuvni tanlaydi. Noaniq tanish (yo'qolgan yoki ortiqcha nuqtalar) uchun mos
+    kelish Hamming masofasi bo'yicha chegaralangan: yozuv kataklari bilan oqim kataklari
+    orasidagi nuqtalar farqlari yig'indisi `max_distance` dan oshmasligi kerak. Nomzodlar
+    avval masofa, keyin uzunlik bo'yicha tartiblanadi, shuning uchun aniq mos kelish har doim
+    noaniqdan ustun turadi. 6 nuqtali yozuvlar 8 nuqtali oqimda ham ishlaydi: 7 va 8-nuqtalar
+    nolga teng deb hisoblanadi.
+
+    Tugunlar ro'yxatlarda saqlanadi: `_children[tugun]` - {katak: bola tugun} lug'ati,
+    `_texts[tugun]` - shu tugunda tugaydigan yozuv matni (yoki None).
+    """
+    def __init__(self, mapping=None):
+        self._children = [{}]
+        self._texts = [None]
+        self.max_length = 0
+        self.size = 0
+        if mapping:
+            self.update(mapping)
+
+    @classmethod
+    def from_json(cls, *paths):
+        """
+        Bir yoki bir necha JSON jadvaldan (braille.json formatida) daraxt quradi.
+        Keyingi fayllar oldingilaridagi qisqartmalarni to'ldiradi.
+        """
+        trie = cls()
+        for path in paths or (DEFAULT_TABLE_PATH,):
+            with open(path, "r", encoding="utf-8") as f:
+                trie.update(json.load(f))
+        return trie
+
+    def update(self, mapping):
+        for text, value in mapping.items():
+            self.add(parse_cells(value), text)
+
+    def add(self, cells, text):
+        """
+        Yozuv qo'shadi. Bir xil kataklar ketma-ketligi uchun birinchi qo'shilgan matn
+        saqlanadi (braille.json dagi "(" va ")" kabi).
+        """
+        if not cells:
+            raise ValueError("Bo'sh kataklar ketma-ketligi.")
+        node = 0
+        for cell in cells:
+            child = self._children[node].get(cell)
+            if child is None:
+                child = len(self._children)
+                self._children.append({})
+                self._texts.append(None)
+                self._children[node][cell] = child
+            node = child
+        if self._texts[node] is None:
+            self._texts[node] = text
+            self.size += 1
+            self.max_length = max(self.max_length, len(cells))
+
+    def __len__(self):
+        return self.size
+
+    def _match_exact(self, cells, start):
+        best = None
+        node = 0
+        children = self._children
+        for position in range(start, min(len(cells), start + self.max_length)):
+            node = children[node].get(cells[position])
+            if node is None:
+                break
+            if self._texts[node] is not None:
+                best = (self._texts[node], position + 1 - start, 0)
+        return best
+
+    def match(self, cells, start=0, max_distance=0):
+        """
+        `start` joyidan boshlanadigan eng yaxshi yozuv.
+
+        Args:
+            cells (list[int]): Kataklar niqoblari.
+            start (int): Boshlang'ich joy.
+            max_distance (int): Yozuv bo'yicha jami ruxsat etilgan Hamming masofasi.
+
+        Returns:
+            tuple | None: (matn, kataklar soni, masofa) yoki hech narsa mos kelmasa None.
+        """
+        if max_distance <= 0:
+            return self._match_exact(cells, start)
+        best = None
+        best_key = (max_distance, 1)  # (masofa, -uzunlik); har qanday ruxsat etilgan nomzoddan katta
+        end = min(len(cells), start + self.max_length)
+        stack = [(0, start, 0)]  # (tugun, keyingi katak joyi, shu paytgacha masofa)
+        while stack:
+            node, position, cost = stack.pop()
+            if position >= end:
+                continue
+            cell = cells[position]
+            for key, child in self._children[node].items():
+                child_cost = cost + POPCOUNT[key ^ cell]
+                # Masofa faqat o'sadi: eng yaxshisidan katta bo'lsa, bu tarmoq yaxshilanmaydi
+                if child_cost > best_key[0]:
+                    continue
+                if self._texts[child] is not None:
+                    candidate = (child_cost, -(position + 1 - start))
+                    if candidate < best_key:
+                        best_key = candidate
+                        best = (self._texts[child], position + 1 - start, child_cost)
+                stack.append((child, position + 1, child_cost))
+        return best
+
+    def decode(self, cells, max_distance=1, unknown=None):
+        """
+        Kataklar oqimini bir o'tishda eng uzun mos yozuvlarga bo'ladi.
+
+        Args:
+            cells: (N, 6|8) nuqtalar massivi, Unicode Brayl satri yoki niqoblar ro'yxati.
+            max_distance (int): Bitta yozuv uchun ruxsat etilgan Hamming masofasi.
+            unknown (str): Tanilmagan katak uchun matn. None bo'lsa, katakning Unicode belgisi.
+
+        Yields:
+            tuple: (matn, boshlanish joyi, kataklar soni, masofa). Tanilmagan katak uchun
+                masofa None.
+        """
+        cells = encode_cells(cells)
+        position = 0
+        while position < len(cells):
+            found = self.match(cells, position, max_distance)
+            if found is None:
+                text = cells_to_unicode(cells[position:position + 1]) if unknown is None else unknown
+                yield text, position, 1, None
+                position += 1
+                continue
+            text, length, distance = found
+            yield text, position, length, distance
+            position += length
+
+    def decode_text(self, cells, max_distance=1, unknown=None):
+        return tokens_to_text(token[0] for token in self.decode(cells, max_distance, unknown))
+
+
+def tokens_to_text(texts):
+    """
+    Yozuvlar matnlarini yakuniy matnga yig'adi: bosh harf belgisi keyingi yozuvni katta
+    harf bilan boshlaydi, son belgisidan keyin a..j harflari raqamlarga aylanadi (harf bo'lmagan
+    birinchi yozuvgacha), formatlash belgilari (kursiv) tashlab yuboriladi.
+    """
+    parts = []
+    capital = False
+    number = False
+    for text in texts:
+        if text == CAPITAL_INDICATOR:
+            capital = True
+            continue
+        if text == NUMBER_INDICATOR:
+            number = True
+            continue
+        if text in FORMAT_INDICATORS:
+            continue
+        if number:
+            if text in NUMBER_LETTERS:
+                parts.append(NUMBER_LETTERS[text])
+                continue
+            number = False
+        if capital:
+            text = text[:1].upper() + text[1:]
+            capital = False
+        parts.append(text)
+    return "".join(parts)
+
+
+_default_trie = None
+
+
+def default_trie():
+    """
+    braille.json dan qurilgan daraxt (bir marta quriladi).
+    """
+    global _default_trie
+    if _default_trie is None:
+        _default_trie = BrailleTrie.from_json()
+    return _default_trie
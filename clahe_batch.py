@@ -0,0 +1,169 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+from PIL import Image
+
+from clahe_core import CLAHE_MODES, apply_clahe
+from image_io import create_output, open_image
+
+# Streamlit yuklovchisi qabul qiladigan formatlar va memmap qilinadigan formatlar
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif", ".pgm", ".ppm", ".npy")
+# Natijani oldindan ajratilgan memmap ga to'g'ridan-to'g'ri yozish mumkin bo'lgan formatlar
+MEMMAP_OUTPUTS = (".pgm", ".ppm", ".npy")
+
+
+def find_images(inputs):
+    """
+    Kataloglar va glob shablonlaridan tasvir fayllari ro'yxatini tuzadi.
+
+    Args:
+        inputs (list[str]): Kataloglar, fayllar yoki glob shablonlari (masalan, "scans/*.png").
+
+    Returns:
+        list[str]: Saralangan, takrorlanmaydigan tasvir yo'llari.
+    """
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = [os.path.join(item, name) for name in os.listdir(item)]
+        else:
+            candidates = glob.glob(item, recursive=True)
+        paths.extend(p for p in candidates if os.path.isfile(p) and p.lower().endswith(IMAGE_EXTENSIONS))
+    return sorted(set(paths))
+
+
+def output_paths(paths, output_dir):
+    """
+    Har bir kiruvchi tasvir uchun `output_dir` dagi bir xil nomli natija yo'lini tuzadi.
+
+    Raises:
+        ValueError: Natija kiruvchi faylning ustiga yozilsa yoki turli kataloglardagi bir xil
+            nomli tasvirlar bitta natija fayliga tushsa.
+    """
+    outputs = [os.path.join(output_dir, os.path.basename(path)) for path in paths]
+    if any(os.path.abspath(src) == os.path.abspath(dst) for src, dst in zip(paths, outputs)):
+        raise ValueError("Chiquvchi katalog kiruvchi tasvirlar katalogi bilan bir xil bo'lmasligi kerak.")
+    sources = {}
+    for src, dst in zip(paths, outputs):
+        other = sources.setdefault(os.path.normcase(os.path.abspath(dst)), src)
+        if os.path.abspath(other) != os.path.abspath(src):
+            raise ValueError(f"Bir xil nomli tasvirlar bitta natija fayliga yoziladi: {other} va {src} -> {dst}")
+    return outputs
+
+
+def _init_worker(cv_threads):
+    # Har bir jarayon o'zining OpenCV oqimlarini cheklaydi, aks holda
+    # jarayonlar soni x OpenCV oqimlari yadrolar sonidan oshib ketadi
+    cv2.setNumThreads(cv_threads)
+
+
+def _process_one(task):
+    path, output_path, clip_limit, tile_grid_size, mode = task
+    try:
+        # PGM/PPM/TIFF/.npy fayllar memmap orqali ochiladi, kulrang manbalar RGB ga o'tkazilmaydi
+        img_array = open_image(path)
+        out_shape = img_array.shape[:2] if mode == "gray" else img_array.shape
+        ext = os.path.splitext(output_path)[1].lower()
+        if ext in MEMMAP_OUTPUTS and (ext != ".pgm" or len(out_shape) == 2) and (ext != ".ppm" or len(out_shape) == 3):
+            out = create_output(output_path, out_shape)
+            apply_clahe(img_array, clip_limit, tile_grid_size, mode, dst=out)
+            out.flush()
+            del out
+        else:
+            Image.fromarray(apply_clahe(img_array, clip_limit, tile_grid_size, mode)).save(output_path)
+    except Exception as e:
+        return path, None, str(e)
+    return path, output_path, None
+
+
+def iter_batch(paths, output_dir, clip_limit=2.0, tile_grid_size=8, workers=None, cv_threads=1, chunksize=4, mode="ycrcb"):
+    """
+    Tasvirlarga jarayonlar hovuzi (process pool) yordamida CLAHE qo'llaydi va
+    natijalarni tayyor bo'lishi bilan qaytaradi.
+
+    Args:
+        paths (list[str]): Kiruvchi tasvirlar yo'llari.
+        output_dir (str): Natijalar yoziladigan katalog (fayl nomlari saqlanadi).
+        clip_limit (float): Kontrastni cheklovchi chegarasi.
+        tile_grid_size (int): Panjara hajmi.
+        workers (int): Jarayonlar soni. None bo'lsa, yadrolar soniga teng.
+        cv_threads (int): Har bir jarayondagi OpenCV oqimlari soni (0 - OpenCV ichki parallelligini o'chiradi).
+        chunksize (int): Har bir jarayonga bir martada yuboriladigan tasvirlar soni.
+        mode (str): `apply_clahe` rejimi ("ycrcb", "luma" yoki "gray").
+
+    Yields:
+        tuple: (kiruvchi yo'l, chiquvchi yo'l yoki None, xato matni yoki None).
+    """
+    tasks = [(path, output_path, clip_limit, tile_grid_size, mode) for path, output_path in zip(paths, output_paths(paths, output_dir))]
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cv_threads,)) as pool:
+        yield from pool.map(_process_one, tasks, chunksize=chunksize)
+
+
+def run_batch(paths, output_dir, clip_limit=2.0, tile_grid_size=8, workers=None, cv_threads=1, chunksize=4, mode="ycrcb", log_every=100):
+    """
+    `iter_batch` ni oxirigacha bajaradi va umumiy statistikani qaytaradi.
+
+    Returns:
+        dict: Qayta ishlangan va xato bergan tasvirlar soni, sarflangan vaqt va tezlik (tasvir/soniya).
+    """
+    started = time.perf_counter()
+    done = 0
+    failed = []
+    for path, _, error in iter_batch(paths, output_dir, clip_limit, tile_grid_size, workers, cv_threads, chunksize, mode):
+        if error is not None:
+            failed.append((path, error))
+            print(f"Xato: {path}: {error}", file=sys.stderr)
+        else:
+            done += 1
+        if log_every and (done + len(failed)) % log_every == 0:
+            elapsed = time.perf_counter() - started
+            print(f"{done + len(failed)}/{len(paths)} tasvir, {done / elapsed:.1f} tasvir/s")
+
+    elapsed = time.perf_counter() - started
+    return {
+        "images": done,
+        "failed": failed,
+        "seconds": elapsed,
+        "images_per_sec": done / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Katalogdagi tasvirlarga CLAHE ni paket rejimida qo'llash.")
+    parser.add_argument("inputs", nargs="+", help="Kataloglar, fayllar yoki glob shablonlari")
+    parser.add_argument("-o", "--output-dir", required=True, help="Natijalar yoziladigan katalog")
+    parser.add_argument("--clip-limit", type=float, default=2.0, help="Kontrast chegarasi (standart: 2.0)")
+    parser.add_argument("--tile-grid-size", type=int, default=8, help="Panjara hajmi (standart: 8)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Jarayonlar soni (standart: yadrolar soni)")
+    parser.add_argument("--cv-threads", type=int, default=1, help="Har bir jarayondagi OpenCV oqimlari soni (standart: 1)")
+    parser.add_argument("--mode", choices=CLAHE_MODES, default="ycrcb",
+                        help="Rangli tasvirlar uchun rejim: ycrcb (standart), luma (faqat Y tekisligi orqali) yoki gray (kulrang natija)")
+    parser.add_argument("--chunksize", type=int, default=4, help="Jarayonga bir martada beriladigan tasvirlar soni")
+    args = parser.parse_args(argv)
+
+    paths = find_images(args.inputs)
+    if not paths:
+        print("Hech qanday tasvir topilmadi.", file=sys.stderr)
+        return 1
+
+    try:
+        report = run_batch(paths, args.output_dir, args.clip_limit, args.tile_grid_size,
+                           args.workers, args.cv_threads, args.chunksize, args.mode)
+    except ValueError as e:
+        print(f"Xato: {e}", file=sys.stderr)
+        return 1
+    print(f"Tayyor: {report['images']} ta tasvir, {len(report['failed'])} ta xato, "
+          f"{report['seconds']:.2f} s, {report['images_per_sec']:.1f} tasvir/s")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
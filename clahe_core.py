@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class ClaheCache:
+    """
+    CLAHE ob'ektlarini (clip_limit, tile_grid_size) kaliti bo'yicha saqlovchi LRU kesh.
+
+    cv2.CLAHE ob'ekti ichki buferlarga ega, shuning uchun bitta ob'ektdan bir vaqtda
+    bir nechta oqim foydalanmasligi kerak: `apply` har bir yozuvni o'z qulfi bilan himoyalaydi.
+    Streamlit sessiyalari (oqimlar) va paket rejimidagi har bir jarayon shu keshdan foydalanadi.
+    """
+    def __init__(self, max_size=16):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # kalit -> (clahe, qulf)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.construction_time = 0.0  # cv2.createCLAHE ga sarflangan umumiy vaqt (soniya)
+
+    @staticmethod
+    def make_key(clip_limit, tile_grid_size):
+        if isinstance(tile_grid_size, int):
+            tile_grid_size = (tile_grid_size, tile_grid_size)
+        return float(clip_limit), (int(tile_grid_size[0]), int(tile_grid_size[1]))
+
+    def _get_entry(self, clip_limit, tile_grid_size):
+        key = self.make_key(clip_limit, tile_grid_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        started = time.perf_counter()
+        clahe = cv2.createCLAHE(clipLimit=key[0], tileGridSize=key[1])
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.construction_time += elapsed
+            # Boshqa oqim shu orada yaratib qo'ygan bo'lsa, o'shanisini ishlatamiz
+            entry = self._entries.setdefault(key, (clahe, threading.Lock()))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def get(self, clip_limit, tile_grid_size):
+        """
+        Keshdagi CLAHE ob'ektini qaytaradi (yo'q bo'lsa yaratadi).
+        Qaytarilgan ob'ektni bir nechta oqimdan ishlatish uchun `apply` dan foydalaning.
+        """
+        return self._get_entry(clip_limit, tile_grid_size)[0]
+
+    def apply(self, channel, clip_limit, tile_grid_size, dst=None):
+        """
+        Bir kanalli tasvirga keshdagi CLAHE ob'ektini qo'llaydi.
+
+        Args:
+            channel (numpy.ndarray): Bir kanalli (uint8) tasvir.
+            clip_limit (float): Kontrastni cheklovchi chegarasi.
+            tile_grid_size (int yoki tuple): Panjara hajmi.
+            dst (numpy.ndarray): Natija yoziladigan oldindan ajratilgan massiv (ixtiyoriy).
+
+        Returns:
+            numpy.ndarray: CLAHE qo'llanilgan kanal.
+        """
+        clahe, lock = self._get_entry(clip_limit, tile_grid_size)
+        with lock:
+            return clahe.apply(channel, dst=dst)
+
+    def stats(self):
+        """
+        Kesh hisoblagichlarini lug'at ko'rinishida qaytaradi.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+                "construction_time": self.construction_time,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+            self.construction_time = 0.0
+
+
+# Butun jarayon uchun umumiy kesh (Streamlit qayta ishga tushishlarida ham saqlanib qoladi)
+clahe_cache = ClaheCache()
+
+
+CLAHE_MODES = ("ycrcb", "luma", "gray")
+
+
+def apply_clahe(image, clip_limit, tile_grid_size, mode="ycrcb", dst=None):
+    """
+    Berilgan tasvirga CLAHE (Contrast Limited Adaptive Histogram Equalization) algoritmini qo'llaydi.
+    Args:
+        image (numpy.ndarray): Qayta ishlanadigan tasvir.
+        clip_limit (float): Kontrastni cheklovchi chegarasi.
+        tile_grid_size (int): Tasvirni bo'linadigan panjara hajmi (en va bo'yi uchun).
+        mode (str): Rangli tasvirlar uchun ishlash usuli:
+            - "ycrcb": butun tasvirni YCrCb ga o'tkazib, Y kanaliga CLAHE qo'llash va RGB ga qaytarish.
+            - "luma": faqat yorqinlik (Y) tekisligini hisoblab, CLAHE bergan o'zgarishni
+              (Y' - Y) RGB kanallariga bir o'tishda qo'shish (`add_luma_delta`). Cr va Cb
+              o'zgarmagani uchun natija "ycrcb" dan faqat yaxlitlashda farq qiladi (bir necha
+              birlik); ikkita to'liq rang o'zgartirish va YCrCb nusxasi kerak bo'lmaydi.
+            - "gray": kulrang (bir kanalli) natija qaytarish. Keyin binarizatsiya qilinadigan
+              Brayl tasvirlari uchun eng tez yo'l.
+        dst (numpy.ndarray): Natija yoziladigan oldindan ajratilgan (masalan, np.memmap) massiv (ixtiyoriy).
+
+    Returns:
+        numpy.ndarray: CLAHE qo'llanilgan tasvir.
+    """
+    if mode not in CLAHE_MODES:
+        raise ValueError(f"Noma'lum CLAHE rejimi: {mode}. Mumkin bo'lganlar: {', '.join(CLAHE_MODES)}")
+
+    if len(image.shape) == 2: # Agar tasvir kulrang bo'lsa
+        # Keshdagi CLAHE ob'ektini qo'llash (har safar yangisini yaratmasdan)
+        return clahe_cache.apply(image, clip_limit, tile_grid_size, dst=dst)
+
+    if mode == "ycrcb":
+        # Rangli tasvirlar uchun YCbCr rang maydoniga o'tkazish
+        ycbcr_image = cv2.cvtColor(image, cv2.COLOR_RGB2YCrCb)
+        # Y kanaliga CLAHE qo'llash va qayta birlashtirish
+        ycbcr_image[:,:,0] = clahe_cache.apply(ycbcr_image[:,:,0], clip_limit, tile_grid_size)
+        # Qayta ishlangan tasvirni RGB ga qaytarish
+        return cv2.cvtColor(ycbcr_image, cv2.COLOR_YCrCb2RGB, dst=dst)
+
+    # Y tekisligi (RGB2GRAY YCrCb dagi Y bilan bir xil koeffitsiyentlardan foydalanadi)
+    y_channel = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    if mode == "gray":
+        return clahe_cache.apply(y_channel, clip_limit, tile_grid_size, dst=dst)
+    clahe_applied_y_channel = clahe_cache.apply(y_channel, clip_limit, tile_grid_size)
+    return add_luma_delta(image, y_channel, clahe_applied_y_channel, dst=dst)
+
+
+# add_luma_delta bir martada qayta ishlaydigan qatorlar soni (vaqtinchalik 3 kanalli int16 bo'lagi uchun)
+LUMA_CHUNK_ROWS = 32
+
+
+def add_luma_delta(image, y_channel, clahe_applied_y_channel, dst=None):
+    """
+    YCrCb -> RGB o'zgartirishda Y ning o'zgarishi R, G, B ga bir xil qo'shiladi: o'zgarish
+    (Y' - Y) bitta ishorali int16 tekislik sifatida hisoblanadi va RGB ga to'yinuvchi
+    qo'shish bilan bir o'tishda, qatorlar bo'lagi bo'yicha to'g'ridan-to'g'ri natijaga yoziladi.
+    To'liq o'lchamdagi vaqtinchalik massivlar faqat int16 tekislik va natijaning o'zi.
+
+    Args:
+        image (numpy.ndarray): RGB tasvir (uint8).
+        y_channel (numpy.ndarray): Tasvirning Y tekisligi.
+        clahe_applied_y_channel (numpy.ndarray): CLAHE qo'llanilgan Y tekisligi.
+        dst (numpy.ndarray): Natija yoziladigan oldindan ajratilgan massiv (ixtiyoriy).
+
+    Returns:
+        numpy.ndarray: Yorqinligi o'zgartirilgan RGB tasvir.
+    """
+    delta = cv2.subtract(clahe_applied_y_channel, y_channel, dtype=cv2.CV_16S)
+    out = np.empty_like(image) if dst is None else dst
+    for r0 in range(0, image.shape[0], LUMA_CHUNK_ROWS):
+        r1 = r0 + LUMA_CHUNK_ROWS
+        cv2.add(image[r0:r1], cv2.merge([delta[r0:r1]] * 3), dst=out[r0:r1], dtype=cv2.CV_8U)
+    return out
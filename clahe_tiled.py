@@ -0,0 +1,254 @@
+import argparse
+import os
+import sys
+
+import cv2
+import numpy as np
+
+from clahe_core import CLAHE_MODES, add_luma_delta, apply_clahe
+from image_io import create_output, open_image
+
+HIST_SIZE = 256
+
+
+def _grid(tile_grid_size):
+    if isinstance(tile_grid_size, int):
+        return tile_grid_size, tile_grid_size
+    return int(tile_grid_size[0]), int(tile_grid_size[1])
+
+
+def _luma(strip, mode="luma"):
+    # Rangli bo'lak uchun Y tekisligi. RGB2GRAY va YCrCb dagi Y koeffitsiyentlari bir xil,
+    # lekin yaxlitlash ba'zi piksellarda bir birlikka farq qiladi, shuning uchun "ycrcb"
+    # rejimida gistogrammalar apply_clahe dagi kabi aynan YCrCb ning Y kanalidan olinadi
+    if strip.ndim == 2:
+        return strip
+    if mode == "ycrcb":
+        return cv2.cvtColor(strip, cv2.COLOR_RGB2YCrCb)[:, :, 0]
+    return cv2.cvtColor(strip, cv2.COLOR_RGB2GRAY)
+
+
+def _strip_rows(width, channels, memory_budget):
+    # Bitta qator uchun taxminiy xotira: kirish + Y + Y' + chiqish + YCrCb nusxasi
+    # + interpolatsiyadagi float32 vaqtinchalik massivlar
+    per_row = width * (3 * channels + 2 + 16)
+    return max(1, int(memory_budget // per_row))
+
+
+def _tile_histograms(source, tiles_x, tiles_y, tile_w, tile_h, pad_bottom, pad_right, strip_rows, mode):
+    """
+    1-o'tish: tasvirni qatorma-qator (bo'laklab) o'qib, har bir katak (tile) uchun
+    256 binli gistogrammani yig'adi. Chegaralarni to'ldirish OpenCV dagi kabi
+    BORDER_REFLECT_101 bo'yicha bajariladi.
+    """
+    height = source.shape[0]
+    hist = np.zeros((tiles_y, tiles_x, HIST_SIZE), np.int64)
+
+    def accumulate(y_strip, first_row):
+        if pad_right:
+            y_strip = cv2.copyMakeBorder(y_strip, 0, 0, 0, pad_right, cv2.BORDER_REFLECT_101)
+        rows = y_strip.shape[0]
+        r = 0
+        while r < rows:
+            ty = (first_row + r) // tile_h
+            r_end = min(rows, (ty + 1) * tile_h - first_row)
+            band = y_strip[r:r_end]
+            for tx in range(tiles_x):
+                block = band[:, tx * tile_w:(tx + 1) * tile_w]
+                hist[ty, tx] += cv2.calcHist([block], [0], None, [HIST_SIZE], [0, HIST_SIZE]).ravel().astype(np.int64)
+            r = r_end
+
+    for r0 in range(0, height, strip_rows):
+        r1 = min(height, r0 + strip_rows)
+        accumulate(np.ascontiguousarray(_luma(np.asarray(source[r0:r1]), mode)), r0)
+
+    if pad_bottom:
+        # Pastki to'ldirish qatorlari: H, H+1, ... -> H-2, H-3, ... (REFLECT_101). To'ldirish
+        # tasvir balandligidan katta yoki teng bo'lishi mumkin (masalan, 8 qatorli tasvir va
+        # 8 katakli panjara), shuning uchun indekslar OpenCV ning o'z qoidasi bilan hisoblanadi
+        rows = [cv2.borderInterpolate(y, height, cv2.BORDER_REFLECT_101) for y in range(height, height + pad_bottom)]
+        accumulate(np.ascontiguousarray(_luma(np.asarray(source[rows]), mode)), height)
+    return hist
+
+
+def _tile_luts(hist, clip_limit, tile_area):
+    """
+    Gistogrammalardan har bir katak uchun LUT hisoblaydi (cv2.createCLAHE bilan bir xil qoidalar).
+    """
+    tiles_y, tiles_x = hist.shape[:2]
+    hist = hist.reshape(-1, HIST_SIZE).copy()
+
+    if clip_limit > 0.0:
+        limit = max(int(clip_limit * tile_area / HIST_SIZE), 1)
+        clipped = np.maximum(hist - limit, 0).sum(axis=1)
+        np.minimum(hist, limit, out=hist)
+        hist += (clipped // HIST_SIZE)[:, None]
+        residual = clipped % HIST_SIZE
+        for t in np.flatnonzero(residual):
+            step = max(HIST_SIZE // int(residual[t]), 1)
+            hist[t, np.arange(0, HIST_SIZE, step)[:residual[t]]] += 1
+
+    lut_scale = np.float32(HIST_SIZE - 1) / np.float32(tile_area)
+    lut = np.rint(np.cumsum(hist, axis=1).astype(np.float32) * lut_scale)
+    return np.clip(lut, 0, 255).astype(np.uint8).reshape(tiles_y, tiles_x, HIST_SIZE)
+
+
+def _interpolation_weights(length, tiles, tile_size):
+    # OpenCV dagi kabi float32 da: t = i / tile_size - 0.5, ikki qo'shni katak va og'irlik
+    tf = np.arange(length, dtype=np.float32) * (np.float32(1.0) / np.float32(tile_size)) - np.float32(0.5)
+    t1 = np.floor(tf).astype(np.int64)
+    weight = (tf - t1).astype(np.float32)
+    return np.maximum(t1, 0), np.minimum(t1 + 1, tiles - 1), weight
+
+
+def _interpolate_strip(y_strip, first_row, lut, rows_w, cols_w, dst):
+    """
+    2-o'tish: bitta bo'lak qatorlari uchun to'rtta qo'shni katak LUT larini
+    bilineer aralashtiradi. Bir xil (ty1, ty2) va (tx1, tx2) ga ega piksellar
+    bloklarga guruhlanib, cv2.LUT bilan qayta ishlanadi.
+    """
+    ty1_all, ty2_all, ya_all = rows_w
+    tx1_all, tx2_all, xa_all = cols_w
+    rows, width = y_strip.shape
+
+    # Ustunlarni bir xil (tx1, tx2) juftligiga ega bo'laklarga ajratish
+    col_breaks = np.flatnonzero(np.diff(tx1_all * 65536 + tx2_all)) + 1
+    col_bounds = list(zip(np.r_[0, col_breaks], np.r_[col_breaks, width]))
+
+    r = 0
+    while r < rows:
+        y = first_row + r
+        r_end = r + 1
+        while (r_end < rows and ty1_all[first_row + r_end] == ty1_all[y]
+               and ty2_all[first_row + r_end] == ty2_all[y]):
+            r_end += 1
+        ty1, ty2 = ty1_all[y], ty2_all[y]
+        ya = ya_all[first_row + r:first_row + r_end, None]
+        ya1 = np.float32(1.0) - ya
+        band = y_strip[r:r_end]
+        for c0, c1 in col_bounds:
+            tx1, tx2 = tx1_all[c0], tx2_all[c0]
+            block = band[:, c0:c1]
+            xa = xa_all[None, c0:c1]
+            xa1 = np.float32(1.0) - xa
+            top = cv2.LUT(block, lut[ty1, tx1]).astype(np.float32) * xa1 + cv2.LUT(block, lut[ty1, tx2]).astype(np.float32) * xa
+            bottom = cv2.LUT(block, lut[ty2, tx1]).astype(np.float32) * xa1 + cv2.LUT(block, lut[ty2, tx2]).astype(np.float32) * xa
+            res = top * ya1 + bottom * ya
+            dst[r:r_end, c0:c1] = np.clip(np.rint(res), 0, 255)
+        r = r_end
+    return dst
+
+
+def clahe_tiled(source, clip_limit, tile_grid_size, out=None, mode="ycrcb", memory_budget=256 * 1024 * 1024):
+    """
+    Juda katta tasvirlarga CLAHE ni bo'laklab (qator polosalari bo'yicha) qo'llaydi.
+
+    Ikki o'tishda ishlaydi: avval butun tasvir bo'ylab har bir katak gistogrammasi
+    yig'iladi, so'ng har bir polosa shu LUT lar yordamida interpolatsiya qilinib,
+    darhol `out` ga yoziladi. Natija butun tasvirga `apply_clahe` qo'llangandagi
+    bilan mos keladi, lekin bir vaqtda xotirada faqat bitta polosa turadi.
+
+    Args:
+        source (numpy.ndarray yoki numpy.memmap): (H, W) yoki (H, W, 3) uint8 tasvir;
+            qator kesimlarini (source[r0:r1]) qo'llab-quvvatlasa yetarli.
+        clip_limit (float): Kontrastni cheklovchi chegarasi.
+        tile_grid_size (int yoki tuple): Panjara hajmi.
+        out (numpy.ndarray yoki numpy.memmap): Natija yoziladigan massiv. None bo'lsa, yangisi ajratiladi.
+        mode (str): `apply_clahe` dagi kabi "ycrcb", "luma" yoki "gray".
+        memory_budget (int): Bitta polosa uchun ruxsat etilgan taxminiy xotira (bayt).
+
+    Returns:
+        numpy.ndarray: `out` massivi.
+    """
+    if mode not in CLAHE_MODES:
+        raise ValueError(f"Noma'lum CLAHE rejimi: {mode}. Mumkin bo'lganlar: {', '.join(CLAHE_MODES)}")
+
+    height, width = source.shape[:2]
+    channels = source.shape[2] if len(source.shape) == 3 else 1
+    out_shape = (height, width) if channels == 1 or mode == "gray" else (height, width, channels)
+    if out is None:
+        out = np.empty(out_shape, np.uint8)
+    elif tuple(out.shape) != out_shape:
+        raise ValueError(f"Chiquvchi massiv o'lchami {tuple(out.shape)}, kutilgan: {out_shape}")
+
+    tiles_x, tiles_y = _grid(tile_grid_size)
+    if height < 2 or width < 2 or height < tiles_y or width < tiles_x:
+        # Juda kichik tasvirlar uchun oddiy yo'l
+        out[...] = apply_clahe(np.asarray(source), clip_limit, (tiles_x, tiles_y), mode)
+        return out
+
+    # OpenCV tasvirni katak soniga bo'linadigan qilib to'ldiradi (ikkala o'lchamda ham)
+    if width % tiles_x == 0 and height % tiles_y == 0:
+        pad_right = pad_bottom = 0
+    else:
+        pad_right = tiles_x - width % tiles_x
+        pad_bottom = tiles_y - height % tiles_y
+    tile_w = (width + pad_right) // tiles_x
+    tile_h = (height + pad_bottom) // tiles_y
+
+    strip_rows = _strip_rows(width, channels, memory_budget)
+    hist = _tile_histograms(source, tiles_x, tiles_y, tile_w, tile_h, pad_bottom, pad_right, strip_rows, mode)
+    lut = _tile_luts(hist, clip_limit, tile_w * tile_h)
+
+    rows_w = _interpolation_weights(height, tiles_y, tile_h)
+    cols_w = _interpolation_weights(width, tiles_x, tile_w)
+
+    for r0 in range(0, height, strip_rows):
+        r1 = min(height, r0 + strip_rows)
+        strip = np.asarray(source[r0:r1])
+        if channels == 1:
+            out[r0:r1] = _interpolate_strip(strip, r0, lut, rows_w, cols_w, np.empty(strip.shape, np.uint8))
+        elif mode == "ycrcb":
+            ycrcb = cv2.cvtColor(strip, cv2.COLOR_RGB2YCrCb)
+            y_eq = _interpolate_strip(np.ascontiguousarray(ycrcb[:, :, 0]), r0, lut, rows_w, cols_w,
+                                      np.empty(strip.shape[:2], np.uint8))
+            ycrcb[:, :, 0] = y_eq
+            out[r0:r1] = cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2RGB)
+        else:
+            y_channel = _luma(strip)
+            y_eq = _interpolate_strip(y_channel, r0, lut, rows_w, cols_w, np.empty(strip.shape[:2], np.uint8))
+            if mode == "gray":
+                out[r0:r1] = y_eq
+            else:
+                add_luma_delta(strip, y_channel, y_eq, dst=out[r0:r1])
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+
+def clahe_tiled_file(input_path, output_path, clip_limit=2.0, tile_grid_size=8, mode="ycrcb", memory_budget=256 * 1024 * 1024, raw_shape=None):
+    """
+    Faylni xotiraga to'liq yuklamasdan (PGM/PPM, raw, .npy, siqilmagan TIFF - np.memmap orqali)
+    qayta ishlab, natijani .pgm/.ppm/.raw/.npy faylga polosama-polosa yozadi.
+    """
+    source = open_image(input_path, raw_shape=raw_shape)
+    if source.dtype != np.uint8:
+        raise ValueError(f"Faqat uint8 tasvirlar qo'llab-quvvatlanadi, berilgan: {source.dtype}")
+    shape = source.shape[:2] if mode == "gray" else source.shape
+    out = create_output(output_path, shape)
+    clahe_tiled(source, clip_limit, tile_grid_size, out, mode, memory_budget)
+    del out
+    return output_path
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Katta tasvirlarga CLAHE ni cheklangan xotira bilan bo'laklab qo'llash.")
+    parser.add_argument("input", help="Kiruvchi fayl (.pgm, .ppm, .raw, .npy, siqilmagan .tif yoki PIL o'qiydigan boshqa format)")
+    parser.add_argument("output", help="Chiquvchi fayl (.pgm, .ppm, .raw yoki .npy)")
+    parser.add_argument("--raw-shape", type=int, nargs="+", help="Raw fayl shakli: H W [C]")
+    parser.add_argument("--clip-limit", type=float, default=2.0)
+    parser.add_argument("--tile-grid-size", type=int, default=8)
+    parser.add_argument("--mode", choices=CLAHE_MODES, default="ycrcb")
+    parser.add_argument("--memory-mb", type=int, default=256, help="Bitta polosa uchun xotira byudjeti (MB)")
+    args = parser.parse_args(argv)
+
+    if os.path.abspath(args.input) == os.path.abspath(args.output):
+        print("Kiruvchi va chiquvchi fayllar bir xil bo'lmasligi kerak.", file=sys.stderr)
+        return 1
+    clahe_tiled_file(args.input, args.output, args.clip_limit, args.tile_grid_size, args.mode, args.memory_mb * 1024 * 1024, args.raw_shape)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,148 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from clahe_core import apply_clahe
+
+# main.py slayderlari chegaralari
+CLIP_LIMIT_RANGE = (0.01, 10.0)
+TILE_GRID_RANGE = (2, 32)
+PROXY_SIZE = 512
+COARSE_CLIP_LIMITS = 9
+COARSE_TILE_GRIDS = (2, 4, 8, 16, 32)
+# Shovqin MSE chegarasi: mainss.csv da 15 dan yuqori - "Yuqori" shovqin, qayta filtrlash kerak
+MAX_NOISE_MSE = 15.0
+
+
+def make_proxy(image, proxy_size=PROXY_SIZE):
+    """
+    Yorqinlik (Y) tekisligining eng katta tomoni `proxy_size` bo'lgan kichraytirilgan nusxasi.
+    cv2.CLAHE da panjara hajmi - bo'laklar soni, clip limit esa bo'lak gistogrammasiga
+    nisbiy, shuning uchun proksida topilgan parametrlar to'liq o'lchamga o'tkaziladi.
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+    scale = proxy_size / max(gray.shape[:2])
+    if scale >= 1:
+        return np.ascontiguousarray(gray)
+    size = (max(1, round(gray.shape[1] * scale)), max(1, round(gray.shape[0] * scale)))
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+
+def entropy(gray):
+    """
+    Kulrang tasvir gistogrammasining Shannon entropiyasi (bit, 0..8).
+    """
+    hist = cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel()
+    p = hist[hist > 0] / hist.sum()
+    return float(-(p * np.log2(p)).sum())
+
+
+# Immerkær niqobi: silliq sohalarni yo'qotib, shovqinni qoldiradi (Gauss shovqinida
+# natijaning standart og'ishi 6 * sigma)
+_NOISE_KERNEL = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], np.float32)
+
+
+def noise_mse(gray):
+    """
+    Shovqin dispersiyasi bahosi (sigma**2, mainss.csv dagi MSE ustuni shkalasida).
+    Immerkær niqobi javobining medianasi bo'yicha hisoblanadi, shuning uchun nuqtalar va
+    harflar chegaralari (siyrak kuchli javoblar) bahoga deyarli ta'sir qilmaydi.
+    """
+    response = np.abs(cv2.filter2D(gray, cv2.CV_32F, _NOISE_KERNEL))
+    sigma = 1.4826 * float(np.median(response)) / 6
+    return sigma * sigma
+
+
+def score_candidate(proxy, clip_limit, tile_grid_size, base_noise, noise_weight=1.0):
+    """
+    Bitta (clip_limit, tile_grid_size) nomzodini proksida baholaydi.
+
+    Ball = entropiya - noise_weight * log2(shovqin o'sishi): kontrast/axborot qancha ko'p va
+    shovqin qancha kam kuchaytirilgan bo'lsa, shuncha yaxshi.
+
+    Returns:
+        dict: clip_limit, tile_grid_size, score, entropy, noise_mse, variance.
+    """
+    # Har bir nomzod uchun alohida ob'ekt: umumiy `clahe_cache` qidiruv kalitlari bilan
+    # to'lib, ilovaning ishlatilayotgan ob'ektlari chiqarib yuborilmasligi uchun
+    clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(tile_grid_size, tile_grid_size))
+    result = clahe.apply(proxy)
+    candidate_entropy = entropy(result)
+    candidate_noise = noise_mse(result)
+    # 0.25 - chorak kulrang daraja: shovqinsiz tekis tasvirlarda nisbat portlab ketmasligi uchun
+    gain = (candidate_noise + 0.25) / (base_noise + 0.25)
+    _, std = cv2.meanStdDev(result)
+    return {
+        "clip_limit": float(clip_limit),
+        "tile_grid_size": int(tile_grid_size),
+        "score": candidate_entropy - noise_weight * float(np.log2(gain)),
+        "entropy": candidate_entropy,
+        "noise_mse": candidate_noise,
+        "variance": float(std[0, 0]) ** 2,
+    }
+
+
+def _best(results):
+    # Shovqini "Yuqori" darajaga chiqmagan nomzodlar ichidan eng yuqori ball
+    allowed = [r for r in results if r["noise_mse"] < MAX_NOISE_MSE] or results
+    return max(allowed, key=lambda r: (r["score"], -r["clip_limit"]))
+
+
+def auto_tune(image, proxy_size=PROXY_SIZE, noise_weight=1.0, workers=None):
+    """
+    CLAHE parametrlarini avtomatik tanlaydi: avval proksida dag'al panjara (clip limit
+    logarifmik shkalada x panjara hajmlari), so'ng eng yaxshi nomzod atrofida nozik qidiruv.
+    Nomzodlar oqimlar hovuzida parallel baholanadi (cv2.CLAHE GIL ni bo'shatadi).
+    Natija parametrlari main.py slayderlari qadamiga (0.01 va 1) yaxlitlangan.
+
+    Args:
+        image (numpy.ndarray): Kulrang yoki RGB tasvir.
+        proxy_size (int): Proksining eng katta tomoni (piksel).
+        noise_weight (float): Shovqin jarimasining og'irligi.
+        workers (int): Oqimlar soni. None bo'lsa, yadrolar soniga teng.
+
+    Returns:
+        dict: Eng yaxshi nomzod (`score_candidate` ko'rinishida) va "candidates" - barcha
+            baholangan nomzodlar ro'yxati.
+    """
+    proxy = make_proxy(image, proxy_size)
+    base_noise = noise_mse(proxy)
+    low, high = CLIP_LIMIT_RANGE
+    min_tiles, max_tiles = TILE_GRID_RANGE
+    seen = {}
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        def evaluate(candidates):
+            candidates = [c for c in dict.fromkeys(candidates) if c not in seen]
+            for key, result in zip(candidates, pool.map(
+                    lambda c: score_candidate(proxy, c[0], c[1], base_noise, noise_weight), candidates)):
+                seen[key] = result
+
+        clips = np.round(np.geomspace(low, high, COARSE_CLIP_LIMITS), 2)
+        evaluate([(float(c), t) for c in clips for t in COARSE_TILE_GRIDS])
+        best = _best(list(seen.values()))
+
+        # Nozik qidiruv: clip limit qo'shni dag'al qiymatlar orasida, panjara hajmi ±50%
+        step = (high / low) ** (1 / (COARSE_CLIP_LIMITS - 1))
+        fine_clips = np.round(best["clip_limit"] * step ** np.linspace(-0.5, 0.5, 5), 2)
+        fine_tiles = np.unique(np.clip(np.round(best["tile_grid_size"] * np.array([0.67, 0.8, 1, 1.25, 1.5])),
+                                       min_tiles, max_tiles).astype(int))
+        evaluate([(float(np.clip(c, low, high)), int(t)) for c in fine_clips for t in fine_tiles])
+
+    results = list(seen.values())
+    best = dict(_best(results))
+    best["candidates"] = sorted(results, key=lambda r: -r["score"])
+    return best
+
+
+def apply_auto_clahe(image, mode="ycrcb", **kwargs):
+    """
+    `auto_tune` topgan parametrlarni to'liq o'lchamdagi tasvirga bir marta qo'llaydi.
+
+    Returns:
+        tuple: (natija tasvir, `auto_tune` natijasi).
+    """
+    best = auto_tune(image, **kwargs)
+    return apply_clahe(image, best["clip_limit"], best["tile_grid_size"], mode), best
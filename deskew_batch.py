@@ -0,0 +1,148 @@
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from clahe_batch import find_images, output_paths
+from deskew_core import MIN_CONFIDENCE, deskew_image, roundtrip_mse
+from image_io import open_image
+
+# mainss.csv ustunlari; oxiriga ishonchlilik va vaqt qo'shiladi
+CSV_COLUMNS = ("Tasvir ID", "Rotatsiya Burchagi (°)", "MSE", "Variance", "Shovqin Darajasi",
+               "Qayta Filtrlash Zarurati", "Ishonchlilik", "Vaqt (ms)")
+# MSE chegaralari -> (shovqin darajasi, qayta filtrlash zarurati), mainss.csv dagi kabi
+NOISE_LEVELS = ((10.0, "Past", "Yo‘q"), (15.0, "O‘rtacha", "Ehtiyot chorasi"), (float("inf"), "Yuqori", "Ha"))
+
+
+def noise_level(mse):
+    for limit, level, refilter in NOISE_LEVELS:
+        if mse < limit:
+            return level, refilter
+
+
+def _write_image(path, image):
+    # cv2.imwrite GIL ni bo'shatadi; open_image RGB qaytaradi, OpenCV esa BGR yozadi
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+    if not cv2.imwrite(path, image):
+        raise ValueError(f"Natijani yozib bo'lmadi: {path}")
+
+
+def deskew_one(path, output_path=None, scale=1.0, method="profile", min_confidence=MIN_CONFIDENCE):
+    """
+    Bitta sahifani o'qib, og'ishini to'g'rilaydi (aylantirish va masshtab bitta `warpAffine`
+    da) va sifat ko'rsatkichlarini shu xotiradagi tasvirlardan hisoblaydi.
+
+    Returns:
+        dict: CSV_COLUMNS bo'yicha qator.
+    """
+    image = open_image(path)
+    started = time.perf_counter()
+    result, angle, confidence = deskew_image(image, scale=scale, method=method, min_confidence=min_confidence)
+    elapsed = time.perf_counter() - started
+    if output_path is not None:
+        _write_image(output_path, result)
+
+    mse = roundtrip_mse(image, result, angle, scale)
+    gray = cv2.cvtColor(result, cv2.COLOR_RGB2GRAY) if result.ndim == 3 else result
+    _, std = cv2.meanStdDev(gray)
+    level, refilter = noise_level(mse)
+    return {
+        "Tasvir ID": os.path.splitext(os.path.basename(path))[0],
+        "Rotatsiya Burchagi (°)": f"{angle:.2f}",
+        "MSE": f"{mse:.2f}",
+        "Variance": f"{float(std[0, 0]) ** 2:.2f}",
+        "Shovqin Darajasi": level,
+        "Qayta Filtrlash Zarurati": refilter,
+        "Ishonchlilik": "" if confidence is None else f"{confidence:.2f}",
+        "Vaqt (ms)": f"{elapsed * 1000:.1f}",
+    }
+
+
+def iter_batch(paths, output_dir=None, scale=1.0, method="profile", workers=None, min_confidence=MIN_CONFIDENCE):
+    """
+    Sahifalarni oqimlar hovuzida (thread pool) qayta ishlaydi: OpenCV amallari GIL ni
+    bo'shatadi, shuning uchun jarayonlar va tasvirlarni ular orasida nusxalash shart emas.
+    Natijalar kiruvchi tartibda qaytariladi.
+
+    Args:
+        paths (list[str]): Kiruvchi tasvirlar yo'llari.
+        output_dir (str): Rostlangan tasvirlar katalogi. None bo'lsa, faqat hisobot tuziladi.
+        scale (float): Aylantirish bilan birga qo'llanadigan masshtab.
+        method (str): "profile" yoki "hough".
+        workers (int): Oqimlar soni. None bo'lsa, yadrolar soniga teng.
+        min_confidence (float): Shundan past ishonchlilikda sahifa aylantirilmaydi.
+
+    Yields:
+        tuple: (kiruvchi yo'l, CSV qatori yoki None, xato matni yoki None).
+    """
+    outputs = [None] * len(paths)
+    if output_dir is not None:
+        outputs = output_paths(paths, output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    def task(path, output_path):
+        try:
+            return path, deskew_one(path, output_path, scale, method, min_confidence), None
+        except Exception as e:
+            return path, None, str(e)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(task, paths, outputs)
+
+
+def write_report(rows, csv_path):
+    """
+    Qatorlarni mainss.csv formatida (UTF-8, barcha qiymatlar qo'shtirnoqda) yozadi.
+    """
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Katalogdagi sahifalarning og'ishini parallel to'g'rilash.")
+    parser.add_argument("inputs", nargs="+", help="Kataloglar, fayllar yoki glob shablonlari")
+    parser.add_argument("-o", "--output-dir", default=None, help="Rostlangan tasvirlar katalogi (berilmasa, faqat hisobot)")
+    parser.add_argument("--csv", default="deskew_report.csv", help="Hisobot fayli (mainss.csv formatida)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Aylantirish bilan birga qo'llanadigan masshtab")
+    parser.add_argument("--method", choices=("profile", "hough"), default="profile")
+    parser.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Oqimlar soni (standart: yadrolar soni)")
+    parser.add_argument("--cv-threads", type=int, default=1,
+                        help="OpenCV ichki oqimlari soni (standart: 1, parallellik sahifalar bo'yicha)")
+    args = parser.parse_args(argv)
+
+    paths = find_images(args.inputs)
+    if not paths:
+        print("Hech qanday tasvir topilmadi.", file=sys.stderr)
+        return 1
+
+    cv2.setNumThreads(args.cv_threads)
+    started = time.perf_counter()
+    rows = []
+    failed = 0
+    try:
+        for path, row, error in iter_batch(paths, args.output_dir, args.scale, args.method, args.workers, args.min_confidence):
+            if error is not None:
+                failed += 1
+                print(f"Xato: {path}: {error}", file=sys.stderr)
+            else:
+                rows.append(row)
+    except ValueError as e:
+        print(f"Xato: {e}", file=sys.stderr)
+        return 1
+    write_report(rows, args.csv)
+    elapsed = time.perf_counter() - started
+    print(f"Tayyor: {len(rows)} ta sahifa, {failed} ta xato, {elapsed:.2f} s -> {args.csv}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
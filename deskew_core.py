@@ -0,0 +1,240 @@
+import cv2
+import numpy as np
+
+# Proyeksiya profili bo'yicha qidiruv parametrlari
+MAX_SKEW_ANGLE = 45.0
+COARSE_STEP = 0.25
+FINE_STEP = 0.04
+PROXY_SIZE = 512
+COARSE_POINTS = 8_000
+MAX_POINTS = 50_000
+# Shundan past ishonchlilikdagi burchak bo'yicha tasvirni aylantirmaslik tavsiya etiladi
+MIN_CONFIDENCE = 0.15
+
+
+def estimate_skew_angle(gray, edges=None):
+    """
+    Canny chegaralari va HoughLinesP segmentlari bo'yicha tasvirning og'ish burchagini baholaydi.
+
+    Segmentlar burchaklari ±45° oralig'iga buklanadi (vertikal segmentlar gorizontalga
+    teng kuchli) va o'rtacha emas, mediana olinadi, shuning uchun alohida chetga chiqqan
+    segmentlar natijani siljitmaydi.
+
+    Args:
+        gray (numpy.ndarray): Kulrang tasvir.
+        edges (numpy.ndarray): Canny natijasi uchun oldindan ajratilgan bufer (ixtiyoriy).
+
+    Returns:
+        tuple: (og'ish burchagi gradusda, Canny chegaralari tasviri).
+    """
+    # Canny edge detection
+    edges = cv2.Canny(gray, 50, 150, edges=edges)
+
+    # Hough transformatsiyasi
+    lines = cv2.HoughLinesP(edges, 1, np.pi/180, threshold=100, minLineLength=50, maxLineGap=10)
+    theta_avg = 0
+    if lines is not None and len(lines):
+        # OpenCV versiyasiga qarab natija (N, 1, 4) yoki (N, 4) shaklida bo'ladi
+        segments = lines.reshape(-1, 4).astype(np.float64)
+        thetas = np.arctan2(segments[:, 3] - segments[:, 1], segments[:, 2] - segments[:, 0]) * 180/np.pi
+        theta_avg = float(np.median((thetas + 45) % 90 - 45))
+    return theta_avg, edges
+
+
+def _foreground_points(gray, max_points):
+    # Otsu bo'yicha ozchilikdagi piksellar (nuqtalar, matn) koordinatalari, markazga nisbatan
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    if cv2.countNonZero(binary) > binary.size // 2:
+        cv2.bitwise_not(binary, dst=binary)
+    points = cv2.findNonZero(binary)
+    if points is None:
+        return np.empty((0, 2))
+    points = points.reshape(-1, 2)
+    if len(points) > max_points:
+        points = points[::int(np.ceil(len(points) / max_points))]
+    # Piksel panjarasining o'zi 0° da "satrlar" hosil qiladi: koordinatalarni piksel ichida
+    # tasodifiy siljitish bu soxta cho'qqini yo'qotadi (natija takrorlanuvchan bo'lishi uchun
+    # generator qat'iy boshlang'ich qiymat bilan)
+    jitter = np.random.default_rng(0).uniform(-0.5, 0.5, points.shape)
+    return points + jitter - np.array([gray.shape[1] / 2, gray.shape[0] / 2])
+
+
+def _profile_scores(points, angles):
+    # Har bir burchak uchun aylantirilgan y koordinatalari gistogrammasi (1 piksellik
+    # satrlar) kvadratlari yig'indisi: satrlar gorizontal bo'lganda profil eng "o'tkir"
+    radians = np.deg2rad(angles).astype(np.float32)[:, None]
+    x, y = points[:, 0].astype(np.float32), points[:, 1].astype(np.float32)
+    rows = np.rint(y * np.cos(radians) - x * np.sin(radians)).astype(np.intp)
+    rows -= rows.min()
+    bins = int(rows.max()) + 1
+    index = (rows + np.arange(len(angles))[:, None] * bins).ravel()
+    histogram = np.bincount(index, minlength=len(angles) * bins).reshape(len(angles), bins).astype(np.float64)
+    return (histogram ** 2).sum(axis=1)
+
+
+def _peak(angles, scores):
+    # Eng yuqori ball atrofida parabolik interpolyatsiya
+    i = int(scores.argmax())
+    if 0 < i < len(scores) - 1:
+        left, mid, right = scores[i - 1], scores[i], scores[i + 1]
+        denominator = left - 2 * mid + right
+        if denominator < 0:
+            return float(angles[i] + 0.5 * (left - right) / denominator * (angles[1] - angles[0]))
+    return float(angles[i])
+
+
+def estimate_skew(gray, max_angle=MAX_SKEW_ANGLE, coarse_step=COARSE_STEP, fine_step=FINE_STEP,
+                  proxy_size=PROXY_SIZE, coarse_points=COARSE_POINTS, max_points=MAX_POINTS):
+    """
+    Proyeksiya profili bo'yicha og'ish burchagini baholaydi (Canny va Hough siz).
+
+    Avval tasvir piramidasining eng katta tomoni `proxy_size` dan oshmaydigan darajasida
+    ±`max_angle` oralig'i `coarse_step` qadam bilan ko'rib chiqiladi; so'ng topilgan burchak
+    atrofi to'liq o'lchamdagi oldingi plan piksellari bo'yicha `fine_step` qadam bilan
+    aniqlashtiriladi. Har bir burchak uchun piksellar burilgan y koordinatasi bo'yicha
+    gistogrammaga yig'iladi; Brayl nuqtalari satrlari (yoki matn qatorlari) gorizontal
+    bo'lganda gistogramma eng o'tkir bo'ladi.
+
+    Ishonchlilik: dag'al qidiruvdagi eng yuqori ballning medianadan ustunligi (0..1).
+    Tuzilmasiz (bir tekis yoki bo'sh) tasvirda u 0 ga yaqin.
+
+    Args:
+        gray (numpy.ndarray): Kulrang tasvir.
+        max_angle (float): Qidiriladigan eng katta og'ish (gradus, 45 gacha).
+        coarse_step (float): Dag'al qidiruv qadami (gradus).
+        fine_step (float): Aniqlashtirish qadami (gradus).
+        proxy_size (int): Dag'al qidiruv darajasining eng katta tomoni (piksel).
+        coarse_points (int): Dag'al qidiruvda ishlatiladigan piksellar soni chegarasi.
+        max_points (int): Aniqlashtirishda ishlatiladigan piksellar soni chegarasi.
+
+    Returns:
+        tuple: (og'ish burchagi gradusda - satrlar qiyaligi tasvir koordinatalarida (y pastga),
+            `rotate_image` ga o'zgarishsiz beriladi, ishonchlilik 0..1).
+    """
+    proxy = gray
+    while max(proxy.shape[:2]) > proxy_size:
+        proxy = cv2.pyrDown(proxy)
+    points = _foreground_points(proxy, coarse_points)
+    if len(points) < 2:
+        return 0.0, 0.0
+
+    angles = np.arange(-max_angle, max_angle + coarse_step / 2, coarse_step)
+    scores = _profile_scores(points, angles)
+    best = scores.max()
+    confidence = float((best - np.median(scores)) / best) if best > 0 else 0.0
+    angle = _peak(angles, scores)
+
+    points = _foreground_points(gray, max_points)
+    angles = np.arange(angle - coarse_step, angle + coarse_step + fine_step / 2, fine_step)
+    angle = _peak(angles, _profile_scores(points, angles))
+    return float(np.clip(angle, -max_angle, max_angle)), confidence
+
+
+def rotate_image(img, angle, dst=None):
+    """
+    Tasvirni markazi atrofida aylantirib, og'ishni to'g'rilaydi (matritsa `deskew_transform` dan).
+
+    Args:
+        img (numpy.ndarray): Tasvir.
+        angle (float): `estimate_skew` yoki `estimate_skew_angle` qaytargan og'ish burchagi.
+        dst (numpy.ndarray): Natija uchun oldindan ajratilgan bufer (ixtiyoriy).
+
+    Returns:
+        numpy.ndarray: Rostlangan tasvir.
+    """
+    if angle == 0:
+        if dst is None:
+            return img
+        np.copyto(dst, img)
+        return dst
+    M, dsize = deskew_transform(img.shape, angle)
+    return cv2.warpAffine(img, M, dsize, dst=dst)
+
+
+def deskew_transform(shape, angle, scale=1.0, dsize=None):
+    """
+    Og'ishni to'g'rilash va o'lchamni o'zgartirishni bitta affin matritsaga birlashtiradi.
+
+    Baholagichlar satrlar qiyaligini tasvir koordinatalarida (y pastga) qaytaradi: ekranda
+    soat strelkasi bo'yicha og'gan satrlar uchun burchak musbat. `getRotationMatrix2D` musbat
+    burchakda ekranda soat strelkasiga teskari buradi, shuning uchun burchak o'zgarishsiz beriladi.
+
+    Args:
+        shape (tuple): Manba tasvir shakli.
+        angle (float): Og'ish burchagi (gradus).
+        scale (float): Masshtab (dsize berilmasa, natija o'lchami shape * scale).
+        dsize (tuple): Natija o'lchami (kenglik, balandlik), ixtiyoriy.
+
+    Returns:
+        tuple: (2x3 matritsa, (kenglik, balandlik)).
+    """
+    height, width = shape[:2]
+    if dsize is None:
+        dsize = (max(1, round(width * scale)), max(1, round(height * scale)))
+    M = cv2.getRotationMatrix2D((width / 2, height / 2), angle, scale)
+    # Manba markazi natija markaziga tushadi
+    M[0, 2] += dsize[0] / 2 - width / 2
+    M[1, 2] += dsize[1] / 2 - height / 2
+    return M, dsize
+
+
+def deskew_image(image, angle=None, scale=1.0, dsize=None, method="profile", min_confidence=MIN_CONFIDENCE,
+                 interpolation=cv2.INTER_LINEAR, dst=None):
+    """
+    Og'ishni aniqlab, tasvirni aylantiradi; keyingi o'lcham o'zgartirish shu bitta
+    `warpAffine` chaqiruvida bajariladi (alohida `resize` va oraliq tasvir yo'q).
+
+    Args:
+        image (numpy.ndarray): Kulrang yoki RGB tasvir.
+        angle (float): Ma'lum og'ish burchagi. None bo'lsa, `method` bo'yicha aniqlanadi.
+        scale (float): Masshtab.
+        dsize (tuple): Natija o'lchami (kenglik, balandlik), ixtiyoriy.
+        method (str): "profile" (`estimate_skew`) yoki "hough" (`estimate_skew_angle`).
+        min_confidence (float): "profile" bahosi shundan past bo'lsa, tasvir aylantirilmaydi.
+        interpolation (int): OpenCV interpolyatsiya bayrog'i.
+        dst (numpy.ndarray): Natija uchun oldindan ajratilgan bufer (ixtiyoriy).
+
+    Returns:
+        tuple: (natija tasvir, qo'llangan burchak, ishonchlilik yoki None).
+    """
+    confidence = None
+    if angle is None:
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+        if method == "hough":
+            angle, _ = estimate_skew_angle(gray)
+        else:
+            angle, confidence = estimate_skew(gray)
+            if confidence < min_confidence:
+                angle = 0.0
+    M, dsize = deskew_transform(image.shape, angle, scale, dsize)
+    if angle == 0 and tuple(dsize) == (image.shape[1], image.shape[0]):
+        return rotate_image(image, 0, dst=dst), angle, confidence
+    return cv2.warpAffine(image, M, dsize, dst=dst, flags=interpolation), angle, confidence
+
+
+def roundtrip_mse(source, result, angle, scale=1.0):
+    """
+    Aylantirilgan natijani teskari o'zgartirish bilan manbaga qaytarib, interpolyatsiya
+    yo'qotishini o'lchaydi (chegaradan tashqariga chiqqan qismlar hisobga olinmaydi).
+
+    Returns:
+        float: O'rtacha kvadratik xato (kulrang qiymatlar bo'yicha).
+    """
+    if source.ndim == 3:
+        source = cv2.cvtColor(source, cv2.COLOR_RGB2GRAY)
+        result = cv2.cvtColor(result, cv2.COLOR_RGB2GRAY)
+    if angle == 0 and result.shape == source.shape:
+        return 0.0
+    M, dsize = deskew_transform(source.shape, angle, scale, (result.shape[1], result.shape[0]))
+    inverse = cv2.invertAffineTransform(M)
+    size = (source.shape[1], source.shape[0])
+    back = cv2.warpAffine(result, inverse, size)
+    # Ikkala o'zgartirishda ham tasvir ichida qolgan piksellar
+    valid = cv2.warpAffine(cv2.warpAffine(np.full(source.shape, 255, np.uint8), M, dsize, flags=cv2.INTER_NEAREST),
+                           inverse, size, flags=cv2.INTER_NEAREST)
+    valid = cv2.erode(valid, np.ones((3, 3), np.uint8))
+    count = cv2.countNonZero(valid)
+    if count == 0:
+        return 0.0
+    diff = cv2.absdiff(source, back)
+    return float(cv2.norm(diff, cv2.NORM_L2SQR, mask=valid) / count)
@@ -1,54 +1,194 @@
+import argparse
+import json
+import os
 import sys
-import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2 as cv
 import numpy as np
-def main(argv):
-    
-    default_file = 'image copy 3.png'
-    filename = argv[0] if len(argv) > 0 else default_file
+
+# Natijadagi ustunlar (JSON Lines fayl har bir qatorida bitta tasvir)
+LINE_COLUMNS = ("rho", "theta_deg", "x1", "y1", "x2", "y2")
+SEGMENT_COLUMNS = ("x1", "y1", "x2", "y2", "angle_deg")
+
+
+def line_endpoints(lines, length):
+    """
+    (rho, theta) ko'rinishidagi chiziqlarning ikki uchini bitta NumPy amalida hisoblaydi.
+
+    Args:
+        lines (numpy.ndarray): cv.HoughLines natijasi, (N, 1, 2) yoki (N, 2).
+        length (float): Chiziqning (x0, y0) nuqtadan har ikki tomonga cho'zilishi.
+
+    Returns:
+        numpy.ndarray: (N, 4) int32 massiv [x1, y1, x2, y2].
+    """
+    lines = np.asarray(lines, np.float64).reshape(-1, 2)
+    rho, theta = lines[:, 0], lines[:, 1]
+    a, b = np.cos(theta), np.sin(theta)
+    x0, y0 = a * rho, b * rho
+    return np.column_stack([x0 - length * b, y0 + length * a, x0 + length * b, y0 - length * a]).astype(np.int32)
+
+
+def segment_angles(segments):
+    # Segmentlar burchagi gorizontalga nisbatan, (-90, 90] oralig'ida
+    segments = np.asarray(segments, np.float64).reshape(-1, 4)
+    angles = np.degrees(np.arctan2(segments[:, 3] - segments[:, 1], segments[:, 2] - segments[:, 0]))
+    return (angles + 90) % 180 - 90
+
+
+def detect_lines(gray, angle_range=None, threshold=150, probabilistic=True, p_threshold=50,
+                 min_line_length=50, max_line_gap=10, canny_low=50, canny_high=200):
+    """
+    Canny chegaralari bo'yicha standart va (ixtiyoriy) ehtimoliy Hough chiziqlarini topadi.
+
+    `angle_range` berilsa, standart Hough faqat gorizontal atrofidagi ±angle_range
+    oralig'ida (theta = 90° ± angle_range) qidiradi: akkumulyator burchaklar bo'yicha
+    180 / (2 * angle_range) marta kichik bo'ladi. HoughLinesP da burchak chegarasi yo'q,
+    shuning uchun uning segmentlari vektorlashtirilgan filtr bilan saralanadi.
+
+    Args:
+        gray (numpy.ndarray): Kulrang tasvir.
+        angle_range (float): Gorizontaldan ruxsat etilgan og'ish (gradus). None - barcha burchaklar.
+        threshold (int): cv.HoughLines ovozlar chegarasi.
+        probabilistic (bool): cv.HoughLinesP ham ishga tushirilsinmi.
+        p_threshold, min_line_length, max_line_gap: cv.HoughLinesP parametrlari.
+        canny_low, canny_high: Canny chegaralari.
+
+    Returns:
+        tuple: (Canny tasviri, (N, 6) chiziqlar [LINE_COLUMNS], (M, 5) segmentlar [SEGMENT_COLUMNS]).
+    """
+    edges = cv.Canny(gray, canny_low, canny_high, None, 3)
+    if angle_range is None:
+        min_theta, max_theta = 0.0, np.pi
+    else:
+        min_theta = np.deg2rad(90 - angle_range)
+        max_theta = np.deg2rad(90 + angle_range)
+    raw = cv.HoughLines(edges, 1, np.pi / 180, threshold, None, 0, 0, min_theta, max_theta)
+    if raw is None:
+        lines = np.empty((0, 6))
+    else:
+        raw = raw.reshape(-1, 2)
+        length = float(np.hypot(*gray.shape[:2]))
+        lines = np.column_stack([raw[:, 0], np.degrees(raw[:, 1]), line_endpoints(raw, length)])
+
+    segments = np.empty((0, 5))
+    if probabilistic:
+        raw = cv.HoughLinesP(edges, 1, np.pi / 180, p_threshold, None, min_line_length, max_line_gap)
+        if raw is not None:
+            raw = raw.reshape(-1, 4)
+            angles = segment_angles(raw)
+            segments = np.column_stack([raw, angles])
+            if angle_range is not None:
+                segments = segments[np.abs(angles) <= angle_range]
+    return edges, lines, segments
+
+
+def analyze_image(path, **kwargs):
+    """
+    Bitta tasvir uchun tuzilgan natija (`detect_lines` parametrlari bilan).
+
+    Returns:
+        dict: image, width, height, lines, segments, seconds.
+    """
+    src = cv.imread(path, cv.IMREAD_GRAYSCALE)
+    if src is None:
+        raise ValueError(f"Tasvirni ochib bo'lmadi: {path}")
+    started = time.perf_counter()
+    _, lines, segments = detect_lines(src, **kwargs)
+    return {
+        "image": path,
+        "width": src.shape[1],
+        "height": src.shape[0],
+        "lines": [[round(float(v), 4) for v in row[:2]] + [int(v) for v in row[2:]] for row in lines],
+        "segments": [[int(v) for v in row[:4]] + [round(float(row[4]), 4)] for row in segments],
+        "seconds": round(time.perf_counter() - started, 6),
+    }
+
+
+def iter_folder(paths, workers=None, **kwargs):
+    """
+    Tasvirlarni oqimlar hovuzida tahlil qiladi (OpenCV GIL ni bo'shatadi), oynalarsiz.
+
+    Yields:
+        tuple: (yo'l, natija lug'ati yoki None, xato matni yoki None) - kiruvchi tartibda.
+    """
+    def task(path):
+        try:
+            return path, analyze_image(path, **kwargs), None
+        except Exception as e:
+            return path, None, str(e)
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        yield from pool.map(task, paths)
+
+
+def show(filename, angle_range=None):
     # Loads an image
     src = cv.imread(cv.samples.findFile(filename), cv.IMREAD_GRAYSCALE)
     # Check if image is loaded fine
     if src is None:
         print ('Error opening image!')
-        print ('Usage: hough_lines.py [image_name -- default ' + default_file + '] \n')
+        print ('Usage: hough.py [image_name -- default image copy 3.png] \n')
         return -1
-    
-    
-    dst = cv.Canny(src, 50, 200, None, 3)
-    
+
+    dst, lines, segments = detect_lines(src, angle_range)
+
     # Copy edges to the images that will display the results in BGR
     cdst = cv.cvtColor(dst, cv.COLOR_GRAY2BGR)
     cdstP = np.copy(cdst)
-    
-    lines = cv.HoughLines(dst, 1, np.pi / 180, 150, None, 0, 0)
-    
-    if lines is not None:
-        for i in range(0, len(lines)):
-            rho = lines[i][0][0]
-            theta = lines[i][0][1]
-            a = math.cos(theta)
-            b = math.sin(theta)
-            x0 = a * rho
-            y0 = b * rho
-            pt1 = (int(x0 + 1000*(-b)), int(y0 + 1000*(a)))
-            pt2 = (int(x0 - 1000*(-b)), int(y0 - 1000*(a)))
-            cv.line(cdst, pt1, pt2, (0,0,255), 3, cv.LINE_AA)
-    
-    
-    linesP = cv.HoughLinesP(dst, 1, np.pi / 180, 50, None, 50, 10)
-    
-    if linesP is not None:
-        for i in range(0, len(linesP)):
-            l = linesP[i][0]
-            cv.line(cdstP, (l[0], l[1]), (l[2], l[3]), (0,0,255), 3, cv.LINE_AA)
-    
+
+    # Barcha chiziqlar bitta polylines chaqiruvi bilan chiziladi
+    if len(lines):
+        cv.polylines(cdst, lines[:, 2:6].astype(np.int32).reshape(-1, 2, 2), False, (0,0,255), 3, cv.LINE_AA)
+    if len(segments):
+        cv.polylines(cdstP, segments[:, :4].astype(np.int32).reshape(-1, 2, 2), False, (0,0,255), 3, cv.LINE_AA)
+
     cv.imshow("Source", src)
     cv.imshow("Detected Lines (in red) - Standard Hough Line Transform", cdst)
     cv.imshow("Detected Lines (in red) - Probabilistic Line Transform", cdstP)
-    
+
     cv.waitKey()
     return 0
-    
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Hough chiziqlarini ko'rsatish yoki kataloglar bo'yicha oynalarsiz tahlil qilish.")
+    parser.add_argument("inputs", nargs="*", default=["image copy 3.png"],
+                        help="Tasvir (ko'rsatish rejimi) yoki kataloglar, fayllar, glob shablonlari (--batch)")
+    parser.add_argument("--batch", action="store_true", help="Oynalarsiz rejim: natijalar JSON Lines ko'rinishida")
+    parser.add_argument("--output", default="-", help="JSON Lines fayli (standart: stdout)")
+    parser.add_argument("--angle-range", type=float, default=None,
+                        help="Faqat gorizontaldan ±shu gradusgacha bo'lgan chiziqlar (masalan, 15)")
+    parser.add_argument("--threshold", type=int, default=150, help="cv.HoughLines ovozlar chegarasi")
+    parser.add_argument("--no-probabilistic", action="store_true", help="cv.HoughLinesP ni o'tkazib yuborish")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Oqimlar soni (standart: yadrolar soni)")
+    args = parser.parse_args(argv)
+
+    if not args.batch:
+        return show(args.inputs[0], args.angle_range)
+
+    from clahe_batch import find_images
+    paths = find_images(args.inputs)
+    if not paths:
+        print("Hech qanday tasvir topilmadi.", file=sys.stderr)
+        return 1
+
+    failed = 0
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for path, result, error in iter_folder(paths, args.workers, angle_range=args.angle_range,
+                                               threshold=args.threshold, probabilistic=not args.no_probabilistic):
+            if error is not None:
+                failed += 1
+                print(f"Xato: {path}: {error}", file=sys.stderr)
+                continue
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failed else 0
+
 if __name__ == "__main__":
-    main(sys.argv[1:])
\ No newline at end of file
+    sys.exit(main(sys.argv[1:]))
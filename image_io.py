@@ -0,0 +1,196 @@
+import io
+import os
+import struct
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Xotiraga to'liq yuklamasdan np.memmap orqali ochiladigan formatlar
+MEMMAP_EXTENSIONS = (".pgm", ".ppm", ".raw", ".npy", ".tif", ".tiff")
+
+
+def _read_pnm_header(f):
+    # P5 (kulrang) va P6 (RGB) binar PNM sarlavhasini o'qish; izohlar (#) o'tkazib yuboriladi
+    magic = f.read(2)
+    if magic not in (b"P5", b"P6"):
+        return None
+    fields = []
+    while len(fields) < 3:
+        ch = f.read(1)
+        if not ch:
+            raise ValueError("PNM sarlavhasi to'liq emas.")
+        if ch == b"#":
+            f.readline()
+        elif ch.isspace():
+            continue
+        else:
+            token = ch
+            while True:
+                ch = f.read(1)
+                if not ch or ch.isspace():
+                    break
+                token += ch
+            fields.append(int(token))
+    width, height, maxval = fields
+    if maxval > 255:
+        return None # 16 bitli PNM memmap qilinmaydi
+    channels = 1 if magic == b"P5" else 3
+    return f.tell(), (height, width) if channels == 1 else (height, width, channels)
+
+
+def _read_tiff_layout(f):
+    """
+    Siqilmagan, bitta sahifali, 8 bitli TIFF ning ma'lumotlari faylda ketma-ket
+    joylashganini tekshiradi. Mos kelsa (offset, shape), aks holda None qaytaradi.
+    """
+    header = f.read(8)
+    if header[:4] == b"II*\x00":
+        endian = "<"
+    elif header[:4] == b"MM\x00*":
+        endian = ">"
+    else:
+        return None
+    ifd_offset = struct.unpack(endian + "I", header[4:8])[0]
+    f.seek(ifd_offset)
+    count = struct.unpack(endian + "H", f.read(2))[0]
+    type_sizes = {3: ("H", 2), 4: ("I", 4)}
+
+    tags = {}
+    for _ in range(count):
+        tag, typ, n, value = struct.unpack(endian + "HHI4s", f.read(12))
+        if typ not in type_sizes:
+            continue
+        fmt, size = type_sizes[typ]
+        if n * size <= 4:
+            raw = value[:n * size]
+        else:
+            pos = f.tell()
+            f.seek(struct.unpack(endian + "I", value)[0])
+            raw = f.read(n * size)
+            f.seek(pos)
+        tags[tag] = struct.unpack(endian + fmt * n, raw)
+
+    width, height = tags.get(256, (0,))[0], tags.get(257, (0,))[0]
+    channels = tags.get(277, (1,))[0]
+    if (tags.get(259, (1,))[0] != 1 # siqilgan
+            or 322 in tags # kataklangan (tiled) TIFF
+            or set(tags.get(258, (8,))) != {8}
+            or channels not in (1, 3)
+            or tags.get(262, (1,))[0] not in (1, 2) # WhiteIsZero va palitralar emas
+            or tags.get(284, (1,))[0] != 1
+            or 273 not in tags or 279 not in tags):
+        return None
+
+    offsets, byte_counts = tags[273], tags[279]
+    for i in range(len(offsets) - 1):
+        if offsets[i] + byte_counts[i] != offsets[i + 1]:
+            return None # polosalar ketma-ket emas
+    if sum(byte_counts) < width * height * channels:
+        return None
+    return offsets[0], (height, width) if channels == 1 else (height, width, channels)
+
+
+def memmap_layout(path, raw_shape=None):
+    """
+    Faylni np.memmap bilan ochish mumkinligini aniqlaydi.
+
+    Returns:
+        tuple yoki None: (ma'lumotlar boshlanish offseti, shape) yoki memmap qilib bo'lmasa None.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".raw":
+        if raw_shape is None:
+            raise ValueError("Raw fayllar uchun raw_shape ((H, W) yoki (H, W, C)) berilishi kerak.")
+        return 0, tuple(raw_shape)
+    with open(path, "rb") as f:
+        if ext in (".pgm", ".ppm"):
+            return _read_pnm_header(f)
+        if ext in (".tif", ".tiff"):
+            return _read_tiff_layout(f)
+    return None
+
+
+def decode_image_bytes(data, grayscale=None):
+    """
+    Xotiradagi tasvir baytlarini PIL orqali dekodlaydi. Manba kulrang bo'lsa,
+    RGB ga o'tkazilmaydi.
+
+    Args:
+        data (bytes): Fayl mazmuni.
+        grayscale (bool): True - har doim kulrang, False - har doim RGB, None - manbaga qarab.
+
+    Returns:
+        numpy.ndarray: (H, W) yoki (H, W, 3) uint8 massiv.
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        return _pil_to_array(image, grayscale)
+
+
+def _pil_to_array(image, grayscale):
+    if grayscale or (grayscale is None and image.mode in ("L", "1")):
+        return np.array(image.convert('L'))
+    return np.array(image.convert('RGB'))
+
+
+def open_image(path, grayscale=None, raw_shape=None, writable=False):
+    """
+    Tasvirni ochadi: PGM/PPM, raw uint8, .npy va siqilmagan TIFF fayllar np.memmap
+    orqali (nusxalamasdan), qolganlari PIL orqali o'qiladi.
+
+    Args:
+        path (str): Tasvir fayli yo'li.
+        grayscale (bool): True - har doim kulrang, False - har doim RGB, None - manbaga qarab.
+            Memmap qilingan rangli manbani kulrangga o'tkazish nusxa hosil qiladi.
+        raw_shape (tuple): .raw fayllar uchun massiv shakli.
+        writable (bool): Memmap ni o'zgartirish mumkin bo'lgan rejimda ochish.
+
+    Returns:
+        numpy.ndarray yoki numpy.memmap: (H, W) yoki (H, W, 3) uint8 massiv.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    mode = "r+" if writable else "r"
+    if ext == ".npy":
+        image = np.load(path, mmap_mode=mode)
+    else:
+        layout = memmap_layout(path, raw_shape) if ext in MEMMAP_EXTENSIONS else None
+        if layout is None:
+            with Image.open(path) as pil_image:
+                return _pil_to_array(pil_image, grayscale)
+        offset, shape = layout
+        image = np.memmap(path, dtype=np.uint8, mode=mode, offset=offset, shape=shape)
+
+    if image.ndim == 3 and grayscale:
+        return cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
+    if image.ndim == 2 and grayscale is False:
+        return cv2.cvtColor(np.asarray(image), cv2.COLOR_GRAY2RGB)
+    return image
+
+
+def create_output(path, shape):
+    """
+    Natija uchun oldindan ajratilgan, faylga bog'langan (np.memmap) massiv yaratadi.
+    Qayta ishlash funksiyalari natijani `dst=` orqali to'g'ridan-to'g'ri shu massivga yozadi.
+
+    Args:
+        path (str): .pgm/.ppm, .raw yoki .npy fayl yo'li.
+        shape (tuple): (H, W) yoki (H, W, 3).
+
+    Returns:
+        numpy.memmap: Yozish mumkin bo'lgan uint8 massiv.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    shape = tuple(shape)
+    if ext == ".npy":
+        return np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=shape)
+    if ext in (".pgm", ".ppm"):
+        if (ext == ".pgm") != (len(shape) == 2):
+            raise ValueError(f"{ext} formati {shape} shaklidagi tasvirga mos emas.")
+        header = f"{'P5' if len(shape) == 2 else 'P6'}\n{shape[1]} {shape[0]}\n255\n".encode("ascii")
+        with open(path, "wb") as f:
+            f.write(header)
+            f.truncate(len(header) + int(np.prod(shape)))
+        return np.memmap(path, dtype=np.uint8, mode="r+", offset=len(header), shape=shape)
+    if ext == ".raw":
+        return np.memmap(path, dtype=np.uint8, mode="w+", shape=shape)
+    raise ValueError(f"{ext} formatiga memmap orqali yozib bo'lmaydi. .pgm, .ppm, .raw yoki .npy dan foydalaning.")
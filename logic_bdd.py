@@ -0,0 +1,261 @@
+import numpy as np
+
+from logic_solver import UnsupportedExpression, ir_variables, lower, numbers_to_sets
+
+# Tugunlar soni chegarasi (taxminan 100-150 MB Python obyektlari)
+MAX_NODES = 2_000_000
+# O'zgaruvchilar soni chegarasi: to'plam raqamlari (SolutionSet) int64 da saqlanadi
+MAX_VARS = 63
+
+
+class BDDTooLarge(RuntimeError):
+    """
+    Qisqartirilgan tartiblangan BDD belgilangan tugunlar sonidan oshib ketdi.
+    """
+
+
+def variable_order(ir, var_count):
+    """
+    O'zgaruvchilarning IR da (chapdan o'ngga, chuqurlik bo'yicha) birinchi uchrash tartibi.
+    Tenglamalarda qatnashmagan o'zgaruvchilar oxiriga qo'shiladi.
+
+    Returns:
+        list[int]: Daraja -> o'zgaruvchi indeksi.
+    """
+    order = []
+    seen = set()
+    stack = [ir]
+    while stack:
+        node = stack.pop()
+        kind = node[0]
+        if kind == "var":
+            if node[1] not in seen:
+                seen.add(node[1])
+                order.append(node[1])
+        elif kind in ("and", "or"):
+            stack.extend(reversed(node[1]))
+        elif kind != "const":
+            stack.extend(reversed(node[1:]))
+    order.extend(i for i in range(var_count) if i not in seen)
+    return order
+
+
+class BDDSystem:
+    """
+    Tenglamalar tizimining qisqartirilgan tartiblangan ikkilik qaror diagrammasi (ROBDD).
+
+    `logic_solver.lower` hosil qilgan IR dan quriladi. Diagrammadagi o'zgaruvchilar tartibi
+    tenglamalarda birinchi uchrash tartibi (`variable_order`): bitta tenglamadagi o'zgaruvchilar
+    (masalan, x1 -> y1) yonma-yon tushadi, aks holda "avval barcha x, keyin barcha y" tartibida
+    diagramma eksponensial kattalashadi. Yechimlar baribir `LogSystems.generate_set` ko'rinishida
+    va to'plam raqamlarining o'sish tartibida qaytariladi.
+    Yechimlar soni 2**n to'plamni ko'rib chiqmasdan, diagramma tugunlari bo'yicha aniq hisoblanadi,
+    shuning uchun yechimlari kam bo'lgan 40-60 o'zgaruvchili tizimlar ham tez yechiladi.
+
+    Tugunlar ro'yxatlarda saqlanadi: 0 - yolg'on, 1 - rost terminal; qolganlari
+    (o'zgaruvchi, past, yuqori) uchligi, takrorlanmasligi unikal jadval orqali ta'minlanadi.
+
+    Args:
+        function (str): `LogSystems.prepare_function` hosil qilgan ifoda.
+        var_count (int): O'zgaruvchilar soni.
+        max_nodes (int): Tugunlar soni chegarasi; oshsa BDDTooLarge ko'tariladi.
+
+    Raises:
+        ValueError: O'zgaruvchilar MAX_VARS dan ko'p bo'lsa.
+    """
+    def __init__(self, function, var_count, max_nodes=MAX_NODES):
+        if var_count > MAX_VARS:
+            raise ValueError(f"{var_count} ta o'zgaruvchi: ko'pi bilan {MAX_VARS} ta o'zgaruvchili tizimlar yechiladi.")
+        self.function = function
+        self.var_count = var_count
+        self.max_nodes = max_nodes
+        self.ir = lower(function)
+        unknown = [i for i in ir_variables(self.ir) if not 0 <= i < var_count]
+        if unknown:
+            raise UnsupportedExpression(f"O'zgaruvchi indekslari diapazondan tashqarida: {unknown}")
+        self.order = variable_order(self.ir, var_count)  # daraja -> o'zgaruvchi indeksi
+        self._level_of = {var: level for level, var in enumerate(self.order)}
+
+        # Tugunlarda o'zgaruvchi indeksi emas, uning darajasi saqlanadi.
+        # Terminallarning darajasi n - barcha haqiqiy o'zgaruvchilardan pastda
+        self._var = [var_count, var_count]
+        self._low = [0, 1]
+        self._high = [0, 1]
+        self._unique = {}
+        self._apply_cache = {}
+        self._not_cache = {}
+        self.root = self._build(self.ir)
+        # Qurilish keshlari endi kerak emas
+        self._apply_cache.clear()
+        self._not_cache.clear()
+        self._count_cache = {}
+
+    @property
+    def node_count(self):
+        return len(self._var)
+
+    def _mk(self, var, low, high):
+        if low == high:
+            return low
+        key = (var, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            if len(self._var) >= self.max_nodes:
+                raise BDDTooLarge(f"BDD {self.max_nodes} tugundan oshib ketdi.")
+            node = len(self._var)
+            self._var.append(var)
+            self._low.append(low)
+            self._high.append(high)
+            self._unique[key] = node
+        return node
+
+    def _not(self, u):
+        if u < 2:
+            return 1 - u
+        result = self._not_cache.get(u)
+        if result is None:
+            result = self._mk(self._var[u], self._not(self._low[u]), self._not(self._high[u]))
+            self._not_cache[u] = result
+        return result
+
+    def _apply(self, op, u, v):
+        # Terminal holatlar
+        if op == "and":
+            if u == 0 or v == 0:
+                return 0
+            if u == 1 or u == v:
+                return v
+            if v == 1:
+                return u
+        elif op == "or":
+            if u == 1 or v == 1:
+                return 1
+            if u == 0 or u == v:
+                return v
+            if v == 0:
+                return u
+        else:  # xor
+            if u == v:
+                return 0
+            if u == 0:
+                return v
+            if v == 0:
+                return u
+            if u == 1:
+                return self._not(v)
+            if v == 1:
+                return self._not(u)
+
+        if u > v:  # barcha amallar kommutativ
+            u, v = v, u
+        key = (op, u, v)
+        result = self._apply_cache.get(key)
+        if result is None:
+            var_u, var_v = self._var[u], self._var[v]
+            var = min(var_u, var_v)
+            u0, u1 = (self._low[u], self._high[u]) if var_u == var else (u, u)
+            v0, v1 = (self._low[v], self._high[v]) if var_v == var else (v, v)
+            result = self._mk(var, self._apply(op, u0, v0), self._apply(op, u1, v1))
+            self._apply_cache[key] = result
+        return result
+
+    def _build(self, ir):
+        kind = ir[0]
+        if kind == "const":
+            return ir[1]
+        if kind == "var":
+            return self._mk(self._level_of[ir[1]], 0, 1)
+        if kind == "not":
+            return self._not(self._build(ir[1]))
+        if kind in ("and", "or"):
+            result = self._build(ir[1][0])
+            for x in ir[1][1:]:
+                # "and" zanjirida yolg'onga kelgach qolgan tenglamalarni qurish shart emas
+                if kind == "and" and result == 0:
+                    return 0
+                result = self._apply(kind, result, self._build(x))
+            return result
+        a = self._build(ir[1])
+        b = self._build(ir[2])
+        if kind == "xor":
+            return self._apply("xor", a, b)
+        if kind == "eq":
+            return self._not(self._apply("xor", a, b))
+        return self._apply("or", self._not(a), b)  # imp
+
+    def _sat_count(self, u):
+        # u tugunidan pastdagi (var(u) dan n gacha) o'zgaruvchilar bo'yicha yechimlar soni
+        if u < 2:
+            return u
+        result = self._count_cache.get(u)
+        if result is None:
+            var, low, high = self._var[u], self._low[u], self._high[u]
+            result = (self._sat_count(low) << (self._var[low] - var - 1)) \
+                + (self._sat_count(high) << (self._var[high] - var - 1))
+            self._count_cache[u] = result
+        return result
+
+    def count(self):
+        """
+        Yechimlarning aniq soni (Python butun soni, 2**n dan katta bo'lishi ham mumkin).
+        """
+        return self._sat_count(self.root) << self._var[self.root]
+
+    def iter_model_blocks(self):
+        """
+        Yechimlarni diagramma darajalari bo'yicha raqamlangan (bitlari `order` tartibidagi)
+        to'plamlarning ketma-ket bloklari sifatida qaytaradi. Rost terminalga yetgandan keyingi
+        barcha o'zgaruvchilar ixtiyoriy bo'lgani uchun ular bitta blokka birlashtiriladi.
+
+        Yields:
+            tuple: (birinchi raqam, blokdagi to'plamlar soni).
+        """
+        n = self.var_count
+        stack = [(self.root, 0, 0)]  # (tugun, daraja, shu darajagacha bo'lgan prefiks)
+        while stack:
+            u, level, prefix = stack.pop()
+            if u == 0:
+                continue
+            if u == 1:
+                yield prefix << (n - level), 1 << (n - level)
+                continue
+            if self._var[u] > level:
+                # level..var oralig'idagi o'zgaruvchilar ixtiyoriy: 0 tarmog'i avval chiqishi kerak
+                stack.append((u, level + 1, (prefix << 1) | 1))
+                stack.append((u, level + 1, prefix << 1))
+                continue
+            stack.append((self._high[u], level + 1, (prefix << 1) | 1))
+            stack.append((self._low[u], level + 1, prefix << 1))
+
+    def _to_original_numbers(self, numbers):
+        # Daraja tartibidagi bitlarni LogSystems.vars tartibiga o'tkazish
+        n = self.var_count
+        if self.order == list(range(n)):
+            return numbers
+        result = np.zeros_like(numbers)
+        for level, var in enumerate(self.order):
+            result |= ((numbers >> (n - 1 - level)) & 1) << (n - 1 - var)
+        return np.sort(result)
+
+    def solution_numbers(self, limit=None):
+        """
+        Yechim to'plamlari raqamlari (o'sish tartibida), ko'pi bilan `limit` ta. O'zgaruvchilar
+        tartibi o'zgartirilgan bo'lsa va yechimlar `limit` dan ko'p bo'lsa, qaytarilganlari
+        eng kichik raqamlilar bo'lishi shart emas.
+        """
+        parts = []
+        remaining = limit
+        for start, size in self.iter_model_blocks():
+            if remaining is not None:
+                size = min(size, remaining)
+                remaining -= size
+            parts.append(np.arange(start, start + size, dtype=np.int64))
+            if remaining == 0:
+                break
+        return self._to_original_numbers(np.concatenate(parts)) if parts else np.empty(0, np.int64)
+
+    def solutions(self, limit=None):
+        """
+        Yechimlar jadvali (`logic_solver.numbers_to_sets` ko'rinishida), ko'pi bilan `limit` ta.
+        """
+        return numbers_to_sets(self.solution_numbers(limit), self.var_count)
@@ -0,0 +1,505 @@
+import ast
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Bitta so'zdagi (uint64) to'plamlar soni va bir martada hisoblanadigan so'zlar soni
+WORD_BITS = 64
+CHUNK_WORDS = 1 << 16  # 4 194 304 ta to'plam (512 KB har bir oraliq massiv uchun)
+
+ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+# So'z ichidagi bit pozitsiyasi p < 6 bo'lgan o'zgaruvchining qiymatlari har bir so'zda bir xil:
+# p=0 -> 0xAAAA..., p=1 -> 0xCCCC..., ..., p=5 -> 0xFFFFFFFF00000000
+_LOW_MASKS = [np.uint64(sum(1 << b for b in range(WORD_BITS) if (b >> p) & 1)) for p in range(6)]
+
+
+class UnsupportedExpression(ValueError):
+    """
+    Ifodani bit-paketli baholovchiga tushirib bo'lmaydi (masalan, 0 va 1 dan boshqa
+    sonlar yoki qo'llab-quvvatlanmaydigan operator). Bunday holda eval() ga qaytiladi.
+    """
+
+
+def lower(function):
+    """
+    `LogSystems.prepare_function` hosil qilgan Python ifodasini (masalan,
+    "1 and ((set[0] or set[1]) == 0)") oddiy oraliq ko'rinishga (IR) tushiradi.
+
+    IR tugunlari kortejlar:
+        ("const", 0|1), ("var", i), ("not", x), ("and", (x, ...)), ("or", (x, ...)),
+        ("xor", a, b), ("eq", a, b), ("imp", a, b)
+
+    Barcha qiymatlar 0 yoki 1 bo'lgani uchun Python ning `and`/`or`/`not`/`==`/`<=`
+    semantikasi bit amallariga aynan mos keladi.
+
+    Args:
+        function (str): Python ifodasi.
+
+    Returns:
+        tuple: IR ildizi.
+
+    Raises:
+        SyntaxError: Ifoda Python sintaksisiga mos kelmasa.
+        UnsupportedExpression: Ifodada bit amallariga tushirib bo'lmaydigan qism bo'lsa.
+    """
+    return _lower(ast.parse(function, mode="eval").body)
+
+
+def _lower(node):
+    if isinstance(node, ast.Constant):
+        if node.value in (0, 1) and isinstance(node.value, (bool, int)):
+            return ("const", int(node.value))
+        raise UnsupportedExpression(f"Faqat 0 va 1 o'zgarmaslari qo'llab-quvvatlanadi: {node.value!r}")
+
+    if isinstance(node, ast.Subscript):
+        # set[i] - i-o'zgaruvchi
+        if isinstance(node.value, ast.Name) and node.value.id == "set" and isinstance(node.slice, ast.Constant) \
+                and isinstance(node.slice.value, int):
+            return ("var", node.slice.value)
+        raise UnsupportedExpression(f"Noma'lum indekslash: {ast.unparse(node)}")
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return ("not", _lower(node.operand))
+
+    if isinstance(node, ast.BoolOp):
+        kind = "and" if isinstance(node.op, ast.And) else "or"
+        return (kind, tuple(_lower(v) for v in node.values))
+
+    if isinstance(node, ast.BinOp):
+        left, right = _lower(node.left), _lower(node.right)
+        if isinstance(node.op, ast.BitAnd):
+            return ("and", (left, right))
+        if isinstance(node.op, ast.BitOr):
+            return ("or", (left, right))
+        if isinstance(node.op, ast.BitXor):
+            return ("xor", left, right)
+
+    if isinstance(node, ast.Compare):
+        # Zanjirli taqqoslash: a == b == c  ->  (a == b) and (b == c)
+        operands = [_lower(node.left)] + [_lower(c) for c in node.comparators]
+        parts = [_compare(op, a, b) for op, a, b in zip(node.ops, operands, operands[1:])]
+        return parts[0] if len(parts) == 1 else ("and", tuple(parts))
+
+    raise UnsupportedExpression(f"Qo'llab-quvvatlanmaydigan ifoda: {ast.unparse(node)}")
+
+
+def _compare(op, a, b):
+    if isinstance(op, ast.Eq):
+        return ("eq", a, b)
+    if isinstance(op, ast.NotEq):
+        return ("xor", a, b)
+    if isinstance(op, ast.LtE):  # implikatsiya: a -> b
+        return ("imp", a, b)
+    if isinstance(op, ast.GtE):
+        return ("imp", b, a)
+    if isinstance(op, ast.Lt):
+        return ("and", (("not", a), b))
+    if isinstance(op, ast.Gt):
+        return ("and", (a, ("not", b)))
+    raise UnsupportedExpression(f"Qo'llab-quvvatlanmaydigan taqqoslash: {type(op).__name__}")
+
+
+def ir_variables(ir):
+    """
+    IR da ishlatilgan o'zgaruvchilar indekslari to'plami.
+    """
+    kind = ir[0]
+    if kind == "var":
+        return {ir[1]}
+    if kind == "const":
+        return set()
+    if kind in ("and", "or"):
+        return set().union(*(ir_variables(x) for x in ir[1]))
+    return set().union(*(ir_variables(x) for x in ir[1:]))
+
+
+def popcount(words):
+    """
+    uint64 so'zlardagi birlik bitlar soni.
+    """
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+    return int(np.unpackbits(words.view(np.uint8)).sum(dtype=np.int64))
+
+
+def numbers_to_sets(numbers, var_count):
+    """
+    To'plam raqamlarini o'zgaruvchilar qiymatlari jadvaliga aylantiradi.
+
+    Args:
+        numbers (numpy.ndarray): int64 to'plam raqamlari.
+        var_count (int): O'zgaruvchilar soni.
+
+    Returns:
+        numpy.ndarray: (yechimlar soni, n) uint8 massiv; ustunlar o'zgaruvchilar tartibida.
+    """
+    shifts = np.arange(var_count - 1, -1, -1, dtype=np.int64)
+    return ((np.asarray(numbers, dtype=np.int64)[:, None] >> shifts) & 1).astype(np.uint8)
+
+
+class SolutionSet:
+    """
+    Yechimlarning ixcham saqlanishi: har bir yechim bitta int64 qator niqobi - to'plam raqami
+    (i-o'zgaruvchi `(m >> (n - 1 - i)) & 1` biti). Ustunlar (o'zgaruvchilar) bo'yicha
+    mantiqiy indekslar so'ralganda hisoblanadi va saqlab qo'yiladi.
+
+    Yechimlar soni bo'yicha `len()`, qatorlar bo'laklari `rows()` orqali olinadi; Python
+    ro'yxatlari faqat kerak bo'lganda (`tolist()`, iteratsiya) yaratiladi.
+
+    Args:
+        numbers (numpy.ndarray): O'sish tartibidagi to'plam raqamlari.
+        var_count (int): O'zgaruvchilar soni.
+    """
+    def __init__(self, numbers, var_count):
+        self.numbers = np.asarray(numbers, dtype=np.int64)
+        self.var_count = var_count
+        self._columns = {}
+
+    @classmethod
+    def from_sets(cls, sets, var_count):
+        """
+        `generate_set` ko'rinishidagi ro'yxatlardan (eval() usuli natijasi) yaratadi.
+        """
+        if not len(sets):
+            return cls(np.empty(0, np.int64), var_count)
+        weights = np.int64(1) << np.arange(var_count - 1, -1, -1, dtype=np.int64)
+        return cls(np.asarray(sets, dtype=np.int64) @ weights, var_count)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __iter__(self):
+        # Ro'yxatlarga bo'laklab aylantirish (eski kod bilan moslik uchun)
+        for start in range(0, len(self), 65536):
+            yield from self.rows(start, start + 65536).tolist()
+
+    def __getitem__(self, index):
+        index = range(len(self))[index]  # manfiy indekslar va IndexError
+        return self.rows(index, index + 1)[0].tolist()
+
+    @property
+    def nbytes(self):
+        return self.numbers.nbytes + sum(c.nbytes for c in self._columns.values())
+
+    def column(self, index):
+        """
+        index-o'zgaruvchi qiymati 1 bo'lgan yechimlarning mantiqiy niqobi (keshlanadi).
+        """
+        column = self._columns.get(index)
+        if column is None:
+            column = ((self.numbers >> (self.var_count - 1 - index)) & 1).astype(bool)
+            self._columns[index] = column
+        return column
+
+    def field(self, start, stop):
+        """
+        [start, stop) o'zgaruvchilari bitlarini butun son sifatida qaytaradi
+        (start-o'zgaruvchi eng katta bit). Masalan, barcha x o'zgaruvchilari niqobi.
+        """
+        width = stop - start
+        if width <= 0:
+            return np.zeros(len(self), np.int64)
+        return (self.numbers >> (self.var_count - stop)) & ((1 << width) - 1)
+
+    def rows(self, start=0, stop=None):
+        """
+        [start, stop) yechimlarining (k, n) uint8 jadvali.
+        """
+        return numbers_to_sets(self.numbers[start:stop], self.var_count)
+
+    def tolist(self):
+        return self.rows().tolist()
+
+
+class CompiledSystem:
+    """
+    Tenglamalar tizimining bir marta kompilyatsiya qilingan ko'rinishi.
+
+    To'plam raqami m (0 <= m < 2**n) da i-o'zgaruvchi qiymati `(m >> (n - 1 - i)) & 1`
+    (`LogSystems.generate_set` bilan bir xil tartib). Barcha 2**n to'plam uint64 so'zlarga
+    joylanadi: m-to'plam (m // 64)-so'zning (m % 64)-biti. IR so'zlar bo'laklari ustida
+    NumPy bit amallari bilan baholanadi, shuning uchun har bir amal 64 ta to'plamni
+    bir vaqtda tekshiradi.
+
+    Args:
+        function (str): `LogSystems.prepare_function` hosil qilgan ifoda.
+        var_count (int): O'zgaruvchilar soni.
+        chunk_words (int): Bir martada baholanadigan so'zlar soni (xotira chegarasi).
+    """
+    def __init__(self, function, var_count, chunk_words=CHUNK_WORDS):
+        self.function = function
+        self.var_count = var_count
+        self.ir = lower(function)
+        unknown = [i for i in ir_variables(self.ir) if not 0 <= i < var_count]
+        if unknown:
+            raise UnsupportedExpression(f"O'zgaruvchi indekslari diapazondan tashqarida: {unknown}")
+        self.total = 1 << var_count  # to'plamlar soni
+        self.word_count = max(1, self.total // WORD_BITS)
+        self.chunk_words = chunk_words
+        # 64 dan kam to'plam bo'lsa, yagona so'zning faqat pastki bitlari haqiqiy
+        self._tail_mask = ALL_ONES if self.total >= WORD_BITS else np.uint64((1 << self.total) - 1)
+
+    def _variable_words(self, index, first_word, length):
+        p = self.var_count - 1 - index  # to'plam raqamidagi bit pozitsiyasi
+        if p < 6:
+            return _LOW_MASKS[p]
+        words = np.arange(first_word, first_word + length, dtype=np.uint64)
+        return ((words >> np.uint64(p - 6)) & np.uint64(1)) * ALL_ONES
+
+    def _evaluate(self, ir, first_word, length, cache):
+        kind = ir[0]
+        if kind == "const":
+            return ALL_ONES if ir[1] else np.uint64(0)
+        if kind == "var":
+            words = cache.get(ir[1])
+            if words is None:
+                words = cache[ir[1]] = self._variable_words(ir[1], first_word, length)
+            return words
+        if kind == "not":
+            return ~self._evaluate(ir[1], first_word, length, cache)
+        if kind in ("and", "or"):
+            op = np.bitwise_and if kind == "and" else np.bitwise_or
+            result = self._evaluate(ir[1][0], first_word, length, cache)
+            for x in ir[1][1:]:
+                result = op(result, self._evaluate(x, first_word, length, cache))
+            return result
+        a = self._evaluate(ir[1], first_word, length, cache)
+        b = self._evaluate(ir[2], first_word, length, cache)
+        if kind == "xor":
+            return a ^ b
+        if kind == "eq":
+            return ~(a ^ b)
+        return ~a | b  # imp
+
+    def evaluate_numbers(self, numbers):
+        """
+        Tizimni berilgan to'plam raqamlarida baholaydi (masalan, keshdagi yechimlarni
+        qo'shimcha tenglama bilan filtrlash uchun). Har bir to'plam alohida so'z sifatida olinadi.
+
+        Returns:
+            numpy.ndarray: bool niqob; True - tizim shu to'plamda bajariladi.
+        """
+        numbers = np.asarray(numbers, dtype=np.int64)
+        cache = {i: ((numbers >> (self.var_count - 1 - i)) & 1).astype(np.uint64) * ALL_ONES
+                 for i in ir_variables(self.ir)}
+        result = self._evaluate(self.ir, 0, len(numbers), cache)
+        return np.broadcast_to(result, numbers.shape) != 0
+
+    def evaluate_words(self, first_word, length):
+        """
+        [first_word, first_word + length) so'zlari uchun natija bitlarini hisoblaydi.
+
+        Returns:
+            numpy.ndarray: uint64 so'zlar; 1 bit - tizim shu to'plamda bajariladi.
+        """
+        result = self._evaluate(self.ir, first_word, length, {})
+        result = np.array(np.broadcast_to(result, (length,)), dtype=np.uint64)
+        if first_word + length >= self.word_count:
+            result[-1] &= self._tail_mask
+        return result
+
+    def iter_chunks(self, start_word=0, stop_word=None):
+        """
+        So'zlarni `chunk_words` bo'laklari bilan baholaydi.
+
+        Yields:
+            tuple: (birinchi so'z raqami, uint64 natija so'zlari).
+        """
+        stop_word = self.word_count if stop_word is None else min(stop_word, self.word_count)
+        for first in range(start_word, stop_word, self.chunk_words):
+            length = min(self.chunk_words, stop_word - first)
+            yield first, self.evaluate_words(first, length)
+
+    def count(self):
+        """
+        Yechimlar soni.
+        """
+        return sum(popcount(words) for _, words in self.iter_chunks())
+
+    @staticmethod
+    def chunk_numbers(first_word, words):
+        """
+        Natija so'zlaridagi birlik bitlarni to'plam raqamlariga aylantiradi (o'sish tartibida).
+        """
+        bits = np.unpackbits(words.astype("<u8").view(np.uint8), bitorder="little")
+        return np.flatnonzero(bits).astype(np.int64) + first_word * WORD_BITS
+
+    def solution_numbers(self):
+        """
+        Tizim bajariladigan barcha to'plam raqamlari (o'sish tartibida).
+        """
+        parts = [self.chunk_numbers(first, words) for first, words in self.iter_chunks()]
+        return np.concatenate(parts) if parts else np.empty(0, np.int64)
+
+    def numbers_to_sets(self, numbers):
+        """
+        To'plam raqamlarini o'zgaruvchilar qiymatlari jadvaliga aylantiradi (`numbers_to_sets`).
+        """
+        return numbers_to_sets(numbers, self.var_count)
+
+    def solutions(self):
+        """
+        Barcha yechimlar, `LogSystems.solve` bilan bir xil tartibda.
+        """
+        return self.numbers_to_sets(self.solution_numbers())
+
+    def iter_solution_words(self, workers=None, task_words=CHUNK_WORDS, cancel=None):
+        """
+        To'plamlar fazosini ketma-ket so'z oraliqlariga bo'lib, ularni jarayonlar hovuzida
+        baholaydi va natijalarni tartib bilan, tayyor bo'lishi bilan qaytaradi (generator).
+        Kichik tizimlar (bitta oraliqqa sig'adigan) joriy jarayonda hisoblanadi.
+
+        Hovuzga bir vaqtda faqat `2 * workers` ta oraliq yuboriladi, shuning uchun generator
+        yopilganda yoki `cancel()` True qaytarganda qolgan ish boshlanmaydi.
+
+        Args:
+            workers (int): Jarayonlar soni. None bo'lsa, yadrolar soniga teng.
+            task_words (int): Bitta vazifadagi so'zlar soni (64 * task_words ta to'plam).
+            cancel (callable): Argumentsiz funksiya (masalan, threading.Event().is_set);
+                True qaytarsa, qidiruv to'xtatiladi.
+
+        Yields:
+            tuple: (birinchi so'z raqami, uint64 natija so'zlari, shu oraliqdagi yechimlar soni).
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or self.word_count <= task_words:
+            for first, words in self.iter_chunks():
+                if cancel is not None and cancel():
+                    return
+                yield first, words, popcount(words)
+            return
+
+        # Vazifalar generator orqali hosil qilinadi: 50 o'zgaruvchida ularning soni yuz millionlab,
+        # ro'yxat ko'rinishida birinchi oraliq boshlanmasdan xotirani to'ldirib yuborardi
+        ranges = ((self.function, self.var_count, first, min(first + task_words, self.word_count), self.chunk_words)
+                  for first in range(0, self.word_count, task_words))
+        # Streamlit serveri ko'p oqimli jarayon, shuning uchun fork o'rniga spawn ishlatiladi
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            pending = deque(pool.submit(_evaluate_range, task) for _, task in zip(range(2 * workers), ranges))
+            while pending:
+                if cancel is not None and cancel():
+                    return
+                result = pending.popleft().result()
+                task = next(ranges, None)
+                if task is not None:
+                    pending.append(pool.submit(_evaluate_range, task))
+                yield result
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Ishchi jarayonda kompilyatsiya qilingan tizimlar (har bir vazifada qayta tahlil qilmaslik uchun)
+_worker_systems = {}
+
+
+def _evaluate_range(task):
+    function, var_count, first, stop, chunk_words = task
+    system = _worker_systems.get((function, var_count))
+    if system is None:
+        system = _worker_systems[(function, var_count)] = CompiledSystem(function, var_count, chunk_words)
+    words = np.concatenate([w for _, w in system.iter_chunks(first, stop)])
+    return first, words, popcount(words)
+
+
+class SystemCache:
+    """
+    Yechilgan tizimlarning LRU keshi. Kalit - o'zgaruvchilar ro'yxati va normallashtirilgan
+    (bo'sh joylarsiz) tenglamalar to'plami, shuning uchun tenglamalar tartibi ahamiyatsiz.
+    Qiymat - yechimlar (SolutionSet) va ularning aniq soni.
+
+    Yangi tizim keshdagi tizimga bir nechta tenglama qo'shish orqali hosil bo'lgan bo'lsa,
+    `find_base` eng ko'p umumiy tenglamali yozuvni topadi va yangi yechimlar uning
+    yechimlarini qo'shimcha tenglamalar bilan filtrlash orqali olinadi.
+
+    Args:
+        max_entries (int): Yozuvlar soni chegarasi.
+        max_bytes (int): Yechimlar egallaydigan xotira chegarasi.
+    """
+    def __init__(self, max_entries=32, max_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.filtered = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # kalit -> (yozuv, hajm)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(var_names, equations):
+        return tuple(var_names), frozenset(equations)
+
+    def get(self, key, allow_truncated=True):
+        """
+        Kalit bo'yicha yozuvni qaytaradi. `allow_truncated` False bo'lsa, yechimlar ro'yxati
+        qisqartirilgan (BDD bilan yechilgan) yozuv yo'q deb hisoblanadi.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[0]["truncated"] and not allow_truncated):
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def find_base(self, key):
+        """
+        Bir xil o'zgaruvchilarga ega va tenglamalari `key` tenglamalarining qism to'plami bo'lgan
+        to'liq (qisqartirilmagan) yozuvlardan eng ko'p tenglamalisini qaytaradi.
+
+        Returns:
+            tuple yoki None: (yozuv kaliti, yozuv).
+        """
+        var_names, equations = key
+        best = None
+        with self._lock:
+            for other_key, (entry, _) in self._entries.items():
+                other_vars, other_equations = other_key
+                if other_vars != var_names or not other_equations < equations or entry["truncated"]:
+                    continue
+                if best is None or len(other_equations) > len(best[0][1]):
+                    best = (other_key, entry)
+            if best is not None:
+                self._entries.move_to_end(best[0])
+        return best
+
+    def put(self, key, entry):
+        size = entry["solutions"].nbytes
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (entry, size)
+            self.current_bytes += size
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def record(self, outcome):
+        """
+        Kesh yozuvidan filtrlash ("filtered") yoki yangidan yechish ("misses") holatini hisobga oladi.
+        """
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats_text(self):
+        with self._lock:
+            return (f"Tizimlar keshi: {len(self._entries)} ta yozuv, {self.current_bytes / 2**20:.1f} MB, "
+                    f"{self.hits} ta to'g'ridan-to'g'ri, {self.filtered} ta filtrlash orqali, {self.misses} ta yangidan")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = self.filtered = self.misses = 0
+
+
+# Modul darajasidagi kesh Streamlit skripti qayta ishga tushganda ham saqlanib qoladi
+system_cache = SystemCache()
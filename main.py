@@ -1,87 +1,98 @@
 import streamlit as st
-import cv2
-import numpy as np
-from PIL import Image
-
-def apply_clahe(image, clip_limit, tile_grid_size):
-    """
-    Berilgan tasvirga CLAHE (Contrast Limited Adaptive Histogram Equalization) algoritmini qo'llaydi.
-    Args:
-        image (numpy.ndarray): Qayta ishlanadigan tasvir.
-        clip_limit (float): Kontrastni cheklovchi chegarasi.
-        tile_grid_size (int): Tasvirni bo'linadigan panjara hajmi (en va bo'yi uchun).
-
-    Returns:
-        numpy.ndarray: CLAHE qo'llanilgan tasvir.
-    """
-    if len(image.shape) == 3: # Agar tasvir rangli bo'lsa
-        # Rangli tasvirlar uchun YCbCr rang maydoniga o'tkazish
-        ycbcr_image = cv2.cvtColor(image, cv2.COLOR_RGB2YCrCb)
-        y_channel = ycbcr_image[:,:,0] # Y kanalini ajratib olish
-    else: # Agar tasvir kulrang bo'lsa
-        y_channel = image
-
-    # CLAHE ob'ektini yaratish
-    clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(tile_grid_size, tile_grid_size))
-
-    # Y kanaliga CLAHE qo'llash
-    clahe_applied_y_channel = clahe.apply(y_channel)
-
-    if len(image.shape) == 3:
-        # Y kanalini qayta birlashtirish
-        ycbcr_image[:,:,0] = clahe_applied_y_channel
-        # Qayta ishlangan tasvirni RGB ga qaytarish
-        processed_image = cv2.cvtColor(ycbcr_image, cv2.COLOR_YCrCb2RGB)
-    else:
-        processed_image = clahe_applied_y_channel
-
-    return processed_image
+
+from clahe_core import apply_clahe, clahe_cache
+from clahe_tune import auto_tune
+from preview import encode_preview, full_resolution_download, preview_source
+from result_cache import load_upload, result_cache
 
 st.set_page_config(layout="wide", page_title="CLAHE Tasvirni Yaxshilash Dasturi")
 
 st.title("Contrast Limited Adaptive Histogram Equalization (CLAHE)")
 st.write("Tasvirni yuklang va `Clip Limit` hamda `Tile Grid Size` qiymatlarini o'zgartirib, kontrastni yaxshilang.")
 
+# Slayderlar qiymatlari session_state da: avtomatik sozlash ularni o'rnatadi
+st.session_state.setdefault("clip_limit", 2.0)
+st.session_state.setdefault("tile_grid_size", 8)
+
+
+def run_auto_tune(image_hash, img_array):
+    # Slayderlar chizilishidan oldin chaqiriladi (on_click), shuning uchun ularning qiymatini o'zgartirish mumkin
+    best = result_cache.get_or_compute(("clahe_tune", image_hash), lambda: auto_tune(img_array))
+    st.session_state["clip_limit"] = round(best["clip_limit"], 2)
+    st.session_state["tile_grid_size"] = best["tile_grid_size"]
+    st.session_state["clahe_tune"] = (image_hash, best)
+
 # Tasvirni yuklash qismi
 uploaded_file = st.file_uploader("Tasvirni yuklang...", type=["jpg", "jpeg", "png", "bmp", "tiff"])
 
 if uploaded_file is not None:
-    # Faylni PIL Image ob'ektiga aylantirish
-    image = Image.open(uploaded_file)
-    # PIL Image ni OpenCV ga mos numpy massiviga aylantirish (RGB formatida)
-    img_array = np.array(image.convert('RGB'))
+    # Faylni bir marta dekodlab, numpy massivini keshlash (xesh bo'yicha)
+    image_hash, img_array = load_upload(uploaded_file)
 
     # Parametrlarni sozlash uchun slayderlar
     st.sidebar.header("CLAHE Parametrlari")
+    st.sidebar.button(
+        "Avtomatik sozlash",
+        on_click=run_auto_tune,
+        args=(image_hash, img_array),
+        help="Kichraytirilgan nusxada parametrlar panjarasini parallel baholab, entropiyasi yuqori va shovqini past natija beradigan qiymatlarni tanlaydi."
+    )
     clip_limit = st.sidebar.slider(
         "Clip Limit (Kontrast chegarasi)",
         min_value=0.01,
         max_value=10.0,
-        value=2.0,
         step=0.01,
+        key="clip_limit",
         help="Bu qiymat kontrastni oshirishda cheklov vazifasini bajaradi. Yuqori qiymatlar kuchliroq kontrast beradi, lekin shovqinni ham kuchaytirishi mumkin."
     )
     tile_grid_size = st.sidebar.slider(
         "Tile Grid Size (Panjara hajmi)",
         min_value=2,
         max_value=32,
-        value=8,
         step=1,
+        key="tile_grid_size",
         help="Bu qiymat tasvirning qanday kattalikdagi bo'laklarga bo'linishini belgilaydi. Kichikroq qiymatlar lokalroq, kattaroq qiymatlar esa globalroq natija beradi."
     )
 
+    # Katta tasvirlarda slayderlar piramida proksisida sinab ko'riladi. CLAHE parametrlari
+    # o'lchamga bog'liq emas (panjara - bo'laklar soni), shuning uchun ular o'zgarishsiz qo'llanadi
+    work_hash, work_array, preview_scale = preview_source(image_hash, img_array)
+
     st.subheader("Natijalar")
 
     col1, col2 = st.columns(2)
 
     with col1:
-        st.image(img_array, caption="Asl tasvir", use_column_width=True)
+        st.image(
+            result_cache.get_or_compute(("preview", work_hash), lambda: encode_preview(work_array)),
+            caption="Asl tasvir", use_column_width=True
+        )
 
     # CLAHE algoritmini qo'llash
-    processed_img_array = apply_clahe(img_array, clip_limit, tile_grid_size)
+    processed_img_array = result_cache.get_or_compute(
+        ("clahe", work_hash, clip_limit, tile_grid_size),
+        lambda: apply_clahe(work_array, clip_limit, tile_grid_size)
+    )
+    full_resolution_download(
+        ("clahe", image_hash, clip_limit, tile_grid_size),
+        lambda: apply_clahe(img_array, clip_limit, tile_grid_size),
+        "clahe.png", preview_scale, processed_img_array
+    )
+
+    tuned = st.session_state.get("clahe_tune")
+    if tuned is not None and tuned[0] == image_hash:
+        best = tuned[1]
+        st.sidebar.caption(
+            f"Avtomatik sozlash: entropiya {best['entropy']:.2f} bit, shovqin MSE {best['noise_mse']:.2f}, "
+            f"{len(best['candidates'])} ta nomzod baholandi"
+        )
+
+    cache_stats = clahe_cache.stats()
+    st.sidebar.caption(result_cache.stats_text())
+    st.sidebar.caption(f"CLAHE ob'ektlari keshi: {cache_stats['size']} ta, {cache_stats['hits']} hit / {cache_stats['misses']} miss")
 
     with col2:
-        st.image(processed_img_array, caption=f"CLAHE qo'llanilgan tasvir (Clip Limit: {clip_limit}, Tile Grid Size: {tile_grid_size})", use_column_width=True)
+        st.image(encode_preview(processed_img_array), caption=f"CLAHE qo'llanilgan tasvir (Clip Limit: {clip_limit}, Tile Grid Size: {tile_grid_size})", use_column_width=True)
 
     st.markdown("""
     ---
@@ -1,9 +1,10 @@
 import streamlit as st
-import cv2
-import numpy as np
-from PIL import Image
 
-def apply_binarization(image_array, method="otsu", manual_threshold=127):
+from braille_core import GrayHistogram
+from preview import encode_preview, full_resolution_download, preview_source
+from result_cache import load_upload, result_cache
+
+def apply_binarization(image_array, method="otsu", manual_threshold=127, histogram=None):
     """
     Applies binarization to a given image using either Otsu's method or a manual threshold.
     If the image is colored, it is first converted to grayscale.
@@ -12,6 +13,8 @@ def apply_binarization(image_array, method="otsu", manual_threshold=127):
         image_array (numpy.ndarray): The input image (can be grayscale or color).
         method (str): Binarization method. Can be "otsu" or "manual".
         manual_threshold (int): The threshold value to use if method is "manual".
+        histogram (GrayHistogram): Cached grayscale plane and histogram of the image. If given,
+                                   the conversion is skipped and the threshold comes from the histogram.
 
     Returns:
         tuple: A tuple containing:
@@ -19,22 +22,20 @@ def apply_binarization(image_array, method="otsu", manual_threshold=127):
             - int: The threshold value actually used (Otsu's or manual).
             - numpy.ndarray: The grayscale version of the input image.
     """
-    # Check if the image is colored and convert to grayscale if necessary
-    if len(image_array.shape) == 3:
-        grayscale_image = cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
-    else:
-        grayscale_image = image_array
+    # Grayscale plane and histogram (computed here only if not cached by the caller)
+    if histogram is None:
+        histogram = GrayHistogram(image_array)
 
     if method == "otsu":
-        # Apply Otsu's binarization
-        ret, binarized_image = cv2.threshold(grayscale_image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        used_threshold = ret
+        # Otsu's threshold straight from the histogram
+        used_threshold = histogram.otsu_threshold()
     else: # method == "manual"
-        # Apply manual binarization
-        ret, binarized_image = cv2.threshold(grayscale_image, manual_threshold, 255, cv2.THRESH_BINARY)
         used_threshold = manual_threshold
 
-    return binarized_image, used_threshold, grayscale_image
+    # Binarization is a single lookup-table pass over the cached grayscale plane
+    binarized_image = histogram.binarize(used_threshold)
+
+    return binarized_image, used_threshold, histogram.gray
 
 st.set_page_config(layout="wide", page_title="Brayl Tasviri uchun Otsu/Qo'lda Binarizatsiya Dasturi")
 
@@ -46,10 +47,13 @@ st.write("Otsu binarizatsiyasi tasvirning gistogrammasiga asoslanib, fon va oldi
 uploaded_file = st.file_uploader("Tasvirni yuklang...", type=["jpg", "jpeg", "png", "bmp", "tiff"])
 
 if uploaded_file is not None:
-    # Open the uploaded file as a PIL Image
-    image_pil = Image.open(uploaded_file)
-    # Convert PIL Image to a numpy array for OpenCV processing (RGB format)
-    img_array = np.array(image_pil.convert('RGB'))
+    # Decode the upload once and cache the array by its content hash
+    image_hash, img_array = load_upload(uploaded_file)
+    # Katta tasvirlarda chegara piramida proksisida tanlanadi. pyrDown gistogrammani silliqlaydi,
+    # shuning uchun proksidagi Otsu chegarasi faqat ko'rinish uchun ishlatiladi
+    work_hash, work_array, preview_scale = preview_source(image_hash, img_array)
+    # Kulrang tekislik va 256 qutili gistogramma har bir yuklash uchun bir marta hisoblanadi
+    histogram = result_cache.get_or_compute(("histogram", work_hash), lambda: GrayHistogram(work_array))
 
     st.sidebar.header("Binarizatsiya Usulini Tanlang")
     binarization_method = st.sidebar.radio(
@@ -70,26 +74,47 @@ if uploaded_file is not None:
 
     st.subheader("Natijalar")
 
-    col1, col2 = st.columns(2)
-
-    # Apply binarization based on selected method
+    # Chegara va oq piksellar ulushi gistogrammadan darhol olinadi (binar tasvir hali hisoblanmagan)
     if binarization_method == "Otsu (Avtomatik)":
-        binarized_img, threshold_value, grayscale_img = apply_binarization(img_array, method="otsu")
+        threshold_value = histogram.otsu_threshold()
         threshold_info_text = f"Otsu tomonidan hisoblangan chegara qiymati: **{threshold_value:.2f}**"
         caption_text = "Otsu binarizatsiyasi qo'llanilgan Brayl tasviri"
     else:
-        binarized_img, threshold_value, grayscale_img = apply_binarization(img_array, method="manual", manual_threshold=manual_threshold_value)
+        threshold_value = manual_threshold_value
         threshold_info_text = f"Qo'lda belgilangan chegara qiymati: **{threshold_value}**"
         caption_text = f"Qo'lda binarizatsiya ({threshold_value}) qo'llanilgan Brayl tasviri"
 
+    white_fraction = histogram.fraction_above(threshold_value)
+    st.sidebar.metric("Oq piksellar ulushi", f"{white_fraction:.1%}", help="Chegaradan yuqori (oq) piksellar ulushi; qolgani qora.")
+    st.sidebar.caption(f"Qora piksellar ulushi: {1 - white_fraction:.1%}")
+
+    col1, col2 = st.columns(2)
+
+    # Otsu va qo'lda rejimlar bir xil chegarada bitta kesh yozuvidan foydalanadi
+    binarized_img, threshold_value, grayscale_img = result_cache.get_or_compute(
+        ("binarize", work_hash, threshold_value),
+        lambda: apply_binarization(work_array, method="manual", manual_threshold=threshold_value, histogram=histogram)
+    )
+    if binarization_method == "Otsu (Avtomatik)":
+        # Otsu chegarasi to'liq o'lchamdagi tasvirning o'z gistogrammasidan qayta hisoblanadi
+        full_key = ("binarize-otsu", image_hash)
+        full_compute = lambda: apply_binarization(img_array, method="otsu")[0]
+    else:
+        # Qo'lda berilgan chegara o'lchamga bog'liq emas
+        full_key = ("binarize", image_hash, threshold_value)
+        full_compute = lambda: apply_binarization(img_array, method="manual", manual_threshold=threshold_value)[0]
+    full_resolution_download(full_key, full_compute, "binarized.png", preview_scale, binarized_img)
+
 
     with col1:
-        st.image(grayscale_img, caption="Kulrang tasvir", use_column_width=True)
+        st.image(encode_preview(grayscale_img), caption="Kulrang tasvir", use_column_width=True)
         st.info(threshold_info_text)
 
 
     with col2:
-        st.image(binarized_img, caption=caption_text, use_column_width=True)
+        st.image(encode_preview(binarized_img, fmt="png"), caption=caption_text, use_column_width=True)
+
+    st.sidebar.caption(result_cache.stats_text())
 
     st.markdown("""
     ---
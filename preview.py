@@ -0,0 +1,127 @@
+import cv2
+import streamlit as st
+
+from result_cache import result_cache
+
+# Tezkor ko'rinish rejimida qayta ishlanadigan proksining eng katta tomoni (piksel)
+PREVIEW_MAX_SIDE = 1600
+# Brauzerga yuboriladigan ko'rinish kengligi: "wide" sahifadagi ikki ustundan birining kengligi
+PREVIEW_WIDTH = 900
+PREVIEW_QUALITY = 85
+PREVIEW_FORMATS = {
+    "jpeg": (".jpg", cv2.IMWRITE_JPEG_QUALITY),
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY),
+    "png": (".png", None),
+}
+
+
+def pyramid_proxy(image, max_side=PREVIEW_MAX_SIDE):
+    """
+    Tasvir piramidasining (cv2.pyrDown) eng katta tomoni `max_side` dan oshmaydigan darajasi.
+
+    Returns:
+        tuple: (proksi tasvir, masshtab - proksi kengligining asl kenglikka nisbati).
+    """
+    proxy = image
+    while max(proxy.shape[:2]) > max_side:
+        proxy = cv2.pyrDown(proxy)
+    return proxy, proxy.shape[1] / image.shape[1]
+
+
+def scale_odd(size, scale, minimum=1):
+    """
+    Piksellarda berilgan toq o'lchamni (blok, kernel) proksi masshtabiga moslaydi.
+    Natija ham toq va `minimum` dan kichik emas.
+    """
+    size = max(minimum, int(round(size * scale)))
+    return size if size % 2 else size + 1
+
+
+def encode_preview(image, width=PREVIEW_WIDTH, fmt="jpeg", quality=PREVIEW_QUALITY):
+    """
+    Tasvirni ustun kengligiga kichraytirib, siqilgan ko'rinishda kodlaydi. `st.image` ga
+    massiv o'rniga shu baytlar beriladi: brauzerga to'liq o'lchamdagi PNG yuborilmaydi.
+
+    Args:
+        image (numpy.ndarray): Kulrang yoki RGB tasvir.
+        width (int): Eng katta kenglik (piksel).
+        fmt (str): "jpeg", "webp" yoki "png" (binar tasvirlar uchun PNG ham ixcham va aniq).
+        quality (int): JPEG/WebP sifati (0..100).
+
+    Returns:
+        bytes: Kodlangan tasvir.
+    """
+    if image.shape[1] > width:
+        height = max(1, round(image.shape[0] * width / image.shape[1]))
+        image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+    ext, quality_flag = PREVIEW_FORMATS[fmt]
+    params = [] if quality_flag is None else [quality_flag, quality]
+    return _encode(image, ext, params)
+
+
+def encode_png(image):
+    """
+    To'liq o'lchamdagi natijani yuklab olish uchun PNG ko'rinishida kodlaydi (tez siqish darajasi).
+    """
+    return _encode(image, ".png", [cv2.IMWRITE_PNG_COMPRESSION, 1])
+
+
+def _encode(image, ext, params):
+    # Ilova massivlari RGB, OpenCV esa BGR kodlaydi
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+    ok, buffer = cv2.imencode(ext, image, params)
+    if not ok:
+        raise ValueError(f"Tasvirni {ext} formatida kodlab bo'lmadi.")
+    return buffer.tobytes()
+
+
+def preview_source(image_hash, img_array):
+    """
+    Yon panelga "Tezkor ko'rinish" tanlovini qo'shadi va qayta ishlanadigan manbani qaytaradi.
+    Katta tasvirlarda tanlov boshlang'ich holatda yoqilgan: slayderlar surilganda faqat
+    piramida proksisi qayta ishlanadi.
+
+    Returns:
+        tuple: (kesh kaliti uchun xesh, qayta ishlanadigan tasvir, masshtab). Tezkor ko'rinish
+            o'chiq bo'lsa, asl xesh, asl tasvir va 1.0.
+    """
+    st.sidebar.header("Ko'rinish")
+    preview = st.sidebar.checkbox(
+        "Tezkor ko'rinish (kichraytirilgan nusxa)",
+        value=max(img_array.shape[:2]) > PREVIEW_MAX_SIDE,
+        help=f"Parametrlar eng katta tomoni {PREVIEW_MAX_SIDE} pikseldan oshmaydigan nusxada sinab ko'riladi. "
+             "To'liq o'lchamdagi natija faqat so'ralganda hisoblanadi."
+    )
+    if not preview:
+        return image_hash, img_array, 1.0
+    proxy, scale = result_cache.get_or_compute(("proxy", image_hash), lambda: pyramid_proxy(img_array))
+    if scale == 1:
+        return image_hash, img_array, 1.0
+    return f"{image_hash}:proxy", proxy, scale
+
+
+def full_resolution_download(key, compute, file_name, scale=1.0, result=None):
+    """
+    To'liq o'lchamdagi natijani brauzerda ko'rsatmasdan yuklab olish tugmasi.
+
+    Tezkor ko'rinishda (scale < 1) natija faqat "To'liq o'lchamda hisoblash" bosilgandan
+    keyin, joriy parametrlar uchun bir marta hisoblanadi; parametrlar o'zgarsa, so'rov bekor
+    bo'ladi. Aks holda ko'rsatilgan `result` ning o'zi yuklab olinadi.
+
+    Args:
+        key (tuple): To'liq o'lchamdagi natija kesh kaliti (asl xesh va parametrlar).
+        compute (callable): To'liq o'lchamdagi natijani hisoblovchi argumentsiz funksiya.
+        file_name (str): Yuklab olinadigan fayl nomi.
+        scale (float): `preview_source` qaytargan masshtab.
+        result (numpy.ndarray): Asl o'lchamda allaqachon hisoblangan natija (scale == 1 bo'lsa).
+    """
+    if scale < 1:
+        if st.sidebar.button("To'liq o'lchamda hisoblash"):
+            st.session_state["full_resolution_key"] = key
+        if st.session_state.get("full_resolution_key") != key:
+            return
+    elif result is not None:
+        compute = lambda: result
+    data = result_cache.get_or_compute(("png",) + tuple(key), lambda: encode_png(compute()))
+    st.sidebar.download_button("Natijani yuklab olish (PNG)", data, file_name=file_name, mime="image/png")
@@ -0,0 +1,147 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from image_io import decode_image_bytes
+
+
+def content_hash(data):
+    """
+    Yuklangan fayl baytlarining tarkibiy xeshini hisoblaydi.
+
+    Args:
+        data (bytes): Fayl mazmuni.
+
+    Returns:
+        str: Xesh (hex ko'rinishida).
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _nbytes(value):
+    # Natijadagi NumPy massivlari egallagan xotira hajmini hisoblash
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if hasattr(value, "max_nbytes"):
+        # Keshga qo'yilgandan keyin o'sadigan ob'ektlar (IntegralThresholder ichki keshlari)
+        # uchun eng katta hajm oldindan band qilinadi, aks holda max_bytes chegarasi buziladi
+        return value.max_nbytes
+    if hasattr(value, "nbytes"):
+        return value.nbytes # masalan, IntegralThresholder jadvallari
+    return 64
+
+
+def _freeze(value):
+    # Keshdagi massivlar bir nechta qayta ishga tushish orasida bo'lishiladi,
+    # shuning uchun ularni tasodifan o'zgartirib yuborishning oldini olamiz
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for v in value:
+            _freeze(v)
+    return value
+
+
+class ResultCache:
+    """
+    Qayta ishlash natijalarini (tasvir xeshi, parametrlar) kaliti bo'yicha saqlovchi,
+    xotira hajmi bilan cheklangan LRU kesh.
+    """
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # kalit -> (qiymat, hajm)
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """
+        Kalit keshda bo'lsa, saqlangan natijani qaytaradi, aks holda `compute()` ni
+        chaqirib, natijani keshga yozadi.
+
+        Args:
+            key (tuple): Kesh kaliti (masalan, ("binarize", xesh, usul, chegara)).
+            compute (callable): Natijani hisoblovchi argumentsiz funksiya.
+
+        Returns:
+            Keshdagi yoki yangi hisoblangan natija.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = _freeze(compute())
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return value # Juda katta natijani keshlamaymiz
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+        return value
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def stats_text(self):
+        """
+        Streamlit yon paneli uchun qisqa statistika matni.
+        """
+        s = self.stats()
+        return (f"Natijalar keshi: {s['entries']} ta yozuv, "
+                f"{s['bytes'] / 2**20:.1f} / {s['max_bytes'] / 2**20:.0f} MB, "
+                f"hit rate {s['hit_rate']:.0%}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = 0
+
+
+# Modul darajasidagi kesh Streamlit skripti qayta ishga tushganda ham saqlanib qoladi
+result_cache = ResultCache()
+
+
+def load_upload(uploaded_file, cache=result_cache):
+    """
+    Yuklangan faylni bir marta dekodlaydi va NumPy massivini keshlaydi.
+    Kulrang manbalar RGB ga o'tkazilmaydi.
+
+    Args:
+        uploaded_file: Streamlit `file_uploader` qaytargan fayl.
+        cache (ResultCache): Foydalaniladigan kesh.
+
+    Returns:
+        tuple: (fayl xeshi, (H, W) yoki (H, W, 3) numpy.ndarray).
+    """
+    data = uploaded_file.getvalue()
+    digest = content_hash(data)
+
+    return digest, cache.get_or_compute(("decode", digest), lambda: decode_image_bytes(data))